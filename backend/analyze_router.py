@@ -1,15 +1,17 @@
 import bleach
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header, Query
+from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from db import history
+from services.analysis_result import FULL_PATH
 from services.analysis_service import AnalysisService
+from services.inference_executor import InferenceQueueFullError
 from dependencies import get_current_user_optional, get_current_user, get_analysis_service_dependency
-from langdetect import detect
-from deep_translator import GoogleTranslator
-from googlesearch import search
-from tasks.analysis_tasks import batch_analyze_async, scrape_and_analyze_async
+from tasks.analysis_tasks import batch_analyze_async, scrape_and_analyze_async, explain_perturbation_async
 from celery.result import AsyncResult
+from config.settings import get_settings
 
 router = APIRouter(prefix="/api/v1/analyze", tags=["analyze"])
 
@@ -17,15 +19,61 @@ class AnalyzeIn(BaseModel):
     text: str
 
 class AnalyzeOut(BaseModel):
-    verdict: str
-    confidence: float
-    scores: dict
-    html: str
-    sources: list
+    verdict: str | None = None
+    confidence: float | None = None
+    scores: dict | None = None
+    html: str | None = None
+    chunks: list | None = None
+    sources: list | None = None
     language: str | None = None
     translated: str | None = None
+    path: str | None = None
+    near_duplicate: float | None = None
+    red_flag_matches: list | None = None
+
+# Fields a client can select with ?fields=; the rendered HTML card is only
+# included when asked for (?fields=...,html, ?format=html or Accept: text/html).
+# red_flag_matches lists clickbait phrases for highlighting, with offsets into
+# the analyzed text (the stripped input, or its translation if there is one).
+ANALYZE_FIELDS = ("verdict", "confidence", "scores", "html", "chunks", "sources", "language", "translated", "path", "near_duplicate", "red_flag_matches")
+DEFAULT_ANALYZE_FIELDS = ("verdict", "confidence", "scores", "chunks", "sources", "language", "translated")
+
+# Language detection only needs the start of a long document
+LANGUAGE_SAMPLE_CHARS = 2000
+
+def parse_fields(fields: str | None) -> tuple:
+    if not fields:
+        return DEFAULT_ANALYZE_FIELDS
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in ANALYZE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(ANALYZE_FIELDS)})",
+        )
+    return selected
+
+def wants_html(response_format: str | None, accept: str | None) -> bool:
+    if response_format:
+        return response_format == "html"
+    # Only when HTML is the client's first preference (browser navigation),
+    # not for the "application/json, text/plain, */*" sent by fetch/axios
+    first = (accept or "").split(",")[0].split(";")[0].strip().lower()
+    return first == "text/html"
+
+# langdetect, deep_translator and googlesearch are imported on first use to
+# keep them out of application startup.
+
+def detect_language(text: str) -> str:
+    from langdetect import detect
+    return detect(text)
+
+def translate_to_english(text: str) -> str:
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source="auto", target="en").translate(text)
 
 def trusted_search(query: str, limit=5):
+    from googlesearch import search
     qs = f"site:reuters.com OR site:bbc.com OR site:apnews.com {query}"
     results = []
     try:
@@ -35,9 +83,18 @@ def trusted_search(query: str, limit=5):
         pass
     return results
 
-@router.post("", response_model=AnalyzeOut)
+@router.post(
+    "",
+    response_model=AnalyzeOut,
+    response_model_exclude_unset=True,
+    responses={200: {"content": {"text/html": {}}}},
+)
 async def analyze(
     payload: AnalyzeIn,
+    fields: str | None = Query(None, description="Comma-separated response fields"),
+    response_format: str | None = Query(None, alias="format", pattern="^(json|html)$"),
+    deep: bool = Query(False, description="Run the fact check, source search and full explanation even for a confident verdict"),
+    accept: str | None = Header(None),
     user: dict | None = Depends(get_current_user_optional),
     analysis_service: AnalysisService = Depends(get_analysis_service_dependency)
 ):
@@ -45,22 +102,40 @@ async def analyze(
     if len(text) < 5:
         raise HTTPException(status_code=400, detail="Text too short")
     
+    as_html = wants_html(response_format, accept)
+    selected = parse_fields(fields)
+    
+    # Language detection, translation and search are blocking calls;
+    # keep them off the event loop.
     language = None
     translated = None
     try:
-        language = detect(text)
+        language = await run_in_threadpool(detect_language, text[:LANGUAGE_SAMPLE_CHARS])
         if language != "en":
-            translated = GoogleTranslator(source="auto", target="en").translate(text)
+            translated = await run_in_threadpool(translate_to_english, text)
     except Exception:
         pass
     
     query_for_search = translated or text
-    sources = trusted_search(query_for_search)
     
-    # Use the analysis service (now async)
-    verdict, html, prob = await analysis_service.analyze(query_for_search)
+    try:
+        result = await analysis_service.analyze_result(query_for_search, full=deep)
+    except InferenceQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    
+    # Sources are only looked up for verdicts that took the full path, and
+    # only when returned or recorded in history
+    sources = []
+    if result.path == FULL_PATH and (user or (not as_html and "sources" in selected)):
+        sources = await run_in_threadpool(trusted_search, query_for_search)
     
-    confidence = max(prob.values()) * 100 if prob else 0.0
+    verdict = result.title
+    prob = result.probabilities
+    confidence = result.confidence
     
     if user:
         await history.insert_one({
@@ -75,15 +150,115 @@ async def analyze(
             "correct": None,
         })
     
-    return AnalyzeOut(
-        verdict=verdict,
-        confidence=confidence,
-        scores=prob,
-        html=html,
-        sources=sources,
-        language=language,
-        translated=translated,
+    if as_html:
+        return HTMLResponse(result.render_html())
+    
+    values = {
+        "verdict": lambda: verdict,
+        "confidence": lambda: confidence,
+        "scores": lambda: prob,
+        "html": result.render_html,
+        "chunks": result.chunk_scores,
+        "sources": lambda: sources,
+        "language": lambda: language,
+        "translated": lambda: translated,
+        "path": lambda: result.path,
+        "near_duplicate": lambda: result.similarity,
+        "red_flag_matches": result.red_flag_match_list,
+    }
+    return AnalyzeOut(**{name: values[name]() for name in selected})
+
+
+class ExplainIn(BaseModel):
+    text: Optional[str] = None
+    texts: Optional[List[str]] = None
+    top_k: int = Field(default=10, ge=1, le=50)
+
+class ExplainOut(BaseModel):
+    explanations: List[dict]
+
+@router.post("/explain", response_model=ExplainOut)
+async def explain(
+    payload: ExplainIn,
+    analysis_service: AnalysisService = Depends(get_analysis_service_dependency)
+):
+    """
+    Explain the model's verdict with top-k term attributions.
+    
+    Accepts a single ``text`` or a batch of ``texts``. Each attribution is
+    the term's contribution to the model's decision value; ``supports``
+    names the class it pushes towards.
+    """
+    texts = payload.texts if payload.texts is not None else [payload.text] if payload.text else []
+    if not texts:
+        raise HTTPException(status_code=400, detail="No texts provided")
+    
+    if len(texts) > 100:
+        raise HTTPException(status_code=400, detail="Maximum 100 texts per batch")
+    
+    # Vectorizing is CPU-bound; keep it off the event loop
+    explanations = await run_in_threadpool(analysis_service.explain_many, texts, payload.top_k)
+    return ExplainOut(explanations=explanations)
+
+
+class PerturbationIn(BaseModel):
+    text: str
+    num_samples: Optional[int] = Field(default=None, ge=2)
+    seed: Optional[int] = None
+    top_k: int = Field(default=10, ge=1, le=50)
+
+class PerturbationOut(BaseModel):
+    verdict: str | None = None
+    probability: float | None = None
+    words: list | None = None
+    counterfactual: dict | None = None
+    fidelity: float | None = None
+    num_samples: int | None = None
+    seed: int | None = None
+    task_id: str | None = None
+    status: str | None = None
+
+@router.post("/explain/perturbation", response_model=PerturbationOut, response_model_exclude_unset=True)
+async def explain_perturbation(
+    payload: PerturbationIn,
+    analysis_service: AnalysisService = Depends(get_analysis_service_dependency)
+):
+    """
+    Explain the verdict by masking words and fitting a local surrogate.
+    
+    Returns the words whose removal moves the verdict most and the
+    smallest removal that flips it. Explanations are deterministic for a
+    given text, ``seed`` and ``num_samples``. Texts longer than
+    ``perturbation_async_chars`` are explained on the analysis queue: the
+    response then carries a ``task_id`` to poll at ``/task/{task_id}``.
+    """
+    if len(payload.text) < 5:
+        raise HTTPException(status_code=400, detail="Text is too short (minimum 5 characters)")
+    
+    settings = get_settings()
+    if payload.num_samples is not None and payload.num_samples > settings.perturbation_max_samples:
+        raise HTTPException(
+            status_code=400,
+            detail=f"num_samples must be at most {settings.perturbation_max_samples}",
+        )
+    
+    if len(payload.text) > settings.perturbation_async_chars:
+        task = explain_perturbation_async.delay(
+            text=payload.text,
+            num_samples=payload.num_samples,
+            seed=payload.seed,
+            top_k=payload.top_k,
+        )
+        return PerturbationOut(task_id=task.id, status="submitted")
+    
+    explanation = await run_in_threadpool(
+        analysis_service.explain_perturbation,
+        payload.text,
+        payload.num_samples,
+        payload.seed,
+        payload.top_k,
     )
+    return PerturbationOut(**explanation)
 
 
 class BatchAnalyzeIn(BaseModel):
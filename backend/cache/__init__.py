@@ -1,9 +1,28 @@
 """
 Cache module.
 
-Provides Redis-based caching functionality for the application.
+Provides Redis-based (or local SQLite) caching functionality for the
+application.
 """
 
-from .cache_manager import CacheManager, get_cache_manager, cached
+from .cache_manager import CacheManager, LocalCache, get_cache_manager, cached
+from .admission import AdmissionPolicy, CacheRule
+from .backends import CacheBackend, RedisBackend, ShardedRedisBackend
+from .sqlite_backend import SQLiteBackend
+from .near_duplicate import NearDuplicateIndex
+from .sharding import HashRing
 
-__all__ = ["CacheManager", "get_cache_manager", "cached"]
+__all__ = [
+    "CacheManager",
+    "LocalCache",
+    "get_cache_manager",
+    "cached",
+    "CacheBackend",
+    "RedisBackend",
+    "ShardedRedisBackend",
+    "SQLiteBackend",
+    "AdmissionPolicy",
+    "CacheRule",
+    "NearDuplicateIndex",
+    "HashRing",
+]
@@ -0,0 +1,208 @@
+"""
+Cache admission and TTL policy.
+
+Most analyzed texts are submitted exactly once, and caching them only
+pushes reused entries out of a memory-bounded Redis. ``AdmissionPolicy``
+applies per-prefix ``CacheRule``s to every write: a maximum value size,
+TTLs that shrink as values grow, short TTLs for negative (failure)
+entries, and a frequency filter that only admits keys looked up at least
+``min_frequency`` times.
+
+Frequencies are counted TinyLFU-style in a count-min sketch of 4-bit
+saturating counters kept by the cache backend (``BITFIELD`` counters in
+Redis, a table in the SQLite backend), so lookups from every worker
+process count towards the same key. Backends increment the sketch in the
+same round trip as the lookup, and check it and store the value in one
+atomic step. Each sketch covers a time window and the estimate adds the
+current and previous windows, so old popularity ages out.
+"""
+
+import hashlib
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from monitoring.metrics import cache_rule_events
+
+logger = logging.getLogger(__name__)
+
+# Largest value of a 4-bit sketch counter
+MAX_COUNT = 15
+
+
+class CacheRule:
+    """
+    Admission and TTL rule for keys starting with a prefix.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[int] = None,
+        size_ttls: Sequence[Tuple[int, int]] = (),
+        negative_ttl: Optional[int] = None,
+        min_frequency: int = 1,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize rule.
+
+        Args:
+            prefix: Key prefix the rule applies to (longest prefix wins)
+            max_bytes: Encoded values larger than this are not cached
+            ttl: TTL overriding the one passed by the caller
+            size_ttls: (max_bytes, ttl) tiers; a value gets the TTL of the
+                first tier it fits in, if shorter than its TTL
+            negative_ttl: TTL of negative entries (failures); None does
+                not cache them
+            min_frequency: Lookups a key needs before it is admitted (1
+                admits everything)
+            name: Label used in metrics (defaults to the prefix)
+        """
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_ttls = sorted((int(size), int(tier_ttl)) for size, tier_ttl in size_ttls)
+        self.negative_ttl = negative_ttl
+        self.min_frequency = max(1, min_frequency)
+        self.name = name or prefix.rstrip(":") or "default"
+
+        self.events: Dict[str, int] = {}
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "CacheRule":
+        """
+        Build a rule from settings.
+
+        Args:
+            config: Dictionary of ``__init__`` arguments
+
+        Returns:
+            CacheRule instance
+        """
+        return cls(**config)
+
+    def ttl_for(self, size: int, ttl: int) -> int:
+        """
+        TTL of a positive entry.
+
+        Args:
+            size: Encoded value size in bytes
+            ttl: TTL requested by the caller
+
+        Returns:
+            TTL in seconds
+        """
+        if self.ttl is not None:
+            ttl = self.ttl
+        for max_size, tier_ttl in self.size_ttls:
+            if size <= max_size:
+                return min(ttl, tier_ttl)
+        return ttl
+
+    def record(self, event: str, count: int = 1):
+        """Count a hit, miss, admission, rejection or eviction."""
+        self.events[event] = self.events.get(event, 0) + count
+        cache_rule_events.labels(rule=self.name, event=event).inc(count)
+
+
+class AdmissionPolicy:
+    """
+    Per-prefix admission rules with a shared frequency sketch.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[CacheRule],
+        sketch_width: int = 1 << 18,
+        sketch_depth: int = 4,
+        window: int = 3600,
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            rules: Rules by key prefix
+            sketch_width: Counters per sketch row (more counters, fewer
+                collisions; each costs 4 bits in Redis)
+            sketch_depth: Sketch rows (hash functions), at most 8
+            window: Seconds covered by one sketch
+        """
+        # Longest prefix first
+        self.rules = sorted(rules, key=lambda rule: len(rule.prefix), reverse=True)
+        self.sketch_width = sketch_width
+        self.sketch_depth = min(max(1, sketch_depth), 8)
+        self.window = window
+
+    @classmethod
+    def from_config(cls, rules: Sequence[Dict[str, Any]], **kwargs) -> "AdmissionPolicy":
+        """
+        Build a policy from rule dictionaries (see ``CacheRule.from_dict``).
+
+        Args:
+            rules: Rule dictionaries
+            **kwargs: Sketch parameters passed to ``__init__``
+
+        Returns:
+            AdmissionPolicy instance
+        """
+        return cls([CacheRule.from_dict(rule) for rule in rules], **kwargs)
+
+    def rule_for(self, key: str) -> Optional[CacheRule]:
+        """
+        Find the rule of a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Rule with the longest matching prefix, or None
+        """
+        for rule in self.rules:
+            if key.startswith(rule.prefix):
+                return rule
+        return None
+
+    def sketch_keys(self, rule: CacheRule) -> Tuple[str, str]:
+        """Redis keys of the rule's current and previous sketch windows."""
+        window = int(time.time() // self.window)
+        return (
+            f"cache:sketch:{rule.name}:{window}",
+            f"cache:sketch:{rule.name}:{window - 1}",
+        )
+
+    def counter_offsets(self, key: str) -> List[int]:
+        """Counter index of a key in each sketch row (``#`` offsets of u4 fields)."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=4 * self.sketch_depth).digest()
+        return [
+            row * self.sketch_width + int.from_bytes(digest[4 * row:4 * row + 4], "little") % self.sketch_width
+            for row in range(self.sketch_depth)
+        ]
+
+    def lookup_counters(self, key: str) -> Optional[Tuple[str, List[int]]]:
+        """
+        Sketch counters a lookup of a key increments.
+
+        Args:
+            key: Cache key being looked up
+
+        Returns:
+            Tuple of (current sketch key, counter offsets), or None if the
+            key's rule does not count lookups
+        """
+        rule = self.rule_for(key)
+        if rule is None or rule.min_frequency <= 1:
+            return None
+        return self.sketch_keys(rule)[0], self.counter_offsets(key)
+
+    def get_stats(self) -> Dict:
+        """Get per-rule event counts."""
+        return {
+            rule.name: {
+                "prefix": rule.prefix,
+                "min_frequency": rule.min_frequency,
+                **rule.events,
+            }
+            for rule in self.rules
+        }
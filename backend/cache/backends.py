@@ -0,0 +1,620 @@
+"""
+Storage backends of the cache manager.
+
+``CacheManager`` keeps the caching logic (L1 tier, stale-while-revalidate,
+single-flight, admission rules, statistics) and talks to storage through a
+``CacheBackend``: batched reads that also return remaining TTLs, batched
+writes with an optional frequency gate, set-if-absent and
+compare-and-delete for leases, counters, glob deletes and a broadcast
+channel for L1 invalidations.
+
+``RedisBackend`` is the default; ``ShardedRedisBackend`` spreads keys over
+several Redis nodes by consistent hashing (``cache.sharding``).
+``SQLiteBackend`` (``cache.sqlite_backend``) stores everything in a local
+database file for deployments without Redis.
+
+TTLs follow Redis conventions: writes take seconds, reads return the
+remaining time in milliseconds, -1 for keys without expiry and -2 for
+missing keys.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+import logging
+
+import redis.asyncio as redis
+from redis.asyncio import Redis
+from redis import Redis as SyncRedis
+
+from .admission import AdmissionPolicy, CacheRule
+from .sharding import HashRing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (key, value, TTL in seconds, rule whose min_frequency the key must reach
+# to be written, or None to write unconditionally)
+Write = Tuple[str, bytes, int, Optional[CacheRule]]
+
+# Deletes a lease only if it is still held by the given token
+_RELEASE_LEASE = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Stores a value only if its estimated frequency reaches the threshold.
+# KEYS: value key, current sketch, previous sketch
+# ARGV: ttl, value, threshold, counter offsets...
+ADMIT_SET_SCRIPT = """
+local estimate = nil
+for i = 4, #ARGV do
+    local offset = "#" .. ARGV[i]
+    local count = redis.call("BITFIELD", KEYS[2], "GET", "u4", offset)[1]
+        + redis.call("BITFIELD", KEYS[3], "GET", "u4", offset)[1]
+    if estimate == nil or count < estimate then
+        estimate = count
+    end
+end
+if estimate < tonumber(ARGV[3]) then
+    return 0
+end
+redis.call("SETEX", KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+class CacheBackend:
+    """
+    Interface of cache storage backends.
+
+    Methods raise on storage errors; ``CacheManager`` logs them and fails
+    open.
+    """
+
+    name = "base"
+
+    async def connect(self):
+        """Open the connection (idempotent)."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Close the connection."""
+        raise NotImplementedError
+
+    async def get_many(
+        self,
+        keys: Sequence[str],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[Tuple[Optional[bytes], int]]:
+        """
+        Read several keys with their remaining TTLs.
+
+        Args:
+            keys: Keys to read
+            policy: Admission policy whose sketch counts the lookups
+
+        Returns:
+            (value or None, remaining TTL in ms) tuples in key order
+        """
+        raise NotImplementedError
+
+    async def set_many(
+        self,
+        writes: Sequence[Write],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[bool]:
+        """
+        Write several keys; gated writes only happen if the key's
+        estimated lookup frequency reaches its rule's ``min_frequency``.
+
+        Args:
+            writes: (key, value, TTL in seconds, gating rule) tuples
+            policy: Admission policy holding the sketch (required for
+                gated writes)
+
+        Returns:
+            Whether each value was written
+        """
+        raise NotImplementedError
+
+    async def add_many(self, items: Sequence[Tuple[str, bytes, int]]) -> List[bool]:
+        """
+        Write keys that do not exist yet (SET NX).
+
+        Args:
+            items: (key, value, TTL in ms) tuples
+
+        Returns:
+            Whether each key was written
+        """
+        raise NotImplementedError
+
+    async def delete_if_equal(self, items: Sequence[Tuple[str, bytes]]):
+        """
+        Delete keys that still hold the given values.
+
+        Args:
+            items: (key, expected value) tuples
+        """
+        raise NotImplementedError
+
+    async def delete(self, keys: Sequence[str]) -> int:
+        """
+        Delete keys.
+
+        Returns:
+            Number of keys deleted
+        """
+        raise NotImplementedError
+
+    async def delete_matching(self, pattern: str) -> int:
+        """
+        Delete keys matching a glob pattern.
+
+        Returns:
+            Number of keys deleted
+        """
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        """
+        Atomically increment a counter key (without expiry).
+
+        Returns:
+            New value
+        """
+        raise NotImplementedError
+
+    def incr_sync(self, key: str) -> int:
+        """Blocking ``incr`` for synchronous callers."""
+        raise NotImplementedError
+
+    async def get_counter(self, key: str) -> int:
+        """
+        Read a counter key written by ``incr``.
+
+        Returns:
+            Current value (0 if the key does not exist)
+        """
+        value, _ = (await self.get_many([key]))[0]
+        return int(value) if value is not None else 0
+
+    async def publish(self, channel: str, message: str):
+        """Broadcast a message to every subscriber of a channel."""
+        raise NotImplementedError
+
+    def publish_sync(self, channel: str, message: str):
+        """Blocking ``publish`` for synchronous callers."""
+        raise NotImplementedError
+
+    def subscribe(self, channel: str) -> AsyncIterator[Union[bytes, str]]:
+        """
+        Receive the messages published on a channel.
+
+        Returns:
+            Async iterator of message payloads; it raises when the
+            connection is lost, after which messages may have been missed
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict:
+        """Get backend statistics."""
+        return {"backend": self.name}
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache storage in Redis.
+    """
+
+    name = "redis"
+
+    def __init__(self, redis_url: str):
+        """
+        Initialize backend.
+
+        Args:
+            redis_url: Redis connection URL
+        """
+        self.redis_url = redis_url
+        self._client: Optional[Redis] = None
+
+    async def connect(self):
+        """Connect to Redis."""
+        if self._client is None:
+            self._client = await redis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=False,  # We handle encoding ourselves
+            )
+            logger.info("Connected to Redis cache")
+
+    async def close(self):
+        """Disconnect from Redis."""
+        if self._client:
+            await self._client.close()
+            self._client = None
+            logger.info("Disconnected from Redis cache")
+
+    async def get_many(
+        self,
+        keys: Sequence[str],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[Tuple[Optional[bytes], int]]:
+        """MGET pipelined with the PTTLs and sketch increments."""
+        await self.connect()
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.mget(keys)
+            for key in keys:
+                pipe.pttl(key)
+            if policy is not None:
+                for key in keys:
+                    counters = policy.lookup_counters(key)
+                    if counters is None:
+                        continue
+                    sketch, offsets = counters
+                    field = pipe.bitfield(sketch, default_overflow="SAT")
+                    for offset in offsets:
+                        field.incrby("u4", f"#{offset}", 1)
+                    field.execute()
+                    pipe.expire(sketch, 2 * policy.window)
+            replies = await pipe.execute()
+        return list(zip(replies[0], replies[1:len(keys) + 1]))
+
+    async def set_many(
+        self,
+        writes: Sequence[Write],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[bool]:
+        """SETEX, or the admission script for gated writes, in one pipeline."""
+        if not writes:
+            return []
+
+        await self.connect()
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value, ttl, rule in writes:
+                if rule is not None:
+                    current, previous = policy.sketch_keys(rule)
+                    pipe.eval(
+                        ADMIT_SET_SCRIPT, 3, key, current, previous,
+                        ttl, value, rule.min_frequency,
+                        *policy.counter_offsets(key),
+                    )
+                else:
+                    pipe.setex(key, ttl, value)
+            replies = await pipe.execute()
+        return [bool(reply) for reply in replies]
+
+    async def add_many(self, items: Sequence[Tuple[str, bytes, int]]) -> List[bool]:
+        """SET NX PX in one pipeline."""
+        await self.connect()
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value, ttl_ms in items:
+                pipe.set(key, value, nx=True, px=ttl_ms)
+            replies = await pipe.execute()
+        return [bool(reply) for reply in replies]
+
+    async def delete_if_equal(self, items: Sequence[Tuple[str, bytes]]):
+        """Compare-and-delete script in one pipeline."""
+        await self.connect()
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items:
+                pipe.eval(_RELEASE_LEASE, 1, key, value)
+            await pipe.execute()
+
+    async def delete(self, keys: Sequence[str]) -> int:
+        """One DEL."""
+        await self.connect()
+        return await self._client.delete(*keys)
+
+    async def delete_matching(self, pattern: str) -> int:
+        """SCAN, then one DEL."""
+        await self.connect()
+        keys = [key async for key in self._client.scan_iter(match=pattern)]
+        if keys:
+            return await self._client.delete(*keys)
+        return 0
+
+    async def incr(self, key: str) -> int:
+        """INCR."""
+        await self.connect()
+        return await self._client.incr(key)
+
+    def incr_sync(self, key: str) -> int:
+        """INCR on a short-lived blocking connection."""
+        client = SyncRedis.from_url(self.redis_url)
+        try:
+            return client.incr(key)
+        finally:
+            client.close()
+
+    async def publish(self, channel: str, message: str):
+        """PUBLISH."""
+        await self.connect()
+        await self._client.publish(channel, message)
+
+    def publish_sync(self, channel: str, message: str):
+        """PUBLISH on a short-lived blocking connection."""
+        client = SyncRedis.from_url(self.redis_url)
+        try:
+            client.publish(channel, message)
+        finally:
+            client.close()
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Union[bytes, str]]:
+        """Redis pub/sub subscription."""
+        await self.connect()
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                yield message.get("data")
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+
+class ShardedRedisBackend(CacheBackend):
+    """
+    Cache storage spread over several Redis nodes by consistent hashing.
+
+    Every key lives on the node ``HashRing`` maps it to, so batched calls
+    are split into one pipeline per node, run concurrently. Lookup counts
+    of the admission sketch are kept on the node of the counted key, so
+    the admission script still runs on a single node. Invalidation
+    messages go through the node of the channel name. Counters (namespace
+    generations) are the exception: they are kept on every node and read
+    as the maximum, so an increment made while a node was skipped is not
+    lost when the node comes back.
+
+    In health-aware mode (``retry_interval`` set) a node that fails is
+    skipped for that long: the failed part of the call is retried once on
+    the next nodes of the ring, and later calls go there directly.
+    Otherwise a failing node fails the whole call, as with one Redis.
+    """
+
+    name = "redis-sharded"
+
+    def __init__(
+        self,
+        redis_urls: Sequence[str],
+        vnodes: int = 160,
+        retry_interval: Optional[float] = None,
+    ):
+        """
+        Initialize backend.
+
+        Args:
+            redis_urls: Redis connection URLs, one per node
+            vnodes: Virtual points per node on the hash ring
+            retry_interval: Seconds an unavailable node is skipped (None
+                disables health-aware routing)
+        """
+        self.ring = HashRing(redis_urls, vnodes=vnodes, retry_interval=retry_interval)
+        self.shards: Dict[str, RedisBackend] = {url: RedisBackend(url) for url in redis_urls}
+
+    async def connect(self):
+        """Create the client of every node."""
+        for shard in self.shards.values():
+            await shard.connect()
+
+    async def close(self):
+        """Disconnect from every node."""
+        for shard in self.shards.values():
+            await shard.close()
+
+    async def _route(
+        self,
+        items: Sequence[T],
+        key: Callable[[T], str],
+        operation: Callable[[RedisBackend, List[T]], Awaitable[Any]],
+    ) -> List[Tuple[List[int], Any]]:
+        """
+        Run an operation on each node with the items whose keys it owns.
+
+        Args:
+            items: Keys, or tuples holding them
+            key: Returns the key of an item
+            operation: Coroutine function called with a node's backend and
+                its items
+
+        Returns:
+            (indices into ``items``, operation result) per node call
+
+        Raises:
+            Exception: The error of a failed node, unless its items could
+                be retried on other nodes
+        """
+        done: List[Tuple[List[int], Any]] = []
+        pending = list(range(len(items)))
+        for attempt in range(2):
+            groups: Dict[str, List[int]] = {}
+            for i in pending:
+                groups.setdefault(self.ring.node_for(key(items[i])), []).append(i)
+
+            outcomes = await asyncio.gather(
+                *(operation(self.shards[node], [items[i] for i in indices]) for node, indices in groups.items()),
+                return_exceptions=True,
+            )
+
+            pending, error = [], None
+            for (node, indices), outcome in zip(groups.items(), outcomes):
+                if isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
+                if isinstance(outcome, Exception):
+                    self.ring.mark_down(node)
+                    pending.extend(indices)
+                    error = outcome
+                else:
+                    done.append((indices, outcome))
+
+            if not pending:
+                return done
+            if self.ring.retry_interval is None or attempt:
+                raise error
+
+    @staticmethod
+    def _in_order(count: int, parts: List[Tuple[List[int], List[Any]]]) -> List[Any]:
+        """Reassemble per-node results into item order."""
+        results: List[Any] = [None] * count
+        for indices, values in parts:
+            for i, value in zip(indices, values):
+                results[i] = value
+        return results
+
+    async def get_many(
+        self,
+        keys: Sequence[str],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[Tuple[Optional[bytes], int]]:
+        """One MGET pipeline per node."""
+        parts = await self._route(keys, lambda key: key, lambda shard, keys: shard.get_many(keys, policy))
+        return self._in_order(len(keys), parts)
+
+    async def set_many(
+        self,
+        writes: Sequence[Write],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[bool]:
+        """One SETEX pipeline per node."""
+        parts = await self._route(writes, lambda write: write[0], lambda shard, writes: shard.set_many(writes, policy))
+        return self._in_order(len(writes), parts)
+
+    async def add_many(self, items: Sequence[Tuple[str, bytes, int]]) -> List[bool]:
+        """One SET NX pipeline per node."""
+        parts = await self._route(items, lambda item: item[0], lambda shard, items: shard.add_many(items))
+        return self._in_order(len(items), parts)
+
+    async def delete_if_equal(self, items: Sequence[Tuple[str, bytes]]):
+        """One compare-and-delete pipeline per node."""
+        await self._route(items, lambda item: item[0], lambda shard, items: shard.delete_if_equal(items))
+
+    async def delete(self, keys: Sequence[str]) -> int:
+        """One DEL per node."""
+        parts = await self._route(keys, lambda key: key, lambda shard, keys: shard.delete(keys))
+        return sum(deleted for _, deleted in parts)
+
+    async def delete_matching(self, pattern: str) -> int:
+        """SCAN and DEL on every available node."""
+        nodes = [node for node in self.ring.nodes if self.ring.is_available(node)]
+        outcomes = await asyncio.gather(
+            *(self.shards[node].delete_matching(pattern) for node in nodes),
+            return_exceptions=True,
+        )
+        deleted = 0
+        for node, outcome in zip(nodes, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, Exception):
+                self.ring.mark_down(node)
+                if self.ring.retry_interval is None:
+                    raise outcome
+                logger.error(f"Shard delete error for {pattern}: {outcome}")
+            else:
+                deleted += outcome
+        return deleted
+
+    def _counter_nodes(self) -> List[str]:
+        """Nodes holding counters: the available ones (all if none is)."""
+        return [node for node in self.ring.nodes if self.ring.is_available(node)] or self.ring.nodes
+
+    def _counter_results(self, nodes: List[str], outcomes: List[Any]) -> Dict[str, int]:
+        """
+        Collect per-node counter results, marking failed nodes down.
+
+        Raises:
+            Exception: The error of a failed node, unless another node
+                answered in health-aware mode
+        """
+        results, error = {}, None
+        for node, outcome in zip(nodes, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, Exception):
+                self.ring.mark_down(node)
+                error = outcome
+            else:
+                results[node] = outcome
+        if error is not None and (self.ring.retry_interval is None or not results):
+            raise error
+        return results
+
+    async def incr(self, key: str) -> int:
+        """INCR on every available node; the counter is the maximum."""
+        nodes = self._counter_nodes()
+        counts = self._counter_results(
+            nodes,
+            await asyncio.gather(*(self.shards[node].incr(key) for node in nodes), return_exceptions=True),
+        )
+        value = max(counts.values())
+        # Nodes that missed increments while skipped catch up, so the next
+        # increment exceeds every value handed out
+        for node, count in counts.items():
+            while count < value:
+                count = await self.shards[node].incr(key)
+        return value
+
+    async def get_counter(self, key: str) -> int:
+        """Maximum of the counter over the available nodes."""
+        nodes = self._counter_nodes()
+        counts = self._counter_results(
+            nodes,
+            await asyncio.gather(*(self.shards[node].get_counter(key) for node in nodes), return_exceptions=True),
+        )
+        return max(counts.values())
+
+    def _call_sync(self, key: str, operation: Callable[[RedisBackend], Any]) -> Any:
+        """Blocking call on a key's node, retried once on the next node."""
+        for attempt in range(2):
+            node = self.ring.node_for(key)
+            try:
+                return operation(self.shards[node])
+            except Exception:
+                self.ring.mark_down(node)
+                if self.ring.retry_interval is None or attempt:
+                    raise
+
+    def incr_sync(self, key: str) -> int:
+        """INCR on every available node, blocking; see ``incr``."""
+        nodes = self._counter_nodes()
+        outcomes = []
+        for node in nodes:
+            try:
+                outcomes.append(self.shards[node].incr_sync(key))
+            except Exception as e:
+                outcomes.append(e)
+        counts = self._counter_results(nodes, outcomes)
+
+        value = max(counts.values())
+        for node, count in counts.items():
+            while count < value:
+                count = self.shards[node].incr_sync(key)
+        return value
+
+    async def publish(self, channel: str, message: str):
+        """PUBLISH on the channel's node."""
+        await self._route([channel], lambda key: key, lambda shard, keys: shard.publish(keys[0], message))
+
+    def publish_sync(self, channel: str, message: str):
+        """PUBLISH on the channel's node, blocking."""
+        self._call_sync(channel, lambda shard: shard.publish_sync(channel, message))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[Union[bytes, str]]:
+        """Subscription on the channel's node."""
+        node = self.ring.node_for(channel)
+        try:
+            async for data in self.shards[node].subscribe(channel):
+                yield data
+        except Exception:
+            # The caller resubscribes, on the next node if this one is skipped
+            self.ring.mark_down(node)
+            raise
+
+    def get_stats(self) -> Dict:
+        """Get the nodes and which of them are skipped."""
+        return {"backend": self.name, **self.ring.get_stats()}
@@ -2,92 +2,498 @@
 Redis cache manager for application-wide caching.
 
 This module provides a high-level interface for caching with Redis,
-including TTL management, serialization, and error handling.
+including TTL management, serialization, and error handling. Storage goes
+through a ``CacheBackend`` (``cache.backends``): Redis by default, or a
+local SQLite file (``SQLiteBackend``) where there is no Redis.
+
+An optional in-process L1 tier (``LocalCache``) sits in front of Redis so
+hot keys are served without a network round trip. L1 entries never
+outlive their Redis copy, and deletes, ``clear_pattern`` and model
+version changes are broadcast to every process over Redis pub/sub.
+
+Keys of a namespace can embed its generation (``namespace_prefix``).
+``invalidate_namespace`` retires every key of the namespace with a single
+INCR of the generation counter instead of a SCAN and DELETE: readers move
+on to the new generation and the old keys expire through their TTL.
+
+``get_or_compute``/``get_or_compute_many`` coalesce concurrent misses of
+the same key (single-flight): callers in one process await the same
+in-flight computation, and a short Redis lease lets other processes wait
+for the winner's cached value instead of computing it again.
+
+With ``stale_ttl`` set, each value is kept in Redis for ``stale_ttl``
+seconds past its TTL (the soft TTL). A value read in that window is
+stale: ``get`` still returns it, and ``get_or_compute`` returns it
+immediately and refreshes it in the background, once per key. Written
+TTLs are shortened by a random jitter so entries cached together do not
+expire together.
+
+Values are encoded by ``cache.serialization``: each carries a tag naming
+its serializer and compression, so ``get`` decodes any format ever
+written and the write format can change without a flush.
 """
 
+import asyncio
+import fnmatch
 import json
-import pickle
 import hashlib
-from typing import Any, Optional, Union, Callable
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Collection, Dict, List, Optional, Tuple, Union, Callable
 from datetime import timedelta
-import redis.asyncio as redis
-from redis.asyncio import Redis
 from functools import wraps
 import logging
 
+from . import serialization
+from .admission import AdmissionPolicy, CacheRule
+from .backends import CacheBackend, RedisBackend, ShardedRedisBackend
+from .sqlite_backend import SQLiteBackend
+from monitoring.metrics import (
+    cache_value_bytes,
+    cache_coalesced,
+    cache_hits,
+    cache_lease_timeouts,
+    cache_misses,
+    cache_refreshes,
+    cache_stale_hits,
+    cache_tier_hits,
+)
+
 logger = logging.getLogger(__name__)
 
 
+class LocalCache:
+    """
+    In-process LRU cache of raw cached values, bounded in bytes.
+    
+    Values are kept serialized, exactly as stored in Redis, and decoded on
+    every hit so callers never share (and mutate) the same object.
+    """
+    
+    def __init__(self, max_bytes: int, ttl: float = 60, on_evict: Optional[Callable[[str], None]] = None):
+        """
+        Initialize local cache.
+        
+        Args:
+            max_bytes: Maximum total size of keys and values
+            ttl: Maximum lifetime of an entry in seconds
+            on_evict: Called with the key of every entry evicted for space
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.on_evict = on_evict
+        
+        # key -> (value, expires at (monotonic), size), in LRU order
+        self._entries: "OrderedDict[str, Tuple[bytes, float, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a raw value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Raw value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """
+        Store a raw value.
+        
+        Args:
+            key: Cache key
+            value: Raw value
+            ttl: Lifetime in seconds, capped at the cache TTL (e.g. the
+                remaining Redis TTL of the value)
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        size = len(key) + len(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if ttl <= 0 or size > self.max_bytes:
+                return
+            
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._size += size
+            evicted = []
+            while self._size > self.max_bytes:
+                evicted.append(next(iter(self._entries)))
+                self._remove(evicted[-1])
+                self.evictions += 1
+        
+        if self.on_evict is not None:
+            for key in evicted:
+                self.on_evict(key)
+    
+    def delete(self, key: str) -> bool:
+        """
+        Delete a key.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            True if the key was cached
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+    
+    def delete_matching(self, pattern: str) -> int:
+        """
+        Delete keys matching a glob pattern (as used by Redis SCAN).
+        
+        Args:
+            pattern: Key pattern (e.g., "analysis:*")
+            
+        Returns:
+            Number of keys deleted
+        """
+        with self._lock:
+            keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+    
+    def _remove(self, key: str):
+        """Remove an entry; the lock must be held."""
+        self._size -= self._entries.pop(key)[2]
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict:
+        """Get local cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+        }
+
+
 class CacheManager:
     """
     Redis-based cache manager with automatic serialization.
     
     Supports both JSON and pickle serialization for different data types.
+    With ``l1_max_bytes`` set, reads are served from an in-process
+    ``LocalCache`` first. Storage is Redis unless another ``backend`` is
+    given.
     """
     
-    def __init__(self, redis_url: str, default_ttl: int = 3600):
+    def __init__(
+        self,
+        redis_url: str,
+        default_ttl: int = 3600,
+        l1_max_bytes: Optional[int] = None,
+        l1_ttl: float = 60,
+        invalidation_channel: str = "cache:invalidate",
+        generation_ttl: float = 5,
+        lease_ttl: float = 15,
+        lease_poll: float = 0.05,
+        stale_ttl: int = 0,
+        ttl_jitter: float = 0.0,
+        compression: Optional[str] = None,
+        compression_threshold: int = serialization.DEFAULT_COMPRESSION_THRESHOLD,
+        admission: Optional[AdmissionPolicy] = None,
+        backend: Optional[CacheBackend] = None,
+    ):
         """
         Initialize cache manager.
         
         Args:
             redis_url: Redis connection URL
             default_ttl: Default TTL in seconds (default: 1 hour)
+            l1_max_bytes: Size bound of the in-process L1 tier in bytes
+                (None or 0 disables it)
+            l1_ttl: Maximum lifetime of an L1 entry in seconds; entries
+                never outlive the Redis copy either
+            invalidation_channel: Redis pub/sub channel used to invalidate
+                the L1 tier of every process
+            generation_ttl: Seconds a namespace generation is reused before
+                it is read from Redis again (bumps are also pushed over
+                ``invalidation_channel``)
+            lease_ttl: Lifetime of a single-flight lease in seconds; other
+                processes wait at most this long for the lease holder
+            lease_poll: Initial interval between checks for the lease
+                holder's value in seconds (doubles up to 0.5)
+            stale_ttl: Seconds a value stays available (as stale) after its
+                TTL; 0 disables stale-while-revalidate
+            ttl_jitter: Maximum fraction by which written TTLs are randomly
+                shortened (e.g. 0.1 = up to 10%)
+            compression: Compressor for written values ("zlib", "zstd",
+                "lz4"; None disables)
+            compression_threshold: Values smaller than this many bytes are
+                not compressed
+            admission: Per-prefix admission and TTL rules applied to every
+                write (None admits everything with the requested TTL)
+            backend: Storage backend (defaults to a ``RedisBackend`` on
+                ``redis_url``)
+                
+        Raises:
+            ValueError: If the compressor is unknown or not installed
         """
+        if compression:
+            serialization.validate("json", compression)
+        
         self.redis_url = redis_url
         self.default_ttl = default_ttl
-        self._client: Optional[Redis] = None
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.backend = backend if backend is not None else RedisBackend(redis_url)
+        
+        self.policy = admission
+        self.l1: Optional[LocalCache] = (
+            LocalCache(l1_max_bytes, l1_ttl, on_evict=self._record_eviction) if l1_max_bytes else None
+        )
+        self.invalidation_channel = invalidation_channel
+        self.model_version: Optional[str] = None
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        
+        # namespace -> (generation, reuse until (monotonic))
+        self.generation_ttl = generation_ttl
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        
+        # key -> computation in flight in this process
+        self.lease_ttl = lease_ttl
+        self.lease_poll = lease_poll
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # key -> background refresh of a stale value
+        self.stale_ttl = stale_ttl
+        self.ttl_jitter = ttl_jitter
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.coalesced_local = 0
+        self.coalesced_remote = 0
+        self.lease_timeouts = 0
+        self.stale_hits = 0
+        self.refreshes = 0
     
     async def connect(self):
-        """Connect to Redis."""
-        if self._client is None:
-            self._client = await redis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=False,  # We handle encoding ourselves
-            )
-            logger.info("Connected to Redis cache")
+        """Connect to the backend."""
+        await self.backend.connect()
+        
+        if self.l1 is not None or self._generations:
+            self._ensure_listener()
     
     async def disconnect(self):
-        """Disconnect from Redis."""
-        if self._client:
-            await self._client.close()
-            self._client = None
-            logger.info("Disconnected from Redis cache")
+        """Disconnect from the backend."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        
+        await self.backend.close()
     
     async def get(self, key: str, deserialize: str = "json") -> Optional[Any]:
         """
         Get value from cache.
         
+        Args:
+            key: Cache key
+            deserialize: Deserialization method of values written without
+                a codec tag ("json" or "pickle"); tagged values are decoded
+                with the codec they were written with
+                
+        Returns:
+            Cached value (stale values included) or None if not found
+        """
+        value, _ = await self.get_with_status(key, deserialize)
+        return value
+    
+    async def get_with_status(self, key: str, deserialize: str = "json") -> Tuple[Optional[Any], bool]:
+        """
+        Get value from cache along with whether it is stale.
+        
         Args:
             key: Cache key
             deserialize: Deserialization method ("json" or "pickle")
             
         Returns:
-            Cached value or None if not found
+            Tuple of (cached value or None, True if the value is past its
+            soft TTL and should be refreshed)
         """
         try:
-            await self.connect()
-            value = await self._client.get(key)
+            if self.l1 is not None:
+                value = self.l1.get(key)
+                if value is not None:
+                    self._record_hit("l1", key)
+                    return serialization.decode(value, deserialize), False
             
-            if value is None:
-                return None
+            await self.connect()
+            # The remaining TTL tells whether the value is stale and bounds
+            # the lifetime of the L1 copy
+            value, ttl_ms = (await self.backend.get_many([key], self.policy))[0]
             
-            if deserialize == "json":
-                return json.loads(value)
-            elif deserialize == "pickle":
-                return pickle.loads(value)
-            else:
-                return value.decode("utf-8")
+            return self._accept(key, value, ttl_ms, deserialize)
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
-            return None
+            return None, False
+    
+    async def get_many(self, keys: List[str], deserialize: str = "json") -> List[Optional[Any]]:
+        """
+        Get several values in one round trip.
+        
+        Args:
+            keys: Cache keys
+            deserialize: Deserialization method of untagged values
+            
+        Returns:
+            Values in the same order as ``keys`` (None for misses)
+        """
+        return [value for value, _ in await self.get_many_with_status(keys, deserialize)]
+    
+    async def get_many_with_status(
+        self,
+        keys: List[str],
+        deserialize: str = "json",
+    ) -> List[Tuple[Optional[Any], bool]]:
+        """
+        Get several values and whether they are stale in one round trip.
+        
+        Keys held in the L1 tier are served locally; the rest are fetched
+        in one backend round trip (with Redis, a single MGET pipelined
+        with their PTTLs).
+        
+        Args:
+            keys: Cache keys
+            deserialize: Deserialization method of untagged values
+            
+        Returns:
+            (value or None, stale) tuples in the same order as ``keys``
+        """
+        entries: List[Tuple[Optional[Any], bool]] = [(None, False)] * len(keys)
+        remote: List[int] = []
+        
+        for i, key in enumerate(keys):
+            value = self.l1.get(key) if self.l1 is not None else None
+            if value is None:
+                remote.append(i)
+                continue
+            try:
+                entries[i] = (serialization.decode(value, deserialize), False)
+                self._record_hit("l1", key)
+            except Exception as e:
+                logger.error(f"Cache get error for key {key}: {e}")
+        
+        if not remote:
+            return entries
+        
+        remote_keys = [keys[i] for i in remote]
+        try:
+            await self.connect()
+            fetched = await self.backend.get_many(remote_keys, self.policy)
+        except Exception as e:
+            logger.error(f"Cache get_many error for {len(remote_keys)} keys: {e}")
+            return entries
+        
+        for i, (value, ttl_ms) in zip(remote, fetched):
+            try:
+                entries[i] = self._accept(keys[i], value, ttl_ms, deserialize)
+            except Exception as e:
+                logger.error(f"Cache get error for key {keys[i]}: {e}")
+        
+        hits = sum(1 for value, _ in entries if value is not None)
+        logger.debug(f"Cache get_many: {hits}/{len(keys)} hits")
+        return entries
+    
+    def _accept(self, key: str, value: Optional[bytes], ttl_ms: int, deserialize: str) -> Tuple[Optional[Any], bool]:
+        """
+        Decode a value read from the backend, count it and fill the L1 tier.
+        
+        Args:
+            key: Cache key
+            value: Raw value, None on a miss
+            ttl_ms: Remaining PTTL (negative if unknown)
+            deserialize: Deserialization method of untagged values
+            
+        Returns:
+            Tuple of (decoded value or None, stale)
+        """
+        rule = self.policy.rule_for(key) if self.policy is not None else None
+        if value is None:
+            self.misses += 1
+            cache_misses.inc()
+            if rule is not None:
+                rule.record("miss")
+            return None, False
+        
+        self._record_hit("l2")
+        if rule is not None:
+            rule.record("hit")
+        decoded = serialization.decode(value, deserialize)
+        
+        fresh_seconds = (ttl_ms / 1000 - self.stale_ttl) if ttl_ms >= 0 else None
+        stale = self.stale_ttl > 0 and fresh_seconds is not None and fresh_seconds <= 0
+        if stale:
+            self.stale_hits += 1
+            cache_stale_hits.inc()
+        elif self.l1 is not None:
+            # Stale values stay out of L1 so every read sees the refresh
+            self.l1.set(key, value, ttl=fresh_seconds)
+        return decoded, stale
+    
+    def _record_eviction(self, key: str):
+        """Count an L1 eviction against the key's rule."""
+        rule = self.policy.rule_for(key) if self.policy is not None else None
+        if rule is not None:
+            rule.record("evicted")
+    
+    def _record_hit(self, tier: str, key: Optional[str] = None):
+        """Count a hit in the given tier."""
+        if tier == "l1":
+            self.l1_hits += 1
+            rule = self.policy.rule_for(key) if self.policy is not None and key else None
+            if rule is not None:
+                rule.record("hit")
+        else:
+            self.l2_hits += 1
+        cache_hits.inc()
+        cache_tier_hits.labels(tier=tier).inc()
     
     async def set(
         self,
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        serialize: str = "json"
+        serialize: str = "json",
+        negative: bool = False,
     ) -> bool:
         """
         Set value in cache.
@@ -95,28 +501,139 @@ class CacheManager:
         Args:
             key: Cache key
             value: Value to cache
-            ttl: Time to live in seconds (None = use default)
-            serialize: Serialization method ("json" or "pickle")
+            ttl: Time to live in seconds (None = use default); with
+                ``stale_ttl`` set this is the soft TTL
+            serialize: Serialization method ("json", "pickle", "msgpack" or
+                "text"); values are compressed per ``compression``
+            negative: Whether the value records a failure; negative values
+                are only cached under a rule with a ``negative_ttl``
+                
+        Returns:
+            True if the value was stored, False on error or if the
+            admission policy rejected it
+        """
+        return bool(await self.set_many(
+            {key: value}, ttl=ttl, serialize=serialize, negative=[key] if negative else ()
+        ))
+    
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        serialize: str = "json",
+        negative: Collection[str] = (),
+    ) -> List[str]:
+        """
+        Set several values in one backend round trip.
+        
+        Every value goes through the admission policy, if any: it may be
+        rejected (too large, not requested often enough) or get a rule's
+        TTL.
+        
+        Args:
+            items: Values by cache key
+            ttl: TTL in seconds for every key, or TTLs by key (keys missing
+                from the dict and None use the default)
+            serialize: Serialization method ("json", "pickle", "msgpack" or
+                "text")
+            negative: Keys whose values record failures
             
         Returns:
-            True if successful, False otherwise
+            Keys of the values stored, in ``items`` order (rejected and
+            failed writes are left out)
         """
+        if not items:
+            return []
+        
         try:
             await self.connect()
             
-            if serialize == "json":
-                serialized = json.dumps(value)
-            elif serialize == "pickle":
-                serialized = pickle.dumps(value)
-            else:
-                serialized = str(value)
+            writes = []
+            for key, value in items.items():
+                serialized = self._encode(value, serialize)
+                key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                key_ttl, rule, gated = self._admit(
+                    key, len(serialized), key_ttl or self.default_ttl, key in negative
+                )
+                if key_ttl is not None:
+                    writes.append((key, serialized, self._jittered(key_ttl), rule, gated))
             
-            ttl = ttl or self.default_ttl
-            await self._client.setex(key, ttl, serialized)
-            return True
+            written = await self.backend.set_many(
+                [
+                    (key, serialized, key_ttl + self.stale_ttl, rule if gated else None)
+                    for key, serialized, key_ttl, rule, gated in writes
+                ],
+                self.policy,
+            )
+            
+            stored = []
+            for (key, serialized, key_ttl, rule, gated), ok in zip(writes, written):
+                if not ok:
+                    rule.record("rejected_frequency")
+                    continue
+                if rule is not None:
+                    rule.record("admitted")
+                if self.l1 is not None:
+                    self.l1.set(key, serialized, ttl=key_ttl)
+                stored.append(key)
+            return stored
         except Exception as e:
-            logger.error(f"Cache set error for key {key}: {e}")
-            return False
+            logger.error(f"Cache set error for {len(items)} keys: {e}")
+            return []
+    
+    def _admit(
+        self,
+        key: str,
+        size: int,
+        ttl: int,
+        negative: bool,
+    ) -> Tuple[Optional[int], Optional[CacheRule], bool]:
+        """
+        Apply the admission policy to a write.
+        
+        Args:
+            key: Cache key
+            size: Encoded value size in bytes
+            ttl: Requested TTL
+            negative: Whether the value records a failure
+            
+        Returns:
+            Tuple of (TTL, or None if rejected; matching rule; whether the
+            write must pass the frequency check)
+        """
+        rule = self.policy.rule_for(key) if self.policy is not None else None
+        if rule is None:
+            # Failures are only cached where a rule says for how long
+            return (None if negative else ttl), None, False
+        
+        if negative:
+            if rule.negative_ttl is None:
+                rule.record("rejected_negative")
+                return None, rule, False
+            rule.record("negative")
+            return rule.negative_ttl, rule, False
+        
+        if rule.max_bytes is not None and size > rule.max_bytes:
+            rule.record("rejected_size")
+            return None, rule, False
+        return rule.ttl_for(size, ttl), rule, rule.min_frequency > 1
+    
+    def _encode(self, value: Any, serialize: str) -> bytes:
+        """Encode a value with the configured compression."""
+        serialized, codec = serialization.encode(
+            value,
+            serialize if serialize in ("json", "pickle", "msgpack") else "text",
+            self.compression,
+            self.compression_threshold,
+        )
+        cache_value_bytes.labels(codec=codec).observe(len(serialized))
+        return serialized
+    
+    def _jittered(self, ttl: int) -> int:
+        """Shorten a TTL by a random fraction of up to ``ttl_jitter``."""
+        if self.ttl_jitter <= 0:
+            return ttl
+        return max(1, int(ttl * (1 - random.uniform(0, self.ttl_jitter))))
     
     async def delete(self, key: str) -> bool:
         """
@@ -130,12 +647,42 @@ class CacheManager:
         """
         try:
             await self.connect()
-            result = await self._client.delete(key)
+            result = await self.backend.delete([key])
+            
+            if self.l1 is not None:
+                self.l1.delete(key)
+                await self._publish({"op": "delete", "keys": [key]})
             return result > 0
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
     
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several values in one backend round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        
+        try:
+            await self.connect()
+            result = await self.backend.delete(keys)
+            
+            if self.l1 is not None:
+                for key in keys:
+                    self.l1.delete(key)
+                await self._publish({"op": "delete", "keys": list(keys)})
+            return result
+        except Exception as e:
+            logger.error(f"Cache delete_many error for {len(keys)} keys: {e}")
+            return 0
+    
     async def exists(self, key: str) -> bool:
         """
         Check if key exists in cache.
@@ -147,9 +694,12 @@ class CacheManager:
             True if exists, False otherwise
         """
         try:
+            if self.l1 is not None and self.l1.get(key) is not None:
+                return True
+            
             await self.connect()
-            result = await self._client.exists(key)
-            return result > 0
+            value, _ = (await self.backend.get_many([key]))[0]
+            return value is not None
         except Exception as e:
             logger.error(f"Cache exists error for key {key}: {e}")
             return False
@@ -166,17 +716,270 @@ class CacheManager:
         """
         try:
             await self.connect()
-            keys = []
-            async for key in self._client.scan_iter(match=pattern):
-                keys.append(key)
+            deleted = await self.backend.delete_matching(pattern)
             
-            if keys:
-                return await self._client.delete(*keys)
-            return 0
+            if self.l1 is not None:
+                self.l1.delete_matching(pattern)
+                await self._publish({"op": "pattern", "pattern": pattern})
+            return deleted
         except Exception as e:
             logger.error(f"Cache clear pattern error for {pattern}: {e}")
             return 0
     
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        serialize: str = "json",
+    ) -> Any:
+        """
+        Get a value, computing and caching it once on a miss.
+        
+        Concurrent misses of the same key share one computation (see
+        ``get_or_compute_many``). A stale value is returned as is and
+        recomputed in the background. None results are not cached.
+        
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value
+            ttl: Time to live in seconds (None = use default)
+            serialize: Serialization method ("json" or "pickle")
+            
+        Returns:
+            Cached or computed value
+        """
+        async def compute_and_set(indices: List[int]) -> List[Any]:
+            value = await compute()
+            if value is not None:
+                await self.set(key, value, ttl=ttl, serialize=serialize)
+            return [value]
+        
+        value, stale = await self.get_with_status(key, deserialize=serialize)
+        if value is not None:
+            if stale:
+                self.schedule_refresh(key, lambda: compute_and_set([0]))
+            return value
+        
+        values = await self.get_or_compute_many([key], compute_and_set, deserialize=serialize)
+        return values[0]
+    
+    async def get_or_compute_many(
+        self,
+        keys: List[str],
+        compute: Callable[[List[int]], Awaitable[List[Any]]],
+        deserialize: str = "json",
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> List[Any]:
+        """
+        Compute missing values once across concurrent callers (single-flight).
+        
+        Keys already being computed in this process are awaited. For the
+        others a Redis lease is taken (one round trip for all keys): keys
+        whose lease is won are passed to ``compute``, which must write
+        them to the cache; keys leased by another process are polled until
+        that process has cached the value, and computed here if the lease
+        is released without a value or times out.
+        
+        Args:
+            keys: Cache keys that missed
+            compute: Coroutine function taking indices into ``keys`` and
+                returning their values in the same order; it is expected
+                to cache them
+            deserialize: Deserialization method of cached values
+            decode: Optional conversion of values read from the cache
+                (returning None counts as no value)
+                
+        Returns:
+            Values in the same order as ``keys``
+        """
+        loop = asyncio.get_running_loop()
+        results: List[Any] = [None] * len(keys)
+        owned: Dict[int, asyncio.Future] = {}
+        waiting: Dict[int, asyncio.Future] = {}
+        
+        for i, key in enumerate(keys):
+            future = self._inflight.get(key)
+            if future is not None and not future.done() and future.get_loop() is loop:
+                waiting[i] = future
+            else:
+                future = loop.create_future()
+                self._inflight[key] = future
+                owned[i] = future
+        
+        tokens = await self._acquire_leases([keys[i] for i in owned])
+        leaders = [i for i, token in zip(owned, tokens) if token is not None]
+        followers = [i for i, token in zip(owned, tokens) if token is None]
+        
+        try:
+            # Poll for other processes' values while computing our own
+            remote = asyncio.gather(*(
+                self._wait_for_value(keys[i], deserialize) for i in followers
+            ))
+            try:
+                if leaders:
+                    for i, value in zip(leaders, await compute(leaders)):
+                        results[i] = value
+                        owned[i].set_result(value)
+            finally:
+                remote_values = await remote
+            
+            retry = []
+            for i, value in zip(followers, remote_values):
+                if value is not None and decode is not None:
+                    value = decode(value)
+                if value is None:
+                    retry.append(i)
+                    continue
+                self.coalesced_remote += 1
+                cache_coalesced.labels(scope="remote").inc()
+                results[i] = value
+                owned[i].set_result(value)
+            
+            if retry:
+                for i, value in zip(retry, await compute(retry)):
+                    results[i] = value
+                    owned[i].set_result(value)
+        except BaseException as e:
+            for future in owned.values():
+                if not future.done():
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                        # Retrieved by waiters, if any; avoids "never retrieved" warnings
+                        future.exception()
+            raise
+        finally:
+            for i, future in owned.items():
+                if self._inflight.get(keys[i]) is future:
+                    del self._inflight[keys[i]]
+            await self._release_leases([
+                (keys[i], token) for i, token in zip(owned, tokens) if token
+            ])
+        
+        for i, future in waiting.items():
+            results[i] = await asyncio.shield(future)
+            self.coalesced_local += 1
+            cache_coalesced.labels(scope="local").inc()
+        
+        return results
+    
+    def schedule_refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Refresh a stale value in the background, once per key.
+        
+        A refresh already running in this process is not duplicated, and
+        the single-flight lease keeps other processes from refreshing the
+        same key at the same time.
+        
+        Args:
+            key: Cache key of the stale value
+            refresh: Coroutine function recomputing and caching the value
+            
+        Returns:
+            True if a refresh was scheduled
+        """
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return False
+        
+        self._refreshing[key] = asyncio.get_running_loop().create_task(self._refresh(key, refresh))
+        return True
+    
+    async def _refresh(self, key: str, refresh: Callable[[], Awaitable[Any]]):
+        """Run one background refresh under the key's lease."""
+        try:
+            token = (await self._acquire_leases([key]))[0]
+            if token is None:
+                # Another process is refreshing it
+                return
+            try:
+                await refresh()
+                self.refreshes += 1
+                cache_refreshes.inc()
+            finally:
+                await self._release_leases([(key, token)] if token else [])
+        except Exception as e:
+            logger.error(f"Cache refresh error for key {key}: {e}")
+        finally:
+            if self._refreshing.get(key) is asyncio.current_task():
+                del self._refreshing[key]
+    
+    @staticmethod
+    def _lease_key(key: str) -> str:
+        """Cache key of a single-flight lease."""
+        return f"lease:{key}"
+    
+    async def _acquire_leases(self, keys: List[str]) -> List[Optional[str]]:
+        """
+        Try to take the single-flight lease of each key.
+        
+        Returns:
+            Per key, the lease token if it was acquired (or the backend is
+            unavailable, so the caller computes), None if another process
+            holds it
+        """
+        if not keys:
+            return []
+        
+        tokens = [uuid.uuid4().hex for _ in keys]
+        try:
+            await self.connect()
+            acquired = await self.backend.add_many([
+                (self._lease_key(key), token, int(self.lease_ttl * 1000))
+                for key, token in zip(keys, tokens)
+            ])
+        except Exception as e:
+            logger.error(f"Cache lease error: {e}")
+            return [""] * len(keys)
+        
+        return [token if ok else None for token, ok in zip(tokens, acquired)]
+    
+    async def _release_leases(self, leases: List[Tuple[str, str]]):
+        """Release (key, token) leases that are still held with the token."""
+        if not leases:
+            return
+        
+        try:
+            await self.backend.delete_if_equal([
+                (self._lease_key(key), token) for key, token in leases
+            ])
+        except Exception as e:
+            # Leases expire on their own
+            logger.error(f"Cache lease release error: {e}")
+    
+    async def _wait_for_value(self, key: str, deserialize: str) -> Optional[Any]:
+        """
+        Wait for the holder of a key's lease to cache its value.
+        
+        Returns:
+            Deserialized value, or None if the lease was released without
+            a value or the wait timed out
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lease_ttl
+        delay = self.lease_poll
+        
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                (value, _), (leased, _) = await self.backend.get_many([key, self._lease_key(key)])
+                
+                if value is not None:
+                    return serialization.decode(value, deserialize)
+                if leased is None:
+                    return None
+                if loop.time() >= deadline:
+                    self.lease_timeouts += 1
+                    cache_lease_timeouts.inc()
+                    logger.warning(f"Timed out waiting for lease holder of {key}")
+                    return None
+                delay = min(delay * 2, 0.5)
+        except Exception as e:
+            logger.error(f"Cache lease wait error for key {key}: {e}")
+            return None
+    
     async def get_ttl(self, key: str) -> Optional[int]:
         """
         Get remaining TTL for key.
@@ -189,12 +992,225 @@ class CacheManager:
         """
         try:
             await self.connect()
-            ttl = await self._client.ttl(key)
+            _, ttl_ms = (await self.backend.get_many([key]))[0]
+            ttl = round(ttl_ms / 1000)
             return ttl if ttl > 0 else None
         except Exception as e:
             logger.error(f"Cache get TTL error for key {key}: {e}")
             return None
     
+    async def notify_model_version(self, version: Optional[str]):
+        """
+        Invalidate L1 tiers after the model version changed.
+        
+        Clears the local L1 tier and tells every other process to clear
+        theirs unless it already serves the same version.
+        
+        Args:
+            version: Identifier of the model version now in use
+        """
+        if version == self.model_version:
+            return
+        self.model_version = version
+        if self.l1 is None:
+            return
+        
+        self.l1.clear()
+        try:
+            await self.connect()
+            await self._publish({"op": "model_version", "version": version})
+        except Exception as e:
+            logger.error(f"Cache model version broadcast error: {e}")
+    
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        """Cache key of a namespace's generation counter."""
+        # Outside the namespace so clear_pattern("<namespace>:*") keeps it
+        return f"cache:generation:{namespace}"
+    
+    async def get_generation(self, namespace: str) -> int:
+        """
+        Get the current generation of a key namespace.
+        
+        Args:
+            namespace: Key namespace (e.g., "analysis")
+            
+        Returns:
+            Generation number (0 until the namespace is first invalidated)
+        """
+        cached = self._generations.get(namespace)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        
+        try:
+            await self.connect()
+            generation = await self.backend.get_counter(self._generation_key(namespace))
+        except Exception as e:
+            logger.error(f"Cache generation error for namespace {namespace}: {e}")
+            return cached[0] if cached is not None else 0
+        
+        self._set_generation(namespace, generation)
+        return generation
+    
+    async def namespace_prefix(self, namespace: str) -> str:
+        """
+        Get the key prefix of a namespace's current generation.
+        
+        Args:
+            namespace: Key namespace (e.g., "analysis")
+            
+        Returns:
+            Prefix such as "analysis:g3"; append ":<key>" to build a key
+        """
+        return f"{namespace}:g{await self.get_generation(namespace)}"
+    
+    async def invalidate_namespace(self, namespace: str) -> Optional[int]:
+        """
+        Invalidate every key of a namespace with one atomic INCR.
+        
+        Keys of older generations are never read again and expire through
+        their TTL, so nothing is scanned or deleted.
+        
+        Args:
+            namespace: Key namespace (e.g., "analysis")
+            
+        Returns:
+            New generation, or None on error
+        """
+        try:
+            await self.connect()
+            generation = await self.backend.incr(self._generation_key(namespace))
+        except Exception as e:
+            logger.error(f"Cache invalidate error for namespace {namespace}: {e}")
+            return None
+        
+        self._set_generation(namespace, generation)
+        await self._publish({"op": "generation", "namespace": namespace, "generation": generation})
+        logger.info(f"Cache namespace {namespace} moved to generation {generation}")
+        return generation
+    
+    def invalidate_namespace_sync(self, namespace: str) -> int:
+        """
+        Blocking variant of ``invalidate_namespace`` for synchronous callers.
+        
+        Args:
+            namespace: Key namespace (e.g., "analysis")
+            
+        Returns:
+            New generation
+            
+        Raises:
+            Exception: If the backend is unavailable
+        """
+        generation = self.backend.incr_sync(self._generation_key(namespace))
+        self.backend.publish_sync(
+            self.invalidation_channel,
+            json.dumps({
+                "op": "generation",
+                "namespace": namespace,
+                "generation": generation,
+                "origin": self._instance_id,
+            }),
+        )
+        
+        self._set_generation(namespace, generation)
+        logger.info(f"Cache namespace {namespace} moved to generation {generation}")
+        return generation
+    
+    def _set_generation(self, namespace: str, generation: int):
+        """Record a namespace generation and drop L1 entries of older ones."""
+        cached = self._generations.get(namespace)
+        if cached is not None and cached[0] > generation:
+            # A newer bump was already seen (pushed while this read was in flight)
+            generation = cached[0]
+        self._generations[namespace] = (generation, time.monotonic() + self.generation_ttl)
+        if self.l1 is not None and (cached is None or cached[0] != generation):
+            self.l1.delete_matching(f"{namespace}:*")
+    
+    async def _publish(self, message: Dict):
+        """Broadcast an L1 invalidation to the other processes."""
+        try:
+            await self.backend.publish(
+                self.invalidation_channel,
+                json.dumps({**message, "origin": self._instance_id}),
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+    
+    def _ensure_listener(self):
+        """Start (or restart) the invalidation listener on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+    
+    async def _listen(self):
+        """Apply L1 invalidations broadcast by other processes."""
+        while True:
+            try:
+                async for data in self.backend.subscribe(self.invalidation_channel):
+                    self._apply_invalidation(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while disconnected
+                logger.error(f"Cache invalidation listener error: {e}")
+                if self.l1 is not None:
+                    self.l1.clear()
+                self._generations.clear()
+                await asyncio.sleep(1)
+    
+    def _apply_invalidation(self, data: Union[bytes, str, None]):
+        """Apply one invalidation message to the L1 tier and generations."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        
+        op = message.get("op")
+        if op == "generation":
+            self._set_generation(message.get("namespace"), int(message.get("generation", 0)))
+        elif self.l1 is None:
+            return
+        elif op == "delete":
+            for key in message.get("keys", ()):
+                self.l1.delete(key)
+        elif op == "pattern":
+            self.l1.delete_matching(message.get("pattern", "*"))
+        elif op == "model_version":
+            if message.get("version") != self.model_version:
+                self.l1.clear()
+    
+    def get_stats(self) -> Dict:
+        """
+        Get hit statistics of both tiers.
+        
+        Returns:
+            Dict with L1/L2 hits, misses and hit ratios, the L1 tier's own
+            statistics (None when disabled), single-flight counters,
+            stale-while-revalidate counters, admission events by rule and
+            backend statistics
+        """
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "lookups": lookups,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_hit_ratio": self.l1_hits / lookups if lookups else 0.0,
+            "l2_hit_ratio": self.l2_hits / lookups if lookups else 0.0,
+            "hit_ratio": (self.l1_hits + self.l2_hits) / lookups if lookups else 0.0,
+            "l1": self.l1.get_stats() if self.l1 is not None else None,
+            "coalesced_local": self.coalesced_local,
+            "coalesced_remote": self.coalesced_remote,
+            "lease_timeouts": self.lease_timeouts,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "admission": self.policy.get_stats() if self.policy is not None else None,
+            "backend": self.backend.get_stats(),
+        }
+    
     @staticmethod
     def generate_key(*args, prefix: str = "", **kwargs) -> str:
         """
@@ -225,21 +1241,66 @@ class CacheManager:
 _cache_manager: Optional[CacheManager] = None
 
 
-def get_cache_manager(redis_url: str = "redis://localhost:6379", default_ttl: int = 3600) -> CacheManager:
+def get_cache_manager(redis_url: Optional[str] = None, default_ttl: int = 3600) -> CacheManager:
     """
     Get global cache manager instance.
     
+    The backend is chosen by ``settings.cache_backend``: "redis" (sharded
+    over ``settings.redis_shard_urls`` when set) or "sqlite" (a local file
+    at ``settings.cache_disk_path``).
+    
     Args:
-        redis_url: Redis connection URL
+        redis_url: Redis connection URL (defaults to settings.redis_url;
+            disables sharding)
         default_ttl: Default TTL in seconds
         
     Returns:
         CacheManager instance
+        
+    Raises:
+        ValueError: If the configured backend is unknown
     """
     global _cache_manager
     
     if _cache_manager is None:
-        _cache_manager = CacheManager(redis_url, default_ttl)
+        from config.settings import get_settings
+        settings = get_settings()
+        
+        if settings.cache_backend == "sqlite":
+            backend: CacheBackend = SQLiteBackend(
+                settings.cache_disk_path,
+                max_bytes=settings.cache_disk_max_bytes,
+            )
+        elif settings.cache_backend == "redis" and settings.redis_shard_urls and not redis_url:
+            backend = ShardedRedisBackend(
+                settings.redis_shard_urls,
+                vnodes=settings.redis_shard_vnodes,
+                retry_interval=settings.redis_shard_retry_interval or None,
+            )
+        elif settings.cache_backend == "redis":
+            backend = RedisBackend(redis_url or settings.redis_url)
+        else:
+            raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
+        
+        _cache_manager = CacheManager(
+            redis_url or settings.redis_url,
+            default_ttl,
+            l1_max_bytes=settings.cache_l1_max_bytes if settings.cache_l1_enabled else None,
+            l1_ttl=settings.cache_l1_ttl,
+            invalidation_channel=settings.cache_invalidation_channel,
+            lease_ttl=settings.cache_lease_ttl,
+            lease_poll=settings.cache_lease_poll,
+            stale_ttl=settings.cache_stale_ttl,
+            ttl_jitter=settings.cache_ttl_jitter,
+            compression=settings.cache_compression,
+            compression_threshold=settings.cache_compression_threshold,
+            admission=AdmissionPolicy.from_config(
+                settings.cache_rules,
+                sketch_width=settings.cache_sketch_width,
+                window=settings.cache_sketch_window,
+            ) if settings.cache_rules else None,
+            backend=backend,
+        )
     
     return _cache_manager
 
@@ -275,20 +1336,14 @@ def cached(
                 **kwargs
             )
             
-            # Try to get from cache
-            cached_value = await cache.get(cache_key, deserialize=serialize)
-            if cached_value is not None:
-                logger.debug(f"Cache hit for {cache_key}")
-                return cached_value
-            
-            # Execute function
-            logger.debug(f"Cache miss for {cache_key}")
-            result = await func(*args, **kwargs)
-            
-            # Store in cache
-            await cache.set(cache_key, result, ttl=ttl, serialize=serialize)
-            
-            return result
+            # Get from cache, or execute the function once across
+            # concurrent callers and store the result
+            return await cache.get_or_compute(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                serialize=serialize,
+            )
         
         return wrapper
     return decorator
@@ -0,0 +1,207 @@
+"""
+Near-duplicate index for the analysis cache.
+
+The exact cache is keyed by a hash of the normalized text, so the same
+wire story re-pasted with a different byline, extra whitespace or a
+tracking footer always misses it. ``NearDuplicateIndex`` keeps MinHash
+signatures of recently analyzed texts (word 3-gram shingles) in an
+in-process LSH table: the signature is split into bands, texts sharing
+any band are candidates, and a candidate whose estimated Jaccard
+similarity reaches the threshold is a match. The index only maps a
+signature to the exact cache key of the original text; the result itself
+stays in Redis, so entries that expired there are dropped on lookup.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+class NearDuplicateIndex:
+    """
+    Bounded MinHash/LSH index from text signatures to cache keys.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        max_entries: int = 10000,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        Initialize index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of the shingle
+                sets for two texts to count as near-duplicates
+            max_entries: Maximum signatures kept (least recently used
+                entries are evicted first)
+            num_perm: MinHash signature length
+            bands: LSH bands (``num_perm`` must be divisible by it); more
+                bands find more candidates at lower similarity
+            shingle_size: Words per shingle
+            seed: Seed of the hash permutations
+        """
+        import numpy as np
+
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = max(1, shingle_size)
+
+        # Multiply-shift hash family: h(x) = (a * x + b) mod 2**64 >> 32, a odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+
+        # key -> signature, in LRU order
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        # (band, band bytes) -> keys
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+
+    def signature(self, text: str):
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Text to fingerprint
+
+        Returns:
+            uint32 array of length ``num_perm``, or None if the text is
+            shorter than one shingle
+        """
+        import numpy as np
+
+        words = _WORD.findall(text.lower())
+        if len(words) < self.shingle_size:
+            return None
+
+        shingles = {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # uint64 arithmetic wraps around, which is the "mod 2**64"
+        permuted = (self._a * hashes + self._b) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature) -> List[Tuple[int, bytes]]:
+        """Bucket keys of a signature, one per band."""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def lookup(self, signature) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed text.
+
+        Args:
+            signature: Signature from ``signature``
+
+        Returns:
+            Tuple of (cache key, estimated similarity) of the best match
+            at or above the threshold, or None
+        """
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for bucket in self._band_keys(signature):
+                candidates.update(self._buckets.get(bucket, ()))
+
+            best = None
+            for key in candidates:
+                similarity = float((self._entries[key] == signature).mean())
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (key, similarity)
+
+            if best is not None:
+                self.hits += 1
+                self._entries.move_to_end(best[0])
+            return best
+
+    def add(self, signature, key: str):
+        """
+        Index a signature under a cache key.
+
+        Args:
+            signature: Signature from ``signature``
+            key: Exact cache key of the analyzed text
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = signature
+            for bucket in self._band_keys(signature):
+                self._buckets.setdefault(bucket, []).append(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def discard(self, key: str):
+        """
+        Remove a cache key from the index (e.g. after it expired).
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        """Remove an entry; the lock must be held."""
+        signature = self._entries.pop(key)
+        for bucket in self._band_keys(signature):
+            keys = self._buckets.get(bucket)
+            if keys is None:
+                continue
+            keys.remove(key)
+            if not keys:
+                del self._buckets[bucket]
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Get index statistics."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+        }
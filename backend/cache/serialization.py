@@ -0,0 +1,236 @@
+"""
+Cache value codecs.
+
+A cached value is serialized (JSON, pickle, msgpack or plain text) and,
+above a size threshold, compressed (zlib, zstd or LZ4). Encoded values
+start with a three-byte header naming both, so the format used for new
+writes can change without flushing what is already cached: ``decode``
+reads whatever the header says. Values written before the header existed
+never start with a zero byte and are decoded with the caller's legacy
+deserializer.
+
+msgpack, zstd (``zstandard``) and LZ4 (``lz4``) are optional; asking for
+one that is not installed raises ``ValueError`` up front.
+"""
+
+import importlib.util
+import json
+import pickle
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# First byte of a tagged value (legacy JSON, text and pickle never start with it)
+MAGIC = b"\x00"
+
+# Values smaller than this are stored uncompressed
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+
+
+class _Format:
+    """A registered serializer or compressor."""
+
+    def __init__(self, name: str, tag: int, encode: Callable, decode: Callable, module: Optional[str] = None):
+        self.name = name
+        self.tag = tag
+        self.encode = encode
+        self.decode = decode
+        self.module = module
+
+    @property
+    def available(self) -> bool:
+        """Whether the optional module it needs is installed."""
+        return self.module is None or importlib.util.find_spec(self.module) is not None
+
+
+_serializers: Dict[str, _Format] = {}
+_compressors: Dict[str, _Format] = {}
+_serializer_tags: Dict[int, _Format] = {}
+_compressor_tags: Dict[int, _Format] = {}
+
+
+def register_serializer(name: str, tag: int, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any], module: Optional[str] = None):
+    """
+    Register a serializer.
+
+    Args:
+        name: Name used by ``encode`` (e.g. "json")
+        tag: Header byte identifying it in stored values (1-255, never reused)
+        dumps: Value -> bytes
+        loads: Bytes -> value
+        module: Optional module it needs, checked before use
+    """
+    if tag in _serializer_tags and _serializer_tags[tag].name != name:
+        raise ValueError(f"Serializer tag {tag} is already used by {_serializer_tags[tag].name}")
+    codec = _Format(name, tag, dumps, loads, module)
+    _serializers[name] = codec
+    _serializer_tags[tag] = codec
+
+
+def register_compressor(name: str, tag: int, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes], module: Optional[str] = None):
+    """
+    Register a compressor.
+
+    Args:
+        name: Name used by ``encode`` (e.g. "zlib")
+        tag: Header byte identifying it in stored values (1-255, never reused)
+        compress: Bytes -> compressed bytes
+        decompress: Compressed bytes -> bytes
+        module: Optional module it needs, checked before use
+    """
+    if tag in _compressor_tags and _compressor_tags[tag].name != name:
+        raise ValueError(f"Compressor tag {tag} is already used by {_compressor_tags[tag].name}")
+    codec = _Format(name, tag, compress, decompress, module)
+    _compressors[name] = codec
+    _compressor_tags[tag] = codec
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    import msgpack
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    import msgpack
+    return msgpack.unpackb(data, raw=False)
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    import zstandard
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _lz4_compress(data: bytes) -> bytes:
+    import lz4.frame
+    return lz4.frame.compress(data)
+
+
+def _lz4_decompress(data: bytes) -> bytes:
+    import lz4.frame
+    return lz4.frame.decompress(data)
+
+
+register_serializer("text", 1, lambda value: str(value).encode("utf-8"), lambda data: data.decode("utf-8"))
+register_serializer(
+    "json", 2,
+    lambda value: json.dumps(value, separators=(",", ":")).encode("utf-8"),
+    json.loads,
+)
+register_serializer("pickle", 3, lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads)
+register_serializer("msgpack", 4, _msgpack_dumps, _msgpack_loads, module="msgpack")
+
+register_compressor("zlib", 1, lambda data: zlib.compress(data, 6), zlib.decompress)
+register_compressor("zstd", 2, _zstd_compress, _zstd_decompress, module="zstandard")
+register_compressor("lz4", 3, _lz4_compress, _lz4_decompress, module="lz4")
+
+
+def _lookup(registry: Dict[str, _Format], name: str, kind: str) -> _Format:
+    """Find a registered, installed format by name."""
+    codec = registry.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown cache {kind}: {name}")
+    if not codec.available:
+        raise ValueError(f"Cache {kind} {name} needs the {codec.module} package")
+    return codec
+
+
+def validate(serializer: str, compression: Optional[str] = None):
+    """
+    Check that a serializer and compressor exist and are installed.
+
+    Raises:
+        ValueError: If either is unknown or not installed
+    """
+    _lookup(_serializers, serializer, "serializer")
+    if compression:
+        _lookup(_compressors, compression, "compressor")
+
+
+def available_serializers() -> List[str]:
+    """Names of the installed serializers."""
+    return [name for name, codec in _serializers.items() if codec.available]
+
+
+def available_compressors() -> List[str]:
+    """Names of the installed compressors."""
+    return [name for name, codec in _compressors.items() if codec.available]
+
+
+def encode(
+    value: Any,
+    serializer: str = "json",
+    compression: Optional[str] = None,
+    threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+) -> Tuple[bytes, str]:
+    """
+    Encode a value with a codec header.
+
+    Args:
+        value: Value to encode
+        serializer: Serializer name
+        compression: Compressor name, or None for no compression
+        threshold: Only payloads of at least this many bytes are compressed
+
+    Returns:
+        Tuple of (encoded bytes, codec label such as "json+zlib")
+
+    Raises:
+        ValueError: If the serializer or compressor is unknown or not installed
+    """
+    codec = _lookup(_serializers, serializer, "serializer")
+    payload = codec.encode(value)
+
+    compressor_tag = 0
+    label = codec.name
+    if compression and len(payload) >= threshold:
+        compressor = _lookup(_compressors, compression, "compressor")
+        compressed = compressor.encode(payload)
+        # Incompressible payloads are stored as they are
+        if len(compressed) < len(payload):
+            payload = compressed
+            compressor_tag = compressor.tag
+            label = f"{codec.name}+{compressor.name}"
+
+    return MAGIC + bytes((codec.tag, compressor_tag)) + payload, label
+
+
+def decode(data: bytes, legacy: str = "json") -> Any:
+    """
+    Decode a cached value.
+
+    Args:
+        data: Stored bytes
+        legacy: Serializer of values written without a header ("json",
+            "pickle" or "text")
+
+    Returns:
+        Decoded value
+
+    Raises:
+        ValueError: If the header names an unknown or uninstalled codec
+    """
+    if data[:1] != MAGIC:
+        if legacy == "json":
+            return json.loads(data)
+        elif legacy == "pickle":
+            return pickle.loads(data)
+        else:
+            return data.decode("utf-8")
+
+    codec = _serializer_tags.get(data[1])
+    if codec is None:
+        raise ValueError(f"Unknown cache serializer tag: {data[1]}")
+    payload = data[3:]
+    if data[2]:
+        compressor = _compressor_tags.get(data[2])
+        if compressor is None:
+            raise ValueError(f"Unknown cache compressor tag: {data[2]}")
+        payload = compressor.decode(payload)
+    return codec.decode(payload)
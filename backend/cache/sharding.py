@@ -0,0 +1,206 @@
+"""
+Client-side consistent hashing across Redis nodes.
+
+``HashRing`` places every node on a 64-bit ring at ``vnodes`` virtual
+points (hashes of "<node>#<i>") and maps a key to the first point
+clockwise of the key's hash. Adding a node only takes over the arcs in
+front of its own points, so about 1/N of the keys move and keys never
+move between two existing nodes; many virtual points per node keep the
+load even.
+
+Keys containing ``{...}`` are hashed on the part inside the braces only
+(the Redis Cluster hash tag convention), so related keys can be kept on
+one node.
+
+In health-aware mode (``retry_interval`` set) a node marked down is
+skipped for that many seconds: its keys go to the next available node
+clockwise, i.e. spread over the remaining nodes, and return once it is
+retried. A node keeps being preferred if every node is down, so callers
+fail (and fail open) instead of silently changing nodes.
+"""
+
+import bisect
+import hashlib
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+_URL_CREDENTIALS = re.compile(r"//[^/@]*@")
+
+
+def redact_url(url: str) -> str:
+    """Hide the credentials of a Redis URL for logs and stats."""
+    return _URL_CREDENTIALS.sub("//***@", url)
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit hash (same in every process, unlike ``hash``)."""
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def hash_key(key: str) -> str:
+    """Part of a key that decides its node (the hash tag, if any)."""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes and optional health tracking.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        vnodes: int = 160,
+        retry_interval: Optional[float] = None,
+    ):
+        """
+        Initialize ring.
+
+        Args:
+            nodes: Node names (e.g. Redis URLs); order does not matter
+            vnodes: Virtual points per node
+            retry_interval: Seconds a node marked down is skipped (None
+                disables health-aware routing)
+        """
+        self.vnodes = max(1, vnodes)
+        self.retry_interval = retry_interval
+
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: List[str] = []
+        # node -> skipped until (monotonic)
+        self._down: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Nodes on the ring."""
+        return list(self._nodes)
+
+    def add_node(self, node: str):
+        """
+        Add a node (no-op if present).
+
+        Args:
+            node: Node name
+        """
+        with self._lock:
+            if node in self._nodes:
+                return
+            self._nodes.append(node)
+            for i in range(self.vnodes):
+                point = _hash(f"{node}#{i}")
+                index = bisect.bisect(self._points, point)
+                self._points.insert(index, point)
+                self._owners.insert(index, node)
+
+    def remove_node(self, node: str):
+        """
+        Remove a node (its keys move to the next nodes clockwise).
+
+        Args:
+            node: Node name
+        """
+        with self._lock:
+            if node not in self._nodes:
+                return
+            self._nodes.remove(node)
+            kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+            self._points = [point for point, _ in kept]
+            self._owners = [owner for _, owner in kept]
+            self._down.pop(node, None)
+
+    def preference(self, key: str) -> Iterator[str]:
+        """
+        Nodes of a key in ring order, each once (primary first).
+
+        Args:
+            key: Key
+
+        Yields:
+            Node names
+        """
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _hash(hash_key(key)))
+        seen = set()
+        for offset in range(len(self._points)):
+            owner = self._owners[(start + offset) % len(self._points)]
+            if owner not in seen:
+                seen.add(owner)
+                yield owner
+                if len(seen) == len(self._nodes):
+                    return
+
+    def node_for(self, key: str) -> str:
+        """
+        Node a key is routed to.
+
+        In health-aware mode this is the first node of the key's
+        preference list that is not marked down.
+
+        Args:
+            key: Key
+
+        Returns:
+            Node name
+
+        Raises:
+            ValueError: If the ring has no nodes
+        """
+        if not self._nodes:
+            raise ValueError("Hash ring has no nodes")
+
+        primary = None
+        for node in self.preference(key):
+            if primary is None:
+                primary = node
+            if self.is_available(node):
+                return node
+        return primary
+
+    def is_available(self, node: str) -> bool:
+        """Whether a node is not currently marked down."""
+        until = self._down.get(node)
+        if until is None:
+            return True
+        if until <= time.monotonic():
+            # Retry it
+            self._down.pop(node, None)
+            return True
+        return False
+
+    def mark_down(self, node: str):
+        """
+        Skip a node for ``retry_interval`` seconds (health-aware mode only).
+
+        Args:
+            node: Node that failed
+        """
+        if self.retry_interval is None or node not in self._nodes:
+            return
+        if node not in self._down:
+            logger.warning(f"Shard {redact_url(node)} unavailable, skipping it for {self.retry_interval}s")
+        self._down[node] = time.monotonic() + self.retry_interval
+
+    def get_stats(self) -> Dict:
+        """Get nodes and which of them are skipped."""
+        return {
+            "nodes": [redact_url(node) for node in self._nodes],
+            "vnodes": self.vnodes,
+            "down": [redact_url(node) for node in self._nodes if not self.is_available(node)],
+        }
@@ -0,0 +1,474 @@
+"""
+Persistent local cache backend on SQLite.
+
+For single-node deployments, the Gradio app and offline batch runs that
+have no Redis. Every worker process opens the same database file in WAL
+mode, so readers never block and writers wait on SQLite's file lock
+(``busy_timeout``) instead of failing; each operation is one transaction.
+Calls run on a private single-thread executor, so the backend is not
+bound to an event loop and survives ``asyncio.run`` per call.
+
+Entries keep Redis semantics: TTLs are absolute wall-clock deadlines
+(shared by all processes), expired entries read as missing and are purged
+lazily, and keys written by ``incr`` never expire. The file is bounded by
+``max_bytes`` of keys and values: a trigger-maintained running total is
+checked after each write, and past the bound the least recently read
+entries with a TTL are evicted down to 90% of it (read times are
+refreshed at most once per second per entry to keep reads mostly
+read-only).
+
+Published messages go to a table that subscribers poll, which is enough
+for L1 invalidations between processes on one host.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+from .admission import MAX_COUNT, AdmissionPolicy
+from .backends import CacheBackend, Write
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at);
+
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('bytes', 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE stats SET value = value + new.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE stats SET value = value - old.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE stats SET value = value + new.size - old.size WHERE name = 'bytes';
+END;
+
+CREATE TABLE IF NOT EXISTS sketch (
+    key TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (key, slot)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# Read times are only rewritten when older than this (seconds)
+_ACCESS_RESOLUTION = 1.0
+
+# Expired entries, sketch rows and old messages are purged this often (seconds)
+_PURGE_INTERVAL = 60.0
+
+# Published messages are kept this long for subscribers to poll (seconds)
+_MESSAGE_RETENTION = 60.0
+
+# Past the size bound, entries are evicted down to this fraction of it
+_EVICT_TO = 0.9
+
+# SQLite's default limit on host parameters is 999 in older versions
+_MAX_PARAMS = 500
+
+
+def _to_bytes(value: Union[bytes, str]) -> bytes:
+    """Store text values (lease tokens, counters) as bytes, like Redis."""
+    return value.encode("utf-8") if isinstance(value, str) else bytes(value)
+
+
+def _chunks(items: Sequence, size: int = _MAX_PARAMS):
+    """Split a sequence into parameter-sized chunks."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Cache storage in a local SQLite database, bounded in bytes (LRU).
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        busy_timeout: float = 5.0,
+        poll_interval: float = 0.5,
+    ):
+        """
+        Initialize backend.
+
+        Args:
+            path: Database file (created with its directory if missing)
+            max_bytes: Bound on the total size of keys and values; least
+                recently read entries are evicted past it
+            busy_timeout: Seconds a write waits for another process's
+                transaction before failing
+            poll_interval: Seconds between checks for published messages
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self.poll_interval = poll_interval
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+        self.evictions = 0
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the database on the executor thread."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Autocommit mode: transactions are opened explicitly
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        logger.info(f"Opened SQLite cache at {self.path}")
+        return conn
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """Create the executor, again in a forked child process."""
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Threads and connections do not survive a fork
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-cache")
+                self._conn = None
+                self._pid = os.getpid()
+            return self._executor
+
+    def _call(self, func: Callable, *args):
+        """Run ``func(conn, *args)`` on the executor thread."""
+        if self._conn is None:
+            self._conn = self._open()
+        return func(self._conn, *args)
+
+    async def _run(self, func: Callable, *args):
+        """Run a database operation without blocking the event loop."""
+        executor = self._ensure_executor()
+        return await asyncio.get_running_loop().run_in_executor(executor, self._call, func, *args)
+
+    def _run_sync(self, func: Callable, *args):
+        """Run a database operation and wait for it."""
+        return self._ensure_executor().submit(self._call, func, *args).result()
+
+    async def connect(self):
+        """Open the database (idempotent)."""
+        if self._conn is None or self._pid != os.getpid():
+            await self._run(lambda conn: None)
+
+    async def close(self):
+        """Close the database and stop the executor."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        def close(conn):
+            conn.close()
+
+        if self._conn is not None and self._pid == os.getpid():
+            await asyncio.get_running_loop().run_in_executor(executor, close, self._conn)
+        self._conn = None
+        executor.shutdown(wait=False)
+        logger.info("Closed SQLite cache")
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, keys: Sequence[str], counters: List[Tuple[str, List[int]]], window: int):
+        """Read entries, count lookups and refresh read times."""
+        now = time.time()
+        rows = {}
+        for chunk in _chunks(list(dict.fromkeys(keys))):
+            rows.update(
+                (key, (value, expires_at, accessed_at))
+                for key, value, expires_at, accessed_at in conn.execute(
+                    f"SELECT key, value, expires_at, accessed_at FROM entries "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+
+        results = []
+        touched = []
+        for key in keys:
+            row = rows.get(key)
+            if row is None or (row[1] is not None and row[1] <= now):
+                results.append((None, -2))
+                continue
+            value, expires_at, accessed_at = row
+            results.append((value, int((expires_at - now) * 1000) if expires_at is not None else -1))
+            if accessed_at < now - _ACCESS_RESOLUTION:
+                touched.append(key)
+
+        if touched or counters:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if touched:
+                    conn.executemany(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key in touched],
+                    )
+                for sketch, offsets in counters:
+                    conn.executemany(
+                        "INSERT INTO sketch VALUES (?, ?, 1, ?) "
+                        "ON CONFLICT (key, slot) DO UPDATE SET "
+                        "count = min(count + 1, ?), expires_at = excluded.expires_at",
+                        [(sketch, offset, now + 2 * window, MAX_COUNT) for offset in offsets],
+                    )
+        return results
+
+    @staticmethod
+    def _estimate(conn: sqlite3.Connection, sketches: Tuple[str, str], offsets: List[int], now: float) -> int:
+        """Count-min estimate of a key's lookups in the current and previous windows."""
+        counts = dict.fromkeys(offsets, 0)
+        for offset, count in conn.execute(
+            f"SELECT slot, count FROM sketch WHERE key IN (?, ?) AND expires_at > ? "
+            f"AND slot IN ({','.join('?' * len(offsets))})",
+            [*sketches, now, *offsets],
+        ):
+            counts[offset] += count
+        return min(counts.values())
+
+    def _write(self, conn: sqlite3.Connection, writes: Sequence[Write], policy: Optional[AdmissionPolicy]) -> List[bool]:
+        """Write entries (checking gated ones against the sketch) and evict."""
+        now = time.time()
+        written = []
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for key, value, ttl, rule in writes:
+                if rule is not None:
+                    estimate = self._estimate(conn, policy.sketch_keys(rule), policy.counter_offsets(key), now)
+                    if estimate < rule.min_frequency:
+                        written.append(False)
+                        continue
+                value = _to_bytes(value)
+                conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                    "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                    (key, value, len(key) + len(value), now + ttl, now),
+                )
+                written.append(True)
+            self._evict(conn, now)
+        return written
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Purge expired rows periodically and evict LRU entries past the bound."""
+        if now >= self._next_purge:
+            self._next_purge = now + _PURGE_INTERVAL
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM sketch WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM messages WHERE created_at <= ?", (now - _MESSAGE_RETENTION,))
+
+        total = conn.execute("SELECT value FROM stats WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to the low watermark so the next writes don't evict again
+        excess = total - int(self.max_bytes * _EVICT_TO)
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries WHERE expires_at IS NOT NULL ORDER BY accessed_at"
+        ):
+            victims.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        for chunk in _chunks(victims):
+            conn.execute(f"DELETE FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+        self.evictions += len(victims)
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, items: Sequence[Tuple[str, bytes, int]]) -> List[bool]:
+        """Insert keys that are missing or expired."""
+        now = time.time()
+        added = []
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for key, value, ttl_ms in items:
+                value = _to_bytes(value)
+                cursor = conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                    "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at "
+                    "WHERE entries.expires_at <= ?",
+                    (key, value, len(key) + len(value), now + ttl_ms / 1000, now, now),
+                )
+                added.append(cursor.rowcount > 0)
+        return added
+
+    @staticmethod
+    def _delete_if_equal(conn: sqlite3.Connection, items: Sequence[Tuple[str, bytes]]):
+        """Compare-and-delete."""
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "DELETE FROM entries WHERE key = ? AND value = ?",
+                [(key, _to_bytes(value)) for key, value in items],
+            )
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, keys: Sequence[str]) -> int:
+        """Delete live keys."""
+        now = time.time()
+        deleted = 0
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for chunk in _chunks(list(dict.fromkeys(keys))):
+                # Expired rows are deleted too but not counted, like Redis
+                deleted += conn.execute(
+                    f"SELECT count(*) FROM entries WHERE key IN ({','.join('?' * len(chunk))}) "
+                    f"AND (expires_at IS NULL OR expires_at > ?)",
+                    [*chunk, now],
+                ).fetchone()[0]
+                conn.execute(f"DELETE FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+        return deleted
+
+    @staticmethod
+    def _delete_matching(conn: sqlite3.Connection, pattern: str) -> int:
+        """Delete keys matching a glob pattern (same syntax as Redis MATCH)."""
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return conn.execute("DELETE FROM entries WHERE key GLOB ?", (pattern,)).rowcount
+
+    @staticmethod
+    def _incr(conn: sqlite3.Connection, key: str) -> int:
+        """Increment a persistent integer entry."""
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, now),
+            ).fetchone()
+            value = (int(row[0]) if row is not None else 0) + 1
+            data = str(value).encode("utf-8")
+            conn.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, NULL, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires_at = NULL, accessed_at = excluded.accessed_at",
+                (key, data, len(key) + len(data), now),
+            )
+        return value
+
+    @staticmethod
+    def _publish(conn: sqlite3.Connection, channel: str, message: str):
+        """Append a message."""
+        conn.execute(
+            "INSERT INTO messages (channel, data, created_at) VALUES (?, ?, ?)",
+            (channel, message, time.time()),
+        )
+
+    @staticmethod
+    def _poll(conn: sqlite3.Connection, channel: str, after: Optional[int]) -> Tuple[int, List[str]]:
+        """Messages of a channel newer than an id (none on the first call)."""
+        if after is None:
+            return conn.execute("SELECT coalesce(max(id), 0) FROM messages").fetchone()[0], []
+        rows = conn.execute(
+            "SELECT id, data FROM messages WHERE id > ? AND channel = ? ORDER BY id",
+            (after, channel),
+        ).fetchall()
+        last = conn.execute("SELECT coalesce(max(id), ?) FROM messages", (after,)).fetchone()[0]
+        return max(last, after), [data for _, data in rows]
+
+    async def get_many(
+        self,
+        keys: Sequence[str],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[Tuple[Optional[bytes], int]]:
+        """Read entries and count the lookups in one transaction."""
+        counters = []
+        if policy is not None:
+            counters = [c for c in map(policy.lookup_counters, keys) if c is not None]
+        return await self._run(self._read, list(keys), counters, policy.window if policy is not None else 0)
+
+    async def set_many(
+        self,
+        writes: Sequence[Write],
+        policy: Optional[AdmissionPolicy] = None,
+    ) -> List[bool]:
+        """Write entries in one transaction."""
+        if not writes:
+            return []
+        return await self._run(self._write, list(writes), policy)
+
+    async def add_many(self, items: Sequence[Tuple[str, bytes, int]]) -> List[bool]:
+        """Insert missing keys in one transaction."""
+        return await self._run(self._add, list(items))
+
+    async def delete_if_equal(self, items: Sequence[Tuple[str, bytes]]):
+        """Compare-and-delete in one transaction."""
+        await self._run(self._delete_if_equal, list(items))
+
+    async def delete(self, keys: Sequence[str]) -> int:
+        """Delete keys in one transaction."""
+        return await self._run(self._delete, list(keys))
+
+    async def delete_matching(self, pattern: str) -> int:
+        """Delete keys matching a glob pattern."""
+        return await self._run(self._delete_matching, pattern)
+
+    async def incr(self, key: str) -> int:
+        """Increment a counter."""
+        return await self._run(self._incr, key)
+
+    def incr_sync(self, key: str) -> int:
+        """Increment a counter, blocking."""
+        return self._run_sync(self._incr, key)
+
+    async def publish(self, channel: str, message: str):
+        """Append a message for subscribers to poll."""
+        await self._run(self._publish, channel, message)
+
+    def publish_sync(self, channel: str, message: str):
+        """Append a message, blocking."""
+        self._run_sync(self._publish, channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """Poll for messages published after the subscription started."""
+        last = None
+        while True:
+            last, messages = await self._run(self._poll, channel, last)
+            for message in messages:
+                yield message
+            await asyncio.sleep(self.poll_interval)
+
+    def get_stats(self) -> Dict:
+        """Get database settings and evictions made by this process."""
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
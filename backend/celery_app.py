@@ -52,6 +52,7 @@ celery_app.conf.update(
         "tasks.analysis_tasks.analyze_text_async": {"queue": "analysis"},
         "tasks.analysis_tasks.batch_analyze_async": {"queue": "batch"},
         "tasks.analysis_tasks.scrape_and_analyze_async": {"queue": "scraping"},
+        "tasks.analysis_tasks.explain_perturbation_async": {"queue": "analysis"},
     },
     
     # Task priority
@@ -77,6 +78,9 @@ celery_app.conf.task_annotations = {
     "tasks.analysis_tasks.scrape_and_analyze_async": {
         "rate_limit": "50/m",  # 50 scraping tasks per minute
     },
+    "tasks.analysis_tasks.explain_perturbation_async": {
+        "rate_limit": "30/m",  # 30 explanations per minute
+    },
 }
 
 logger.info("Celery app configured successfully")
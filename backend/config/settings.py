@@ -7,7 +7,7 @@ environment variable support and validation.
 
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import os
 
 
@@ -30,6 +30,31 @@ class Settings(BaseSettings):
     
     # Redis
     redis_url: str = Field(default="redis://localhost:6379", description="Redis connection URL")
+    redis_shard_urls: List[str] = Field(default=[], description="Redis nodes the cache and rate limiter spread keys over by consistent hashing (JSON list); empty uses redis_url. Celery keeps using redis_url")
+    redis_shard_vnodes: int = Field(default=160, description="Virtual points per Redis node on the consistent-hash ring")
+    redis_shard_retry_interval: float = Field(default=10.0, description="Seconds an unavailable Redis node is skipped, its keys going to the next node on the ring (0 disables skipping)")
+    
+    # Cache
+    cache_backend: str = Field(default="redis", description="Cache storage backend: redis, or sqlite for a local file (single node, no Redis)")
+    cache_disk_path: str = Field(default="cache_data/cache.sqlite3", description="Database file of the sqlite cache backend, shared by all worker processes")
+    cache_disk_max_bytes: int = Field(default=256 * 1024 * 1024, description="Size bound of the sqlite cache (bytes of keys and values; least recently read entries are evicted)")
+    cache_l1_enabled: bool = Field(default=True, description="Serve hot cache keys from an in-process L1 tier in front of Redis")
+    cache_l1_max_bytes: int = Field(default=32 * 1024 * 1024, description="Size bound of the in-process L1 cache (bytes)")
+    cache_l1_ttl: int = Field(default=60, description="Maximum lifetime of an L1 cache entry (seconds, never longer than the Redis TTL)")
+    cache_invalidation_channel: str = Field(default="cache:invalidate", description="Redis pub/sub channel broadcasting L1 cache invalidations")
+    cache_lease_ttl: float = Field(default=15.0, description="Single-flight lease lifetime; other processes wait at most this long for the holder's result (seconds)")
+    cache_lease_poll: float = Field(default=0.05, description="Initial interval between checks for a lease holder's result (seconds)")
+    cache_stale_ttl: int = Field(default=300, description="How long past its TTL a cached value is still served (stale) while it is refreshed in the background (seconds, 0 disables)")
+    cache_compression: Optional[str] = Field(default="zlib", description="Compression of cached values above the threshold (zlib, zstd, lz4; empty disables)")
+    cache_compression_threshold: int = Field(default=1024, description="Cached values smaller than this are stored uncompressed (bytes)")
+    analysis_cache_codec: str = Field(default="json", description="Serializer of cached analysis results (json, msgpack, pickle)")
+    cache_ttl_jitter: float = Field(default=0.1, description="Maximum fraction by which cache TTLs are randomly shortened so entries don't expire together")
+    cache_rules: List[Dict[str, Any]] = Field(
+        default=[{"prefix": "analysis:", "max_bytes": 65536, "negative_ttl": 300, "min_frequency": 2}],
+        description="Cache admission rules by key prefix (prefix, max_bytes, ttl, size_ttls, negative_ttl, min_frequency); empty admits everything",
+    )
+    cache_sketch_width: int = Field(default=1 << 18, description="Counters per row of the admission frequency sketch (4 bits each)")
+    cache_sketch_window: int = Field(default=3600, description="Time window of the admission frequency sketch; lookups older than two windows are forgotten (seconds)")
     
     # Security
     jwt_secret: str = Field(default="change-me", description="JWT secret key")
@@ -66,9 +91,56 @@ class Settings(BaseSettings):
     news_api_key: Optional[str] = Field(default=None, description="News API key")
     
     # ML Model
-    model_path: str = Field(default="model_final.pkl", description="ML model file path")
+    model_path: str = Field(default="model_final.pkl", description="ML model file path or memory-mapped artifact directory")
     tfidf_path: str = Field(default="tfidf_final.pkl", description="TF-IDF vectorizer file path")
     
+    # Model lifecycle
+    warmup_enabled: bool = Field(default=True, description="Run a warmup corpus through the pipeline before reporting ready")
+    warmup_corpus_path: Optional[str] = Field(default=None, description="Warmup corpus file (one text per line); defaults to a built-in corpus")
+    
+    # Inference batching
+    inference_batching_enabled: bool = Field(default=True, description="Coalesce concurrent analyses into batched model calls")
+    inference_batch_window_ms: float = Field(default=5.0, description="Maximum wait for more texts before scoring a batch (milliseconds)")
+    inference_max_batch_size: int = Field(default=32, description="Maximum texts scored per batched model call")
+    
+    # Long documents
+    long_document_chars: int = Field(default=4000, description="Texts longer than this are scored in paragraph chunks")
+    chunk_chars: int = Field(default=2000, description="Maximum characters per scored chunk")
+    max_chunks_per_document: int = Field(default=16, description="Maximum chunks analyzed per document; text beyond them is ignored")
+    
+    # Perturbation explanations
+    perturbation_samples: int = Field(default=500, description="Default masked variants scored per perturbation explanation")
+    perturbation_max_samples: int = Field(default=5000, description="Maximum sample budget a request may ask for")
+    perturbation_max_features: int = Field(default=40, description="Maximum words masked by the perturbation explainer")
+    perturbation_seed: int = Field(default=0, description="Default random seed for perturbation sampling")
+    perturbation_async_chars: int = Field(default=2000, description="Perturbation explanations of texts longer than this run on the Celery analysis queue")
+    
+    # Near-duplicate cache
+    near_duplicate_enabled: bool = Field(default=True, description="Reuse cached analyses of near-duplicate texts (MinHash/LSH index)")
+    near_duplicate_threshold: float = Field(default=0.8, description="Minimum estimated Jaccard similarity of word 3-gram shingles for a near-duplicate")
+    near_duplicate_max_entries: int = Field(default=10000, description="Maximum fingerprints kept in the in-process index")
+    near_duplicate_min_chars: int = Field(default=200, description="Texts shorter than this are only looked up exactly")
+    
+    # Analysis cascade
+    cascade_enabled: bool = Field(default=True, description="Skip the fact check, source search and full explanation for confident verdicts")
+    cascade_uncertain_low: float = Field(default=0.2, description="Lower bound of the uncertainty band (fake-news probability)")
+    cascade_uncertain_high: float = Field(default=0.8, description="Upper bound of the uncertainty band (fake-news probability)")
+    
+    # Inference executor (process pool)
+    inference_executor_enabled: bool = Field(default=True, description="Run the analysis pipeline in a process pool instead of on the event loop")
+    inference_executor_workers: int = Field(default=2, description="Number of inference worker processes")
+    inference_executor_max_pending: int = Field(default=64, description="Maximum analyses in flight before returning 503")
+    inference_executor_retry_after: int = Field(default=2, description="Retry-After header value when the inference queue is full (seconds)")
+    
+    # Cold start
+    lazy_imports: bool = Field(default=True, description="Defer heavy modules (nltk, sklearn, scipy, bs4, ...) until first use instead of importing them at startup")
+    nltk_data_dir: str = Field(default="nltk_data", description="Pre-baked NLTK data directory (see scripts/prebake_nltk_data.py)")
+    import_budget_ms: float = Field(default=1500.0, description="Maximum time to import the application (checked by scripts/import_budget.py)")
+    first_request_budget_ms: float = Field(default=5000.0, description="Maximum time from process start to the first served request (checked by scripts/import_budget.py)")
+    
+    # Red-flag detection
+    red_flag_lexicon_path: Optional[str] = Field(default=None, description="Extra clickbait phrases file (one phrase per line, # comments)")
+    
     # Celery
     celery_broker_url: Optional[str] = Field(default=None, description="Celery broker URL (defaults to redis_url)")
     celery_result_backend: Optional[str] = Field(default=None, description="Celery result backend (defaults to redis_url)")
@@ -111,6 +183,13 @@ class Settings(BaseSettings):
             raise ValueError(f"Log level must be one of: {', '.join(allowed)}")
         return v_upper
     
+    @property
+    def cascade_band(self) -> Optional[Tuple[float, float]]:
+        """Get the cascade uncertainty band (None when the cascade is off)."""
+        if not self.cascade_enabled:
+            return None
+        return (self.cascade_uncertain_low, self.cascade_uncertain_high)
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
@@ -126,8 +126,18 @@ def get_analysis_service_dependency() -> AnalysisService:
     
     Returns:
         AnalysisService instance
-    """
-    return get_analysis_service()
+        
+    Raises:
+        HTTPException: 503 while the model is still loading
+    """
+    service = get_analysis_service(load_on_init=False)
+    if not service.is_loaded():
+        raise HTTPException(
+            status_code=503,
+            detail="Model is loading, try again shortly",
+            headers={"Retry-After": "5"},
+        )
+    return service
 
 
 # Request context dependencies
@@ -1,6 +1,7 @@
 import os
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from config.settings import get_settings
 from auth import router as auth_router
@@ -12,7 +13,7 @@ from middleware.rate_limiter import RateLimitMiddleware, RateLimitConfig
 from middleware.request_size_limit import RequestSizeLimitMiddleware
 # from middleware.csrf_protection import CSRFProtectionMiddleware  # DISABLED in development
 from middleware.error_handler import ErrorHandlerMiddleware
-from services.analysis_service import get_analysis_service
+from services.model_lifecycle import get_model_lifecycle
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,20 +32,12 @@ async def startup_event():
     """
     Application startup event.
     
-    Loads ML models asynchronously in background to avoid blocking startup.
+    Starts loading and warming the ML model in the background; ``/ready``
+    reports 503 until it has finished.
     """
     logger.info("Starting VeriGlow application...")
     
-    # Load ML models asynchronously
-    try:
-        analysis_service = get_analysis_service()
-        await analysis_service.load_models_async(
-            settings.model_path,
-            settings.tfidf_path
-        )
-        logger.info("ML models loaded successfully")
-    except Exception as e:
-        logger.error(f"Failed to load ML models: {e}")
+    await get_model_lifecycle().start()
     
     logger.info("Application startup complete")
 
@@ -54,6 +47,11 @@ async def shutdown_event():
     """Application shutdown event."""
     logger.info("Shutting down VeriGlow application...")
     
+    try:
+        await get_model_lifecycle().stop()
+    except Exception as e:
+        logger.warning(f"Error stopping model lifecycle: {e}")
+    
     # Disconnect cache if needed
     from cache import get_cache_manager
     try:
@@ -72,7 +70,7 @@ app.add_middleware(ErrorHandlerMiddleware, debug=settings.debug)
 app.add_middleware(
     RequestSizeLimitMiddleware,
     max_size=settings.max_request_size_bytes,
-    exempt_paths=["/health", "/docs", "/openapi.json", "/redoc"],
+    exempt_paths=["/health", "/ready", "/docs", "/openapi.json", "/redoc"],
 )
 
 # CSRF protection middleware - DISABLED in development
@@ -98,19 +96,35 @@ app.add_middleware(
 app.add_middleware(
     RateLimitMiddleware,
     redis_url=settings.redis_url,
+    redis_urls=settings.redis_shard_urls or None,
+    shard_vnodes=settings.redis_shard_vnodes,
+    shard_retry_interval=settings.redis_shard_retry_interval or None,
     default_config=RateLimitConfig(requests_per_minute=settings.rate_limit_default),
     endpoint_configs={
         "/api/v1/analyze": RateLimitConfig(requests_per_minute=settings.rate_limit_analyze),
         "/api/v1/chat": RateLimitConfig(requests_per_minute=settings.rate_limit_chat),
         "/api/v1/auth/login": RateLimitConfig(requests_per_minute=settings.rate_limit_login),
     },
-    exempt_paths=["/health", "/docs", "/openapi.json", "/redoc"],
+    exempt_paths=["/health", "/ready", "/metrics", "/docs", "/openapi.json", "/redoc"],
 )
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until the model is loaded and warmed up."""
+    lifecycle = get_model_lifecycle()
+    return JSONResponse(
+        status_code=200 if lifecycle.is_ready else 503,
+        content=lifecycle.status(),
+    )
+
+if settings.enable_metrics:
+    from monitoring.metrics import metrics_endpoint
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
 # Debug: Print router info
 print(f"Auth router: {auth_router}")
 print(f"Auth router prefix: {auth_router.prefix}")
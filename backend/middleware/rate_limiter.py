@@ -8,12 +8,14 @@ to prevent abuse and ensure fair resource usage.
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Optional, Dict, Callable
+from typing import Any, Awaitable, Optional, Dict, Callable, List
 import time
 import redis.asyncio as redis
 from datetime import datetime, timedelta
 import logging
 
+from cache.sharding import HashRing
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,31 +43,77 @@ class RateLimitConfig:
 
 
 class RateLimitStore:
-    """Redis-backed storage for rate limit counters."""
+    """
+    Redis-backed storage for rate limit counters.
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    With several ``redis_urls`` the counters are spread over the nodes by
+    consistent hashing (``cache.sharding.HashRing``); each counter lives
+    on one node. With ``retry_interval`` set, a node that fails is
+    skipped for that long and its counters start over on the next node
+    of the ring.
+    """
+    
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        redis_urls: Optional[List[str]] = None,
+        vnodes: int = 160,
+        retry_interval: Optional[float] = None,
+    ):
         """
         Initialize rate limit store.
         
         Args:
             redis_url: Redis connection URL
+            redis_urls: Redis nodes to shard counters over (replaces
+                ``redis_url``)
+            vnodes: Virtual points per node on the hash ring
+            retry_interval: Seconds an unavailable node is skipped (None
+                disables health-aware routing)
         """
         self.redis_url = redis_url
-        self.redis_client: Optional[redis.Redis] = None
+        self.ring = HashRing(redis_urls or [redis_url], vnodes=vnodes, retry_interval=retry_interval)
+        self.clients: Dict[str, redis.Redis] = {}
     
     async def connect(self):
-        """Establish Redis connection."""
-        if self.redis_client is None:
-            self.redis_client = await redis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=True
-            )
+        """Establish Redis connections."""
+        for url in self.ring.nodes:
+            if url not in self.clients:
+                self.clients[url] = await redis.from_url(
+                    url,
+                    encoding="utf-8",
+                    decode_responses=True
+                )
     
     async def close(self):
-        """Close Redis connection."""
-        if self.redis_client:
-            await self.redis_client.close()
+        """Close Redis connections."""
+        for client in self.clients.values():
+            await client.close()
+        self.clients.clear()
+    
+    async def execute(self, key: str, operation: Callable[[redis.Redis], Awaitable[Any]]) -> Any:
+        """
+        Run an operation on the client of the node holding a key.
+        
+        Args:
+            key: Rate limit key
+            operation: Coroutine function called with the node's client
+            
+        Returns:
+            Result of the operation
+        """
+        if not self.clients:
+            await self.connect()
+        
+        for attempt in range(2):
+            node = self.ring.node_for(key)
+            try:
+                return await operation(self.clients[node])
+            except Exception:
+                self.ring.mark_down(node)
+                # Retried once on the next node in health-aware mode
+                if self.ring.retry_interval is None or attempt:
+                    raise
     
     async def increment(
         self,
@@ -84,28 +132,28 @@ class RateLimitStore:
         Returns:
             Tuple of (current_count, remaining, is_allowed)
         """
-        if not self.redis_client:
-            await self.connect()
-        
         now = time.time()
         window_start = now - window_seconds
         
-        # Use Redis pipeline for atomic operations
-        pipe = self.redis_client.pipeline()
-        
-        # Remove old entries outside the window
-        pipe.zremrangebyscore(key, 0, window_start)
-        
-        # Count requests in current window
-        pipe.zcard(key)
-        
-        # Add current request
-        pipe.zadd(key, {str(now): now})
-        
-        # Set expiration
-        pipe.expire(key, window_seconds)
+        async def update(client: redis.Redis):
+            # Use Redis pipeline for atomic operations
+            pipe = client.pipeline()
+            
+            # Remove old entries outside the window
+            pipe.zremrangebyscore(key, 0, window_start)
+            
+            # Count requests in current window
+            pipe.zcard(key)
+            
+            # Add current request
+            pipe.zadd(key, {str(now): now})
+            
+            # Set expiration
+            pipe.expire(key, window_seconds)
+            
+            return await pipe.execute()
         
-        results = await pipe.execute()
+        results = await self.execute(key, update)
         current_count = results[1] + 1  # Count before adding + 1
         
         is_allowed = current_count <= max_requests
@@ -124,10 +172,7 @@ class RateLimitStore:
         Returns:
             Seconds until reset
         """
-        if not self.redis_client:
-            await self.connect()
-        
-        ttl = await self.redis_client.ttl(key)
+        ttl = await self.execute(key, lambda client: client.ttl(key))
         return max(0, ttl) if ttl > 0 else window_seconds
 
 
@@ -142,6 +187,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         endpoint_configs: Optional[Dict[str, RateLimitConfig]] = None,
         key_func: Optional[Callable] = None,
         exempt_paths: Optional[list[str]] = None,
+        redis_urls: Optional[List[str]] = None,
+        shard_vnodes: int = 160,
+        shard_retry_interval: Optional[float] = None,
     ):
         """
         Initialize rate limit middleware.
@@ -153,9 +201,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             endpoint_configs: Per-endpoint rate limit configurations
             key_func: Custom function to extract rate limit key from request
             exempt_paths: List of paths exempt from rate limiting
+            redis_urls: Redis nodes to shard counters over (replaces
+                ``redis_url``)
+            shard_vnodes: Virtual points per node on the hash ring
+            shard_retry_interval: Seconds an unavailable node is skipped
+                (None disables health-aware routing)
         """
         super().__init__(app)
-        self.store = RateLimitStore(redis_url)
+        self.store = RateLimitStore(
+            redis_url,
+            redis_urls=redis_urls,
+            vnodes=shard_vnodes,
+            retry_interval=shard_retry_interval,
+        )
         self.default_config = default_config or RateLimitConfig()
         self.endpoint_configs = endpoint_configs or {}
         self.key_func = key_func or self._default_key_func
@@ -300,14 +358,11 @@ async def get_rate_limit_status(
     """
     redis_key = f"{config.key_prefix}:{key}"
     
-    if not store.redis_client:
-        await store.connect()
-    
     now = time.time()
     window_start = now - config.window_seconds
     
     # Count requests in current window
-    count = await store.redis_client.zcount(redis_key, window_start, now)
+    count = await store.execute(redis_key, lambda client: client.zcount(redis_key, window_start, now))
     remaining = max(0, config.requests_per_minute - count)
     reset_time = await store.get_reset_time(redis_key, config.window_seconds)
     
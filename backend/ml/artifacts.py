@@ -0,0 +1,478 @@
+"""
+Memory-mapped model artifact format.
+
+Unpickling ``model_final.pkl``/``tfidf_final.pkl`` gives every process its
+own private copy of the vocabulary dict, ``idf_`` and ``coef_``. An
+artifact directory stores the same data as flat files that are opened
+with ``mmap``, so the OS page cache holds a single copy shared by every
+uvicorn worker, Celery worker and inference process, and loading takes
+milliseconds instead of a full unpickle.
+
+Layout of an artifact directory::
+
+    manifest.json      format version, analyzer parameters, classes, intercept
+    table.npy          float64 (n_terms, 2): idf, idf * coef (fast scorer table)
+    coef.npy           float64 (1, n_terms): model coefficients
+    vocab_terms.bin    UTF-8 terms concatenated in feature-index order
+    vocab_offsets.npy  int64 (n_terms + 1): byte offsets into vocab_terms.bin
+    vocab_slots.npy    int32 open-addressing hash table (term row or -1)
+    vocab_hashes.npy   uint32 crc32 of the term stored in each slot
+
+Only binary logistic regression over a word/char ``TfidfVectorizer``
+without custom callables is supported; ``export_artifact`` refuses
+anything else and verifies the exported artifact against the original
+``predict_proba`` before returning.
+"""
+
+import json
+import mmap
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Union
+import logging
+
+import numpy as np
+from scipy import sparse
+from scipy.special import expit
+
+from .fast_scorer import PARITY_PROBES, CompiledLinearScorer
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "mmap"
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# TfidfVectorizer parameters needed to rebuild the analyzer
+ANALYZER_PARAMS = (
+    "input",
+    "encoding",
+    "decode_error",
+    "strip_accents",
+    "lowercase",
+    "token_pattern",
+    "stop_words",
+    "ngram_range",
+    "analyzer",
+)
+
+
+def is_artifact_dir(path: Union[str, Path]) -> bool:
+    """Check whether a path is a memory-mapped artifact directory."""
+    path = Path(path)
+    return path.is_dir() and (path / MANIFEST_FILE).exists()
+
+
+def _load_mapped(path: Path) -> np.ndarray:
+    """
+    Memory-map a ``.npy`` file read-only.
+
+    Returns a plain ndarray view over the mapping; ``np.memmap`` indexing
+    adds noticeable per-call overhead on the scoring path.
+    """
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+class MmapVocabulary(Mapping):
+    """
+    Read-only term -> feature index mapping backed by memory-mapped files.
+
+    Behaves like the vectorizer's ``vocabulary_`` dict; ``lookup_many``
+    resolves a whole document's terms with vectorized hash probing.
+    """
+
+    def __init__(self, artifact_dir: Path):
+        """
+        Open the vocabulary files of an artifact.
+
+        Args:
+            artifact_dir: Artifact directory
+        """
+        self._offsets = _load_mapped(artifact_dir / "vocab_offsets.npy")
+        self._slots = _load_mapped(artifact_dir / "vocab_slots.npy")
+        self._hashes = _load_mapped(artifact_dir / "vocab_hashes.npy")
+        self._mask = len(self._slots) - 1
+
+        terms_path = artifact_dir / "vocab_terms.bin"
+        if terms_path.stat().st_size:
+            with open(terms_path, "rb") as f:
+                self._terms = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._terms = b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.terms())
+
+    def __getitem__(self, term: str) -> int:
+        row = self.get(term)
+        if row is None:
+            raise KeyError(term)
+        return row
+
+    def _term_bytes(self, row: int) -> bytes:
+        """Return the encoded term stored at a feature index."""
+        return self._terms[int(self._offsets[row]):int(self._offsets[row + 1])]
+
+    def _probe(self, encoded: bytes, term_hash: int, slot: int) -> int:
+        """Linear-probe from a slot; return the term's row or -1."""
+        while True:
+            row = int(self._slots[slot])
+            if row < 0:
+                return -1
+            if int(self._hashes[slot]) == term_hash and self._term_bytes(row) == encoded:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def get(self, term: str, default=None):
+        """Look up a single term."""
+        encoded = term.encode("utf-8")
+        term_hash = zlib.crc32(encoded)
+        row = self._probe(encoded, term_hash, term_hash & self._mask)
+        return default if row < 0 else row
+
+    def lookup_many(self, terms: Sequence[str]) -> np.ndarray:
+        """
+        Look up many terms at once.
+
+        Args:
+            terms: Terms to resolve
+
+        Returns:
+            Array of feature indices, -1 for out-of-vocabulary terms
+        """
+        encoded = [term.encode("utf-8") for term in terms]
+        rows = np.full(len(encoded), -1, dtype=np.intp)
+        if not encoded:
+            return rows
+
+        hashes = np.fromiter((zlib.crc32(b) for b in encoded), dtype=np.uint32, count=len(encoded))
+        slots = (hashes & self._mask).astype(np.intp)
+
+        # First probe for all terms at once; with a half-empty table most
+        # terms are resolved (found or missing) here.
+        candidates = self._slots[slots]
+        hits = np.flatnonzero((candidates >= 0) & (self._hashes[slots] == hashes))
+        hit_rows = candidates[hits]
+        for i, start, end, row in zip(
+            hits.tolist(),
+            self._offsets[hit_rows].tolist(),
+            self._offsets[hit_rows + 1].tolist(),
+            hit_rows.tolist(),
+        ):
+            if self._terms[start:end] == encoded[i]:
+                rows[i] = row
+
+        # Terms whose first slot is taken by another term keep probing
+        for i in np.flatnonzero((rows < 0) & (candidates >= 0)).tolist():
+            rows[i] = self._probe(encoded[i], int(hashes[i]), (int(slots[i]) + 1) & self._mask)
+
+        return rows
+
+    def terms(self) -> List[str]:
+        """Decode all terms in feature-index order."""
+        data = bytes(self._terms)
+        offsets = self._offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(self))]
+
+
+class ArtifactVectorizer:
+    """TF-IDF vectorizer backed by a memory-mapped artifact."""
+
+    def __init__(self, manifest: Dict, vocabulary: MmapVocabulary, idf: np.ndarray):
+        """
+        Initialize vectorizer.
+
+        Args:
+            manifest: Artifact manifest
+            vocabulary: Memory-mapped vocabulary
+            idf: Memory-mapped idf weights
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = dict(manifest["analyzer"])
+        params["ngram_range"] = tuple(params["ngram_range"])
+        if isinstance(params.get("stop_words"), list):
+            params["stop_words"] = frozenset(params["stop_words"])
+
+        # Only used to build the analyzer; it is never fitted
+        self._analyzer = TfidfVectorizer(**params).build_analyzer()
+
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+        self.norm = manifest["norm"]
+        self.use_idf = manifest["use_idf"]
+        self.sublinear_tf = manifest["sublinear_tf"]
+        self.binary = False
+        self._feature_names: Optional[np.ndarray] = None
+
+    def build_analyzer(self):
+        """Return the callable that turns a text into its terms."""
+        return self._analyzer
+
+    def get_feature_names_out(self) -> np.ndarray:
+        """Return feature names in feature-index order (decoded once)."""
+        if self._feature_names is None:
+            self._feature_names = np.asarray(self.vocabulary_.terms(), dtype=object)
+        return self._feature_names
+
+    def transform(self, raw_documents: Sequence[str]) -> sparse.csr_matrix:
+        """
+        Transform documents to an L2-normalised TF-IDF matrix.
+
+        Args:
+            raw_documents: Raw texts
+
+        Returns:
+            CSR matrix of shape (n_documents, n_terms)
+        """
+        indptr = [0]
+        indices: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+
+        for document in raw_documents:
+            counts = Counter(self._analyzer(document))
+            rows = self.vocabulary_.lookup_many(list(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+
+            found = rows >= 0
+            rows = rows[found]
+            tf = tf[found]
+            order = np.argsort(rows)
+            rows = rows[order]
+            tf = tf[order]
+
+            if self.sublinear_tf and len(tf):
+                tf = np.log(tf) + 1.0
+            if self.use_idf:
+                tf = tf * self.idf_[rows]
+            if self.norm == "l2" and len(tf):
+                norm = np.sqrt(np.dot(tf, tf))
+                if norm > 0:
+                    tf = tf / norm
+
+            indices.append(rows)
+            values.append(tf)
+            indptr.append(indptr[-1] + len(rows))
+
+        return sparse.csr_matrix(
+            (
+                np.concatenate(values) if values else np.empty(0),
+                np.concatenate(indices) if indices else np.empty(0, dtype=np.intp),
+                np.asarray(indptr),
+            ),
+            shape=(len(indptr) - 1, len(self.vocabulary_)),
+        )
+
+
+class ArtifactModel:
+    """Binary logistic regression backed by a memory-mapped artifact."""
+
+    def __init__(self, manifest: Dict, coef: np.ndarray):
+        """
+        Initialize model.
+
+        Args:
+            manifest: Artifact manifest
+            coef: Memory-mapped coefficients of shape (1, n_terms)
+        """
+        self.coef_ = coef
+        self.intercept_ = np.asarray([manifest["intercept"]], dtype=np.float64)
+        self.classes_ = np.asarray(manifest["classes"])
+
+    def decision_function(self, X) -> np.ndarray:
+        """Compute the linear decision value for each row."""
+        return np.asarray(X @ self.coef_[0]).ravel() + self.intercept_[0]
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Compute class probabilities, ordered like ``classes_``."""
+        positive = expit(self.decision_function(X))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        """Predict class labels."""
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+class ModelArtifact:
+    """A loaded memory-mapped artifact: model, vectorizer and fast scorer."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open an artifact directory.
+
+        Args:
+            path: Artifact directory
+
+        Raises:
+            ValueError: If the directory is not a supported artifact
+        """
+        self.path = Path(path)
+
+        with open(self.path / MANIFEST_FILE, "r") as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Not a {ARTIFACT_FORMAT} model artifact: {self.path}")
+        if self.manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported artifact format version {self.manifest.get('format_version')}"
+            )
+
+        self.table = _load_mapped(self.path / "table.npy")
+        coef = _load_mapped(self.path / "coef.npy")
+        vocabulary = MmapVocabulary(self.path)
+
+        self.tfidf = ArtifactVectorizer(self.manifest, vocabulary, self.table[:, 0])
+        self.model = ArtifactModel(self.manifest, coef)
+
+    def build_scorer(self) -> CompiledLinearScorer:
+        """Build a fast scorer that reads weights straight from the mapped table."""
+        return CompiledLinearScorer(
+            analyzer=self.tfidf.build_analyzer(),
+            vocabulary=self.tfidf.vocabulary_,
+            table=self.table,
+            intercept=self.manifest["intercept"],
+            classes=self.manifest["classes"],
+            sublinear_tf=self.tfidf.sublinear_tf,
+            normalize=self.tfidf.norm == "l2",
+        )
+
+
+def load_artifact(path: Union[str, Path]) -> ModelArtifact:
+    """
+    Load a memory-mapped model artifact.
+
+    Args:
+        path: Artifact directory
+
+    Returns:
+        ModelArtifact instance
+    """
+    artifact = ModelArtifact(path)
+    logger.info(f"Mapped model artifact {path} ({len(artifact.tfidf.vocabulary_)} terms)")
+    return artifact
+
+
+def _build_hash_table(encoded_terms: List[bytes]):
+    """Build the open-addressing slot table for the vocabulary."""
+    size = 1
+    while size < 2 * max(len(encoded_terms), 1):
+        size *= 2
+    mask = size - 1
+
+    slots = np.full(size, -1, dtype=np.int32)
+    hashes = np.zeros(size, dtype=np.uint32)
+
+    for row, term in enumerate(encoded_terms):
+        term_hash = zlib.crc32(term)
+        slot = term_hash & mask
+        while slots[slot] >= 0:
+            slot = (slot + 1) & mask
+        slots[slot] = row
+        hashes[slot] = term_hash
+
+    return slots, hashes
+
+
+def export_artifact(
+    model,
+    vectorizer,
+    output_dir: Union[str, Path],
+    probes: Optional[Sequence[str]] = None,
+) -> Path:
+    """
+    Export a fitted model and vectorizer as a memory-mapped artifact.
+
+    Args:
+        model: Fitted binary ``LogisticRegression``
+        vectorizer: Fitted ``TfidfVectorizer``
+        output_dir: Directory to write (created if missing)
+        probes: Extra texts for the parity check
+
+    Returns:
+        Path to the artifact directory
+
+    Raises:
+        ValueError: If the model/vectorizer is unsupported or the exported
+            artifact does not reproduce ``predict_proba``
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    if not isinstance(model, LogisticRegression) or np.asarray(model.coef_).shape[0] != 1:
+        raise ValueError("Only binary LogisticRegression models can be exported")
+
+    if vectorizer.analyzer not in ("word", "char", "char_wb"):
+        raise ValueError("Vectorizers with a custom analyzer cannot be exported")
+    if vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+        raise ValueError("Vectorizers with a custom preprocessor or tokenizer cannot be exported")
+    if vectorizer.binary or vectorizer.norm not in ("l2", None):
+        raise ValueError("Only non-binary, l2 or unnormalised TF-IDF vectorizers can be exported")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    n_terms = len(vectorizer.vocabulary_)
+    terms: List[Optional[str]] = [None] * n_terms
+    for term, row in vectorizer.vocabulary_.items():
+        terms[row] = term
+    encoded = [term.encode("utf-8") for term in terms]
+
+    coef = np.ascontiguousarray(model.coef_, dtype=np.float64)
+    if vectorizer.use_idf:
+        idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+    else:
+        idf = np.ones(n_terms, dtype=np.float64)
+
+    table = np.empty((n_terms, 2), dtype=np.float64)
+    table[:, 0] = idf
+    table[:, 1] = idf * coef[0]
+
+    offsets = np.zeros(n_terms + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    slots, hashes = _build_hash_table(encoded)
+
+    np.save(output_dir / "table.npy", table)
+    np.save(output_dir / "coef.npy", coef)
+    np.save(output_dir / "vocab_offsets.npy", offsets)
+    np.save(output_dir / "vocab_slots.npy", slots)
+    np.save(output_dir / "vocab_hashes.npy", hashes)
+    with open(output_dir / "vocab_terms.bin", "wb") as f:
+        f.write(b"".join(encoded))
+
+    analyzer = {name: getattr(vectorizer, name) for name in ANALYZER_PARAMS}
+    analyzer["ngram_range"] = list(analyzer["ngram_range"])
+    if analyzer["stop_words"] is not None and not isinstance(analyzer["stop_words"], str):
+        analyzer["stop_words"] = sorted(analyzer["stop_words"])
+
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "n_terms": n_terms,
+        "analyzer": analyzer,
+        "norm": vectorizer.norm,
+        "use_idf": bool(vectorizer.use_idf),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+        "classes": np.asarray(model.classes_).tolist(),
+        "intercept": float(np.ravel(model.intercept_)[0]),
+    }
+    with open(output_dir / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Verify the round trip before anyone deploys it
+    texts = list(PARITY_PROBES) + list(probes or [])
+    expected = model.predict_proba(vectorizer.transform(texts))
+    artifact = load_artifact(output_dir)
+    for name, actual in (
+        ("model", artifact.model.predict_proba(artifact.tfidf.transform(texts))),
+        ("scorer", artifact.build_scorer().predict_proba(texts)),
+    ):
+        max_diff = float(np.max(np.abs(expected - actual)))
+        if max_diff > CompiledLinearScorer.PARITY_TOLERANCE:
+            raise ValueError(f"Exported artifact {name} differs from predict_proba by {max_diff:.2e}")
+
+    logger.info(f"Exported model artifact to {output_dir} ({n_terms} terms)")
+    return output_dir
@@ -0,0 +1,288 @@
+"""
+Model compaction.
+
+The trained vectorizer keeps every term of its vocabulary in float64,
+including terms whose coefficient is so close to zero that they can never
+move a verdict, and carries the ``stop_words_`` set of discarded terms,
+which is only there for introspection. ``compact_model`` drops terms whose
+absolute coefficient is below a threshold, casts the weights to float32
+and strips ``stop_words_``; ``deploy_compact_version`` evaluates the
+result against the original and deploys it as a new model version with
+the accuracy delta, latency and memory measurements in its metadata, so a
+bad compaction can be rolled back with ``ModelManager.rollback``.
+
+Removing terms also removes them from the L2 norm of a document's TF-IDF
+vector, so scores of a compact model are close to, not equal to, those of
+the original; the evaluation reports by how much.
+"""
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default absolute-coefficient threshold below which terms are dropped
+DEFAULT_THRESHOLD = 1e-3
+
+# Loads a model in a fresh interpreter and prints the RSS it added (bytes)
+_RSS_PROBE = """
+import pickle, sys
+import sklearn.linear_model, sklearn.feature_extraction.text
+
+def rss():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+before = rss()
+with open(sys.argv[1], "rb") as f:
+    model = pickle.load(f)
+with open(sys.argv[2], "rb") as f:
+    tfidf = pickle.load(f)
+print(rss() - before)
+"""
+
+
+def compact_model(
+    model,
+    vectorizer,
+    threshold: float = DEFAULT_THRESHOLD,
+    dtype=np.float32,
+) -> Tuple[object, object, Dict]:
+    """
+    Build a pruned, reduced-precision copy of a model and its vectorizer.
+
+    Args:
+        model: Fitted binary linear model (``coef_`` of shape (1, n_terms))
+        vectorizer: Fitted ``TfidfVectorizer``
+        threshold: Terms with ``abs(coef) < threshold`` are dropped
+        dtype: Floating-point type of the compact weights
+
+    Returns:
+        Tuple of (compact model, compact vectorizer, stats dict with the
+        term counts before and after)
+
+    Raises:
+        ValueError: If the model is not a binary linear model
+    """
+    coef = np.asarray(model.coef_)
+    if coef.ndim != 2 or coef.shape[0] != 1:
+        raise ValueError("Only binary linear models can be compacted")
+
+    keep = np.flatnonzero(np.abs(coef[0]) >= threshold)
+
+    # Old column -> new column for the terms that survive
+    new_index = np.full(coef.shape[1], -1, dtype=np.int64)
+    new_index[keep] = np.arange(len(keep))
+    vocabulary = {
+        term: int(new_index[column])
+        for term, column in vectorizer.vocabulary_.items()
+        if new_index[column] >= 0
+    }
+
+    compact_vectorizer = copy.deepcopy(vectorizer)
+    compact_vectorizer.vocabulary_ = vocabulary
+    if getattr(vectorizer, "use_idf", False):
+        compact_vectorizer.idf_ = np.asarray(vectorizer.idf_)[keep].astype(dtype)
+    # The inner TfidfTransformer validates the column count it was fitted on
+    transformer = getattr(compact_vectorizer, "_tfidf", None)
+    if transformer is not None and hasattr(transformer, "n_features_in_"):
+        transformer.n_features_in_ = len(keep)
+    compact_vectorizer.set_params(dtype=dtype)
+    # Only kept for introspection; can be larger than the vocabulary itself
+    if hasattr(compact_vectorizer, "stop_words_"):
+        compact_vectorizer.stop_words_ = None
+
+    compact = copy.deepcopy(model)
+    compact.coef_ = np.ascontiguousarray(coef[:, keep], dtype=dtype)
+    compact.intercept_ = np.asarray(model.intercept_, dtype=dtype)
+    if hasattr(compact, "n_features_in_"):
+        compact.n_features_in_ = len(keep)
+
+    stats = {
+        "threshold": threshold,
+        "dtype": np.dtype(dtype).name,
+        "terms_before": int(coef.shape[1]),
+        "terms_after": int(len(keep)),
+    }
+    logger.info(
+        f"Compacted model: {stats['terms_before']} -> {stats['terms_after']} terms "
+        f"(threshold {threshold}, {stats['dtype']})"
+    )
+    return compact, compact_vectorizer, stats
+
+
+def _latency_ms(model, vectorizer, texts: Sequence[str], repeat: int = 20) -> float:
+    """Median milliseconds to score one text."""
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            model.predict_proba(vectorizer.transform([text]))
+            timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def evaluate_compaction(
+    original: Tuple[object, object],
+    compact: Tuple[object, object],
+    texts: Sequence[str],
+    labels: Optional[Sequence] = None,
+) -> Dict:
+    """
+    Compare a compact model with the original on an evaluation set.
+
+    Args:
+        original: (model, vectorizer) before compaction
+        compact: (model, vectorizer) after compaction
+        texts: Evaluation texts
+        labels: Optional true labels; without them only agreement with the
+            original's predictions is reported
+
+    Returns:
+        Dict with agreement, the largest probability difference, accuracy
+        of both models and their delta (None without labels) and the
+        per-text latency of both models
+    """
+    (model, vectorizer), (compact_model_, compact_vectorizer) = original, compact
+
+    expected = model.predict_proba(vectorizer.transform(texts))
+    actual = compact_model_.predict_proba(compact_vectorizer.transform(texts))
+    predicted = model.classes_[expected.argmax(axis=1)]
+    compact_predicted = compact_model_.classes_[actual.argmax(axis=1)]
+
+    metrics = {
+        "eval_size": len(texts),
+        "agreement": float(np.mean(predicted == compact_predicted)),
+        "max_probability_diff": float(np.max(np.abs(expected - actual))),
+        "accuracy": None,
+        "compact_accuracy": None,
+        "accuracy_delta": None,
+    }
+    if labels is not None:
+        labels = np.asarray(labels)
+        metrics["accuracy"] = float(np.mean(predicted == labels))
+        metrics["compact_accuracy"] = float(np.mean(compact_predicted == labels))
+        metrics["accuracy_delta"] = metrics["compact_accuracy"] - metrics["accuracy"]
+
+    metrics["latency_ms"] = _latency_ms(model, vectorizer, texts)
+    metrics["compact_latency_ms"] = _latency_ms(compact_model_, compact_vectorizer, texts)
+    return metrics
+
+
+def measure_load_rss(model_path: str, tfidf_path: str) -> int:
+    """
+    Measure the resident memory a pickled model adds when loaded.
+
+    Runs in a fresh interpreter so that the measurement is not skewed by
+    what this process has already allocated.
+
+    Args:
+        model_path: Pickled model
+        tfidf_path: Pickled vectorizer
+
+    Returns:
+        Bytes of RSS added by unpickling both files (0 if unavailable)
+    """
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", _RSS_PROBE, str(model_path), str(tfidf_path)],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=120,
+        ).stdout
+        return int(output.strip().splitlines()[-1])
+    except Exception as e:
+        logger.warning(f"RSS measurement failed: {e}")
+        return 0
+
+
+def deploy_compact_version(
+    manager,
+    version: str,
+    base_version: Optional[str] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    texts: Sequence[str] = (),
+    labels: Optional[Sequence] = None,
+    activate: bool = False,
+    format: str = "pickle",
+):
+    """
+    Compact a registered model version and deploy the result as a new one.
+
+    Args:
+        manager: ``ModelManager`` to deploy into
+        version: Version identifier of the compact model
+        base_version: Version to compact (defaults to the active version)
+        threshold: Terms with ``abs(coef) < threshold`` are dropped
+        texts: Evaluation texts (at least one is required)
+        labels: Optional true labels of ``texts``
+        activate: Whether to activate the compact version immediately
+        format: Storage format, "pickle" or "mmap" (mmap artifacts store
+            float64 weights, so only the pruning applies)
+
+    Returns:
+        ModelVersion of the compact model; its metadata holds the
+        compaction stats and evaluation
+
+    Raises:
+        ValueError: If there is no base version or no evaluation text
+    """
+    if not texts:
+        raise ValueError("Compaction needs evaluation texts")
+
+    base = manager.get_version(base_version) if base_version else manager.get_active_version()
+    if base is None:
+        raise ValueError(f"Base version not found: {base_version or 'active'}")
+    if not base.is_loaded():
+        base.load()
+
+    model, vectorizer, stats = compact_model(base.model, base.tfidf, threshold=threshold)
+    metrics = evaluate_compaction((base.model, base.tfidf), (model, vectorizer), texts, labels)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_file = Path(tmp) / "model.pkl"
+        tfidf_file = Path(tmp) / "tfidf.pkl"
+        with open(model_file, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(tfidf_file, "wb") as f:
+            pickle.dump(vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if base.format == "pickle":
+            metrics["rss_bytes"] = measure_load_rss(base.model_path, base.tfidf_path)
+            metrics["file_bytes"] = os.path.getsize(base.model_path) + os.path.getsize(base.tfidf_path)
+        metrics["compact_rss_bytes"] = measure_load_rss(str(model_file), str(tfidf_file))
+        metrics["compact_file_bytes"] = os.path.getsize(model_file) + os.path.getsize(tfidf_file)
+
+        metadata = {
+            **base.metadata,
+            "compacted_from": base.version,
+            "compaction": {**stats, **metrics},
+        }
+        model_version = manager.deploy_new_version(
+            version=version,
+            model_file=str(model_file),
+            tfidf_file=str(tfidf_file),
+            metadata=metadata,
+            activate=activate,
+            format=format,
+        )
+
+    logger.info(
+        f"Deployed compact version {version} from {base.version}: "
+        f"agreement {metrics['agreement']:.4f}, accuracy delta {metrics['accuracy_delta']}"
+    )
+    return model_version
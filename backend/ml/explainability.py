@@ -1,32 +1,162 @@
-"""ML model explainability engine."""
-from typing import Dict, List, Tuple
+"""
+ML model explainability engine.
+
+For a linear model over TF-IDF features the decision value is
+``sum_j(x_j * coef_j) + intercept``, so each term's attribution is simply
+``x_j * coef_j`` and only the terms present in the document (the non-zero
+entries of its sparse row) can have one. Explanations therefore reuse the
+sparse vector the prediction needs and never touch the rest of the
+vocabulary; the feature-name array is built once per model version.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import threading
 import numpy as np
+from scipy.special import expit
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Feature-name arrays keyed by model version
+_feature_names_cache: Dict[str, np.ndarray] = {}
+_feature_names_lock = threading.Lock()
+
+
+def get_feature_names(vectorizer, version: Optional[str] = None) -> np.ndarray:
+    """
+    Get the vectorizer's feature names, cached per model version.
+
+    Args:
+        vectorizer: Fitted vectorizer
+        version: Model version key (None disables the shared cache)
+
+    Returns:
+        Array of feature names indexed by column
+    """
+    if version is None:
+        return np.asarray(vectorizer.get_feature_names_out(), dtype=object)
+
+    names = _feature_names_cache.get(version)
+    if names is None:
+        with _feature_names_lock:
+            names = _feature_names_cache.get(version)
+            if names is None:
+                names = np.asarray(vectorizer.get_feature_names_out(), dtype=object)
+                _feature_names_cache[version] = names
+    return names
+
+
+def clear_feature_names(version: Optional[str] = None):
+    """
+    Drop cached feature names.
+
+    Args:
+        version: Model version to drop (None drops all)
+    """
+    with _feature_names_lock:
+        if version is None:
+            _feature_names_cache.clear()
+        else:
+            _feature_names_cache.pop(version, None)
+
+
 class ExplainabilityEngine:
     """Provides explanations for model predictions."""
     
-    def __init__(self, model, vectorizer):
+    def __init__(self, model, vectorizer, version: Optional[str] = None, scorer=None):
+        """
+        Initialize engine.
+        
+        Args:
+            model: Fitted linear model (needs ``coef_``)
+            vectorizer: Fitted TF-IDF vectorizer
+            version: Model version key used to cache feature names
+            scorer: Optional ``CompiledLinearScorer`` for the same model;
+                when given, texts are explained without building a matrix
+        """
         self.model = model
         self.vectorizer = vectorizer
+        self.version = version
+        self.scorer = scorer
+        
+        coef = getattr(model, "coef_", None)
+        self.coef = np.asarray(coef[0], dtype=np.float64) if coef is not None else None
+        self._feature_names: Optional[np.ndarray] = None
+    
+    @property
+    def feature_names(self) -> np.ndarray:
+        """Feature names indexed by column (built once)."""
+        if self._feature_names is None:
+            self._feature_names = get_feature_names(self.vectorizer, self.version)
+        return self._feature_names
+    
+    def _top_terms(
+        self,
+        indices: np.ndarray,
+        contributions: np.ndarray,
+        top_n: int,
+    ) -> List[Tuple[str, float]]:
+        """Top attributions among the terms present, by absolute value."""
+        nonzero = contributions != 0
+        indices = indices[nonzero]
+        contributions = contributions[nonzero]
+        
+        magnitude = np.abs(contributions)
+        if len(contributions) > top_n:
+            top = np.argpartition(-magnitude, top_n - 1)[:top_n]
+        else:
+            top = np.arange(len(contributions))
+        top = top[np.argsort(-magnitude[top], kind="stable")]
+        
+        names = self.feature_names
+        return [(str(names[indices[i]]), float(contributions[i])) for i in top]
+    
+    def attribute(
+        self,
+        texts: Sequence[str],
+        top_n: int = 10,
+    ) -> Tuple[List[List[Tuple[str, float]]], Optional[np.ndarray]]:
+        """
+        Explain several texts with one vectorizer call.
+        
+        Args:
+            texts: Texts to explain
+            top_n: Attributions returned per text
+        
+        Returns:
+            Tuple of (per-text (term, attribution) lists, predicted class
+            probabilities computed from the same sparse matrix). Positive
+            attributions push towards ``model.classes_[1]``.
+        """
+        if self.coef is None:
+            return [[] for _ in texts], None
+        
+        if self.scorer is not None:
+            # Compiled path: the decision value is the sum of the contributions
+            attributions = []
+            decisions = np.empty(len(texts), dtype=np.float64)
+            for i, text in enumerate(texts):
+                rows, contributions = self.scorer.term_contributions(text)
+                attributions.append(self._top_terms(rows, contributions, top_n))
+                decisions[i] = contributions.sum() + self.scorer.intercept
+            
+            positive = expit(decisions)
+            return attributions, np.column_stack([1.0 - positive, positive])
+        
+        X = self.vectorizer.transform(texts).tocsr()
+        attributions = []
+        for row in range(X.shape[0]):
+            start, end = X.indptr[row], X.indptr[row + 1]
+            indices = X.indices[start:end]
+            attributions.append(
+                self._top_terms(indices, X.data[start:end] * self.coef[indices], top_n)
+            )
+        return attributions, self.model.predict_proba(X)
     
     def get_feature_importance(self, text: str, top_n: int = 10) -> List[Tuple[str, float]]:
         """Get most important features for prediction."""
         try:
-            vec = self.vectorizer.transform([text])
-            feature_names = self.vectorizer.get_feature_names_out()
-            
-            if hasattr(self.model, 'coef_'):
-                coefficients = self.model.coef_[0]
-                feature_scores = vec.toarray()[0] * coefficients
-                
-                top_indices = np.argsort(np.abs(feature_scores))[-top_n:][::-1]
-                return [(feature_names[i], float(feature_scores[i])) 
-                       for i in top_indices if feature_scores[i] != 0]
-            
-            return []
+            attributions, _ = self.attribute([text], top_n=top_n)
+            return attributions[0]
         except Exception as e:
             logger.error(f"Feature importance failed: {e}")
             return []
@@ -43,7 +173,7 @@ class ExplainabilityEngine:
         }
         return explanation
     
-    def _generate_reasoning(self, features: List[Tuple[str, float]], 
+    def _generate_reasoning(self, features: List[Tuple[str, float]],
                            prediction: str, confidence: float) -> str:
         """Generate human-readable reasoning."""
         if not features:
@@ -54,6 +184,11 @@ class ExplainabilityEngine:
                f"Key indicators: {', '.join(top_words)}. "
                f"These words strongly influenced the classification.")
 
-def get_explainability_engine(model, vectorizer) -> ExplainabilityEngine:
+def get_explainability_engine(
+    model,
+    vectorizer,
+    version: Optional[str] = None,
+    scorer=None,
+) -> ExplainabilityEngine:
     """Get explainability engine instance."""
-    return ExplainabilityEngine(model, vectorizer)
+    return ExplainabilityEngine(model, vectorizer, version=version, scorer=scorer)
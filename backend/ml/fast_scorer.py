@@ -0,0 +1,238 @@
+"""
+Compiled fast-path scorer for linear models over TF-IDF features.
+
+For a binary logistic regression over an L2-normalised TF-IDF vector the
+decision value is
+
+    sum_j(tf_j * idf_j * coef_j) / sqrt(sum_j (tf_j * idf_j) ** 2) + intercept
+
+so scoring only needs the idf and idf * coef of the terms present in the
+document. ``CompiledLinearScorer`` merges the vectorizer vocabulary,
+``idf_`` and the model's ``coef_``/``intercept_`` into one per-term weight
+table at load time. Scoring tokenizes each text once and accumulates
+weights directly, skipping sklearn's input validation and CSR matrix
+construction.
+"""
+
+from collections import Counter
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+from scipy.special import expit
+
+logger = logging.getLogger(__name__)
+
+# Texts used to verify a compiled scorer against the original model
+PARITY_PROBES = [
+    "The government announced new economic measures on Monday after weeks of talks.",
+    "SHOCKING: doctors don't want you to know this one secret trick!!!",
+    "Scientists published the results of the clinical trial in a peer-reviewed journal.",
+    "",
+]
+
+
+class CompiledLinearScorer:
+    """
+    Scores texts with a binary linear model without building a sparse matrix.
+
+    The weight table has one row per vocabulary term: column 0 holds the
+    term's idf, column 1 holds idf * coef.
+    """
+
+    # Maximum probability difference tolerated by the compile-time check
+    PARITY_TOLERANCE = 1e-9
+
+    def __init__(
+        self,
+        analyzer: Callable[[str], List[str]],
+        vocabulary: Mapping[str, int],
+        table: np.ndarray,
+        intercept: float,
+        classes: Sequence,
+        sublinear_tf: bool = False,
+        normalize: bool = True,
+    ):
+        """
+        Initialize compiled scorer.
+
+        Args:
+            analyzer: Callable turning a text into its list of terms
+            vocabulary: Mapping of term to row in ``table``
+            table: Array of shape (n_terms, 2) with idf and idf * coef
+            intercept: Model intercept
+            classes: Model classes (probabilities are returned in this order)
+            sublinear_tf: Whether term frequencies are replaced by 1 + log(tf)
+            normalize: Whether the TF-IDF vector is L2-normalised
+        """
+        self.analyzer = analyzer
+        self.vocabulary = vocabulary
+        self.table = table
+        self.intercept = float(intercept)
+        self.classes_ = np.asarray(classes)
+        self.sublinear_tf = sublinear_tf
+        self.normalize = normalize
+
+    @classmethod
+    def compile(cls, model, vectorizer) -> Optional["CompiledLinearScorer"]:
+        """
+        Build a compiled scorer from a fitted model and TF-IDF vectorizer.
+
+        Args:
+            model: Fitted binary logistic regression (needs ``coef_``/``intercept_``)
+            vectorizer: Fitted ``TfidfVectorizer``
+
+        Returns:
+            CompiledLinearScorer, or None if the model/vectorizer combination
+            is not supported or does not reproduce ``predict_proba``
+        """
+        try:
+            from sklearn.linear_model import LogisticRegression
+
+            if not isinstance(model, LogisticRegression):
+                return None
+
+            coef = np.asarray(model.coef_, dtype=np.float64)
+            if coef.ndim != 2 or coef.shape[0] != 1 or len(model.classes_) != 2:
+                return None
+
+            if getattr(vectorizer, "binary", False) or getattr(vectorizer, "norm", None) not in ("l2", None):
+                return None
+
+            vocabulary = vectorizer.vocabulary_
+            if coef.shape[1] != len(vocabulary):
+                return None
+
+            if getattr(vectorizer, "use_idf", True):
+                idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+            else:
+                idf = np.ones(len(vocabulary), dtype=np.float64)
+
+            table = np.empty((len(vocabulary), 2), dtype=np.float64)
+            table[:, 0] = idf
+            table[:, 1] = idf * coef[0]
+
+            scorer = cls(
+                analyzer=vectorizer.build_analyzer(),
+                vocabulary=vocabulary,
+                table=table,
+                intercept=float(np.ravel(model.intercept_)[0]),
+                classes=model.classes_,
+                sublinear_tf=bool(getattr(vectorizer, "sublinear_tf", False)),
+                normalize=vectorizer.norm == "l2",
+            )
+        except Exception as e:
+            logger.warning(f"Could not compile fast scorer: {e}")
+            return None
+
+        # Guard against model variants whose probabilities are not a plain
+        # sigmoid of the decision value.
+        # Reduced-precision (compacted) models are only as exact as their dtype.
+        expected = model.predict_proba(vectorizer.transform(PARITY_PROBES))
+        tolerance = max(cls.PARITY_TOLERANCE, 100 * np.finfo(np.asarray(model.coef_).dtype).eps)
+        if not np.allclose(scorer.predict_proba(PARITY_PROBES), expected, rtol=0, atol=tolerance):
+            logger.warning("Fast scorer does not match predict_proba; using sklearn path")
+            return None
+
+        logger.info(f"Compiled fast scorer over {len(vocabulary)} terms")
+        return scorer
+
+    def _lookup(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Tokenize a text once and return (table rows, term frequencies)."""
+        counts = Counter(self.analyzer(text))
+        vocabulary = self.vocabulary
+
+        # Memory-mapped vocabularies resolve a whole document at once
+        lookup_many = getattr(vocabulary, "lookup_many", None)
+        if lookup_many is not None:
+            found_rows = lookup_many(list(counts))
+            found = found_rows >= 0
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))[found]
+            if self.sublinear_tf and len(tf):
+                tf = np.log(tf) + 1.0
+            return found_rows[found], tf
+
+        rows = []
+        tfs = []
+        for term, count in counts.items():
+            row = vocabulary.get(term)
+            if row is not None:
+                rows.append(row)
+                tfs.append(count)
+
+        tf = np.asarray(tfs, dtype=np.float64)
+        if self.sublinear_tf and len(tf):
+            tf = np.log(tf) + 1.0
+
+        return np.asarray(rows, dtype=np.intp), tf
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Compute the linear decision value for each text.
+
+        Args:
+            texts: Raw texts
+
+        Returns:
+            Array of shape (n_texts,)
+        """
+        scores = np.empty(len(texts), dtype=np.float64)
+
+        for i, text in enumerate(texts):
+            rows, tf = self._lookup(text)
+            if not len(rows):
+                scores[i] = self.intercept
+                continue
+
+            weights = self.table[rows]
+            values = tf * weights[:, 0]
+            score = float(np.dot(tf, weights[:, 1]))
+
+            if self.normalize:
+                norm = float(np.sqrt(np.dot(values, values)))
+                if norm > 0:
+                    score /= norm
+
+            scores[i] = score + self.intercept
+
+        return scores
+
+    def term_contributions(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Split one text's decision value into per-term contributions.
+
+        The contributions sum to ``decision_function(text) - intercept``.
+
+        Args:
+            text: Raw text
+
+        Returns:
+            Tuple of (vocabulary rows, contributions) for the terms present
+        """
+        rows, tf = self._lookup(text)
+        if not len(rows):
+            return rows, tf
+
+        weights = self.table[rows]
+        contributions = tf * weights[:, 1]
+
+        if self.normalize:
+            values = tf * weights[:, 0]
+            norm = float(np.sqrt(np.dot(values, values)))
+            if norm > 0:
+                contributions /= norm
+
+        return rows, contributions
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Compute class probabilities, ordered like ``classes_``.
+
+        Args:
+            texts: Raw texts
+
+        Returns:
+            Array of shape (n_texts, 2)
+        """
+        positive = expit(self.decision_function(texts))
+        return np.column_stack([1.0 - positive, positive])
@@ -15,8 +15,14 @@ from datetime import datetime
 import logging
 import shutil
 
+from .artifacts import export_artifact, is_artifact_dir, load_artifact
+from .explainability import ExplainabilityEngine, clear_feature_names
+
 logger = logging.getLogger(__name__)
 
+# Supported on-disk model formats
+MODEL_FORMATS = ("pickle", "mmap")
+
 
 class ModelVersion:
     """Represents a specific version of an ML model."""
@@ -27,34 +33,47 @@ class ModelVersion:
         model_path: str,
         tfidf_path: str,
         metadata: Optional[Dict] = None,
+        format: str = "pickle",
     ):
         """
         Initialize model version.
         
         Args:
             version: Version identifier (e.g., "1.0.0", "2023-12-01")
-            model_path: Path to model file
-            tfidf_path: Path to TF-IDF vectorizer file
+            model_path: Path to model file (artifact directory for "mmap")
+            tfidf_path: Path to TF-IDF vectorizer file (artifact directory for "mmap")
             metadata: Optional metadata (accuracy, training date, etc.)
+            format: Storage format, "pickle" or "mmap" (see ``ml.artifacts``)
         """
+        if format not in MODEL_FORMATS:
+            raise ValueError(f"Unknown model format: {format}")
+        
         self.version = version
         self.model_path = model_path
         self.tfidf_path = tfidf_path
         self.metadata = metadata or {}
+        self.format = format
         self.loaded_at: Optional[datetime] = None
         self.model = None
         self.tfidf = None
+        self.scorer = None
     
     def load(self):
         """Load model and vectorizer into memory."""
         try:
             logger.info(f"Loading model version {self.version}...")
             
-            with open(self.model_path, "rb") as f:
-                self.model = pickle.load(f)
-            
-            with open(self.tfidf_path, "rb") as f:
-                self.tfidf = pickle.load(f)
+            if self.format == "mmap":
+                artifact = load_artifact(self.model_path)
+                self.model = artifact.model
+                self.tfidf = artifact.tfidf
+                self.scorer = artifact.build_scorer()
+            else:
+                with open(self.model_path, "rb") as f:
+                    self.model = pickle.load(f)
+                
+                with open(self.tfidf_path, "rb") as f:
+                    self.tfidf = pickle.load(f)
             
             self.loaded_at = datetime.utcnow()
             logger.info(f"Model version {self.version} loaded successfully")
@@ -67,17 +86,31 @@ class ModelVersion:
         """Unload model from memory."""
         self.model = None
         self.tfidf = None
+        self.scorer = None
         self.loaded_at = None
+        clear_feature_names(self.version)
         logger.info(f"Model version {self.version} unloaded")
     
     def is_loaded(self) -> bool:
         """Check if model is loaded in memory."""
         return self.model is not None and self.tfidf is not None
     
+    def get_explainer(self) -> ExplainabilityEngine:
+        """Get an explainability engine for this version (loads it if needed)."""
+        if not self.is_loaded():
+            self.load()
+        return ExplainabilityEngine(self.model, self.tfidf, version=self.version, scorer=self.scorer)
+    
     def get_checksum(self) -> str:
         """Calculate checksum of model files."""
         hasher = hashlib.sha256()
         
+        if self.format == "mmap":
+            for path in sorted(Path(self.model_path).iterdir()):
+                with open(path, "rb") as f:
+                    hasher.update(f.read())
+            return hasher.hexdigest()
+        
         with open(self.model_path, "rb") as f:
             hasher.update(f.read())
         
@@ -93,6 +126,7 @@ class ModelVersion:
             "model_path": self.model_path,
             "tfidf_path": self.tfidf_path,
             "metadata": self.metadata,
+            "format": self.format,
             "loaded": self.is_loaded(),
             "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
             "checksum": self.get_checksum(),
@@ -106,15 +140,18 @@ class ModelManager:
     Provides version control, hot-swapping, and rollback capabilities.
     """
     
-    def __init__(self, models_dir: str = "models"):
+    def __init__(self, models_dir: str = "models", cache_namespace: Optional[str] = "analysis"):
         """
         Initialize model manager.
         
         Args:
             models_dir: Directory containing model versions
+            cache_namespace: Cache namespace of model results, invalidated
+                when the active version changes (None disables)
         """
         self.models_dir = Path(models_dir)
         self.models_dir.mkdir(exist_ok=True)
+        self.cache_namespace = cache_namespace
         
         self.versions: Dict[str, ModelVersion] = {}
         self.active_version: Optional[str] = None
@@ -137,6 +174,7 @@ class ModelManager:
                         model_path=version_data["model_path"],
                         tfidf_path=version_data["tfidf_path"],
                         metadata=version_data.get("metadata", {}),
+                        format=version_data.get("format", "pickle"),
                     )
                     self.versions[version.version] = version
                 
@@ -156,6 +194,7 @@ class ModelManager:
                         "model_path": v.model_path,
                         "tfidf_path": v.tfidf_path,
                         "metadata": v.metadata,
+                        "format": v.format,
                     }
                     for v in self.versions.values()
                 ],
@@ -177,16 +216,18 @@ class ModelManager:
         tfidf_path: str,
         metadata: Optional[Dict] = None,
         set_active: bool = False,
+        format: str = "pickle",
     ) -> ModelVersion:
         """
         Register a new model version.
         
         Args:
             version: Version identifier
-            model_path: Path to model file
-            tfidf_path: Path to TF-IDF file
+            model_path: Path to model file (artifact directory for "mmap")
+            tfidf_path: Path to TF-IDF file (artifact directory for "mmap")
             metadata: Optional metadata
             set_active: Whether to set as active version
+            format: Storage format, "pickle" or "mmap"
             
         Returns:
             ModelVersion instance
@@ -195,11 +236,15 @@ class ModelManager:
             raise ValueError(f"Version {version} already exists")
         
         # Validate files exist
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model file not found: {model_path}")
-        
-        if not os.path.exists(tfidf_path):
-            raise FileNotFoundError(f"TF-IDF file not found: {tfidf_path}")
+        if format == "mmap":
+            if not is_artifact_dir(model_path):
+                raise FileNotFoundError(f"Model artifact not found: {model_path}")
+        else:
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"Model file not found: {model_path}")
+            
+            if not os.path.exists(tfidf_path):
+                raise FileNotFoundError(f"TF-IDF file not found: {tfidf_path}")
         
         # Create version
         model_version = ModelVersion(
@@ -207,18 +252,49 @@ class ModelManager:
             model_path=model_path,
             tfidf_path=tfidf_path,
             metadata=metadata or {},
+            format=format,
         )
         
         self.versions[version] = model_version
         
+        old_version = self.active_version
         if set_active or self.active_version is None:
             self.active_version = version
         
         self._save_config()
+        self._invalidate_cache(old_version)
         
         logger.info(f"Registered model version {version}")
         return model_version
     
+    def register_artifact(
+        self,
+        version: str,
+        artifact_dir: str,
+        metadata: Optional[Dict] = None,
+        set_active: bool = False,
+    ) -> ModelVersion:
+        """
+        Register a memory-mapped model artifact as a new version.
+        
+        Args:
+            version: Version identifier
+            artifact_dir: Artifact directory written by ``export_artifact``
+            metadata: Optional metadata
+            set_active: Whether to set as active version
+            
+        Returns:
+            ModelVersion instance
+        """
+        return self.register_version(
+            version=version,
+            model_path=artifact_dir,
+            tfidf_path=artifact_dir,
+            metadata=metadata,
+            set_active=set_active,
+            format="mmap",
+        )
+    
     def get_version(self, version: str) -> Optional[ModelVersion]:
         """Get a specific model version."""
         return self.versions.get(version)
@@ -249,9 +325,31 @@ class ModelManager:
                 model_version.load()
         
         self._save_config()
+        self._invalidate_cache(old_version)
         
         logger.info(f"Active version changed: {old_version} -> {version}")
     
+    def _invalidate_cache(self, old_version: Optional[str]):
+        """
+        Retire cached results of the previous active version.
+        
+        Bumps the generation of ``cache_namespace`` (a single INCR; see
+        ``CacheManager.invalidate_namespace``). Failures are logged, not
+        raised: the version change itself has already been saved.
+        
+        Args:
+            old_version: Active version before the change
+        """
+        if self.cache_namespace is None or old_version is None or old_version == self.active_version:
+            return
+        
+        try:
+            from cache import get_cache_manager
+            generation = get_cache_manager().invalidate_namespace_sync(self.cache_namespace)
+            logger.info(f"Invalidated cached {self.cache_namespace} results (generation {generation})")
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached {self.cache_namespace} results: {e}")
+    
     def list_versions(self) -> List[Dict]:
         """List all registered model versions."""
         return [
@@ -280,8 +378,11 @@ class ModelManager:
         
         if delete_files:
             try:
-                os.remove(model_version.model_path)
-                os.remove(model_version.tfidf_path)
+                if model_version.format == "mmap":
+                    shutil.rmtree(model_version.model_path)
+                else:
+                    os.remove(model_version.model_path)
+                    os.remove(model_version.tfidf_path)
                 logger.info(f"Deleted model files for version {version}")
             except Exception as e:
                 logger.warning(f"Failed to delete model files: {e}")
@@ -322,11 +423,14 @@ class ModelManager:
         tfidf_file: str,
         metadata: Optional[Dict] = None,
         activate: bool = True,
+        format: str = "pickle",
     ) -> ModelVersion:
         """
         Deploy a new model version.
         
         Copies model files to the models directory and registers the version.
+        With ``format="mmap"`` the pickles are exported to a memory-mapped
+        artifact instead of being copied.
         
         Args:
             version: Version identifier
@@ -334,6 +438,7 @@ class ModelManager:
             tfidf_file: Source TF-IDF file path
             metadata: Optional metadata
             activate: Whether to activate immediately
+            format: Storage format, "pickle" or "mmap"
             
         Returns:
             ModelVersion instance
@@ -342,6 +447,27 @@ class ModelManager:
         version_dir = self.models_dir / version
         version_dir.mkdir(exist_ok=True)
         
+        if format == "mmap":
+            with open(model_file, "rb") as f:
+                model = pickle.load(f)
+            with open(tfidf_file, "rb") as f:
+                tfidf = pickle.load(f)
+            
+            artifact_dir = export_artifact(model, tfidf, version_dir / "artifact")
+            
+            model_version = self.register_artifact(
+                version=version,
+                artifact_dir=str(artifact_dir),
+                metadata=metadata,
+                set_active=activate,
+            )
+            
+            if activate:
+                model_version.load()
+            
+            logger.info(f"Deployed model version {version} (mmap)")
+            return model_version
+        
         # Copy model files
         model_dest = version_dir / "model.pkl"
         tfidf_dest = version_dir / "tfidf.pkl"
@@ -0,0 +1,387 @@
+"""
+Perturbation (LIME-style) explainer.
+
+Word-level "what would change the verdict" explanations: the explainer
+removes random subsets of the document's words, scores every masked
+variant in one sparse batch and fits a locally weighted linear surrogate
+on the keep/remove masks. The surrogate's coefficients rank the words by
+how much removing them moves the probability of the predicted class.
+
+For word-level TF-IDF vectorizers the variants are never rendered back to
+text: the document is tokenized once and the n-gram counts of every
+variant are built directly from the keep masks with numpy, giving one CSR
+matrix for the whole batch. Other vectorizers fall back to removing the
+words from the raw text and vectorizing the variants in one call.
+
+Candidate words are pre-selected with ``ExplainabilityEngine`` (the terms
+with the largest attributions) so the surrogate stays small on long
+documents, and a final batch removes the strongest supporting words one
+by one to find the smallest edit that flips the verdict.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+from scipy import sparse
+
+from .explainability import ExplainabilityEngine
+
+logger = logging.getLogger(__name__)
+
+# Words as the default TF-IDF token pattern sees them
+_WORD_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def _plain(value):
+    """Convert a numpy scalar class label to a plain Python value."""
+    return value.item() if hasattr(value, "item") else value
+
+
+class _TextSpace:
+    """Masks words in the raw text and vectorizes the rendered variants."""
+
+    def __init__(self, engine: ExplainabilityEngine, text: str):
+        self.engine = engine
+        self.text = text
+        self.matches = [(m.start(), m.end(), m.group()) for m in _WORD_PATTERN.finditer(text.lower())]
+        self.words = list(dict.fromkeys(word for _, _, word in self.matches))
+        self.spans: List[Tuple[int, int, int]] = []
+
+    def select(self, candidates: List[str]):
+        """Restrict masking to ``candidates`` (feature i is candidates[i])."""
+        feature_of = {word: i for i, word in enumerate(candidates)}
+        self.spans = [
+            (start, end, feature_of[word])
+            for start, end, word in self.matches
+            if word in feature_of
+        ]
+
+    def _render(self, keep: np.ndarray) -> str:
+        """Rebuild the text with the words of masked features removed."""
+        parts = []
+        position = 0
+        for start, end, feature in self.spans:
+            if not keep[feature]:
+                parts.append(self.text[position:start])
+                position = end
+        parts.append(self.text[position:])
+        return " ".join(parts) if len(parts) > 1 else parts[0]
+
+    def predict_proba(self, masks: np.ndarray) -> np.ndarray:
+        """Score the variants described by ``masks`` in one batch."""
+        variants = [self._render(mask) for mask in masks]
+        if self.engine.scorer is not None:
+            return self.engine.scorer.predict_proba(variants)
+        return self.engine.model.predict_proba(self.engine.vectorizer.transform(variants))
+
+
+class _TokenSpace:
+    """Builds the TF-IDF rows of masked variants directly from token ids."""
+
+    def __init__(self, engine: ExplainabilityEngine, text: str):
+        vectorizer = engine.vectorizer
+        self.engine = engine
+        self.vectorizer = vectorizer
+
+        # The analyzer's unigram stream: preprocess, tokenize, drop stop words
+        stop_words = vectorizer.get_stop_words() or frozenset()
+        tokens = [
+            token
+            for token in vectorizer.build_tokenizer()(vectorizer.build_preprocessor()(text))
+            if token not in stop_words
+        ]
+        self.words = list(dict.fromkeys(tokens))
+        word_id = {word: i for i, word in enumerate(self.words)}
+        self.token_ids = np.fromiter((word_id[t] for t in tokens), dtype=np.int64, count=len(tokens))
+        self.min_n, self.max_n = vectorizer.ngram_range
+        self.position_feature = np.zeros(len(tokens), dtype=np.int64)
+
+    @staticmethod
+    def supports(vectorizer) -> bool:
+        """Whether the vectorizer's terms can be rebuilt from its token stream."""
+        return (
+            getattr(vectorizer, "analyzer", None) == "word"
+            and all(
+                hasattr(vectorizer, name)
+                for name in ("build_preprocessor", "build_tokenizer", "get_stop_words", "ngram_range", "idf_")
+            )
+            and not getattr(vectorizer, "binary", False)
+            and getattr(vectorizer, "norm", None) in ("l2", None)
+        )
+
+    def select(self, candidates: List[str]):
+        """Restrict masking to ``candidates``; other tokens are always kept."""
+        # Column len(candidates) of the extended mask is "always kept"
+        feature_of = np.full(len(self.words), len(candidates), dtype=np.int64)
+        index = {word: i for i, word in enumerate(self.words)}
+        for i, word in enumerate(candidates):
+            feature_of[index[word]] = i
+        self.position_feature = feature_of[self.token_ids]
+
+    def _lookup(self, grams: List[str]) -> np.ndarray:
+        """Vocabulary columns of n-grams (-1 when out of vocabulary)."""
+        vocabulary = self.vectorizer.vocabulary_
+        lookup_many = getattr(vocabulary, "lookup_many", None)
+        if lookup_many is not None:
+            return np.asarray(lookup_many(grams), dtype=np.int64)
+        return np.fromiter((vocabulary.get(gram, -1) for gram in grams), dtype=np.int64, count=len(grams))
+
+    def transform(self, masks: np.ndarray) -> sparse.csr_matrix:
+        """TF-IDF matrix of the variants described by ``masks``."""
+        n_variants = masks.shape[0]
+        extended = np.hstack([masks, np.ones((n_variants, 1), dtype=bool)])
+        keep = extended[:, self.position_feature]
+
+        # Kept tokens of every variant, concatenated in document order
+        rows, positions = np.nonzero(keep)
+        ids = self.token_ids[positions]
+        base = len(self.words) + 1
+
+        gram_rows = []
+        gram_codes = []
+        for n in range(self.min_n, self.max_n + 1):
+            if len(ids) < n:
+                break
+            # An n-gram is n consecutive kept tokens of the same variant
+            valid = rows[:len(rows) - n + 1] == rows[n - 1:]
+            code = np.zeros(len(ids) - n + 1, dtype=np.int64)
+            for k in range(n):
+                code = code * base + (ids[k:len(ids) - n + 1 + k] + 1)
+            gram_rows.append(rows[:len(rows) - n + 1][valid])
+            gram_codes.append(code[valid] * (self.max_n + 1) + n)
+
+        if not gram_codes:
+            return sparse.csr_matrix((n_variants, len(self.vectorizer.idf_)))
+
+        gram_rows = np.concatenate(gram_rows)
+        unique_codes, inverse = np.unique(np.concatenate(gram_codes), return_inverse=True)
+
+        # Decode each distinct n-gram once and resolve it in the vocabulary
+        grams = []
+        for code in unique_codes.tolist():
+            n = code % (self.max_n + 1)
+            code //= self.max_n + 1
+            parts = []
+            for _ in range(n):
+                code, word = divmod(code, base)
+                parts.append(self.words[word - 1])
+            grams.append(" ".join(reversed(parts)))
+        columns = self._lookup(grams)[inverse]
+
+        found = columns >= 0
+        counts = sparse.csr_matrix(
+            (np.ones(int(found.sum())), (gram_rows[found], columns[found])),
+            shape=(n_variants, len(self.vectorizer.idf_)),
+        )
+        counts.sum_duplicates()
+
+        if getattr(self.vectorizer, "sublinear_tf", False):
+            counts.data = np.log(counts.data) + 1.0
+        if getattr(self.vectorizer, "use_idf", True):
+            counts.data = counts.data * np.asarray(self.vectorizer.idf_)[counts.indices]
+        if self.vectorizer.norm == "l2":
+            norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+            norms[norms == 0] = 1.0
+            counts.data = counts.data / np.repeat(norms, np.diff(counts.indptr))
+        return counts
+
+    def predict_proba(self, masks: np.ndarray) -> np.ndarray:
+        """Score the variants described by ``masks`` in one sparse batch."""
+        return self.engine.model.predict_proba(self.transform(masks))
+
+
+class PerturbationExplainer:
+    """
+    Explains a prediction by scoring masked variants of the input.
+    """
+
+    # LIME's text defaults: cosine distance scaled to 0-100, kernel width 25
+    KERNEL_WIDTH = 25.0
+
+    # Ridge penalty of the surrogate
+    ALPHA = 1.0
+
+    def __init__(
+        self,
+        engine: ExplainabilityEngine,
+        num_samples: int = 500,
+        max_features: int = 40,
+        seed: int = 0,
+    ):
+        """
+        Initialize explainer.
+
+        Args:
+            engine: Explainability engine of the model to explain
+            num_samples: Default number of masked variants per explanation
+            max_features: Maximum words in the surrogate (the rest are
+                never masked)
+            seed: Default random seed (explanations are deterministic for
+                a given text, seed and sample budget)
+        """
+        self.engine = engine
+        self.num_samples = max(2, num_samples)
+        self.max_features = max(1, max_features)
+        self.seed = seed
+        self.token_space = _TokenSpace.supports(engine.vectorizer)
+
+    def _space(self, text: str):
+        """Variant generator for ``text``."""
+        if self.token_space:
+            return _TokenSpace(self.engine, text)
+        return _TextSpace(self.engine, text)
+
+    def _candidate_words(self, text: str, words: List[str]) -> List[str]:
+        """Pick the words worth masking, strongest model attribution first."""
+        if len(words) <= self.max_features:
+            return list(words)
+
+        # A word's weight is the sum of |attribution| of the terms (unigrams
+        # and n-grams) it takes part in
+        terms, _ = self.engine.attribute([text], top_n=len(words) * 4)
+        weight: Dict[str, float] = {}
+        for term, attribution in terms[0]:
+            for word in term.split():
+                weight[word] = weight.get(word, 0.0) + abs(attribution)
+
+        ranked = sorted(words, key=lambda word: -weight.get(word, 0.0))
+        return ranked[:self.max_features]
+
+    def _fit_surrogate(
+        self,
+        masks: np.ndarray,
+        target: np.ndarray,
+        weights: np.ndarray,
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Fit a weighted ridge regression of ``target`` on ``masks``.
+
+        Returns:
+            Tuple of (coefficients, weighted R^2 of the fit)
+        """
+        total = weights.sum()
+        x_mean = weights @ masks / total
+        y_mean = weights @ target / total
+        xc = masks - x_mean
+        yc = target - y_mean
+
+        xw = xc * weights[:, None]
+        gram = xc.T @ xw + self.ALPHA * np.eye(masks.shape[1])
+        coef = np.linalg.solve(gram, xw.T @ yc)
+
+        residual = yc - xc @ coef
+        ss_res = weights @ (residual ** 2)
+        ss_tot = weights @ (yc ** 2)
+        fidelity = 1.0 - ss_res / ss_tot if ss_tot > 0 else 1.0
+        return coef, float(fidelity)
+
+    def explain(
+        self,
+        text: str,
+        num_samples: Optional[int] = None,
+        seed: Optional[int] = None,
+        top_k: int = 10,
+    ) -> Dict:
+        """
+        Explain the model's prediction for one text.
+
+        Args:
+            text: Text to explain
+            num_samples: Masked variants to score (defaults to the
+                explainer's budget)
+            seed: Random seed (defaults to the explainer's seed)
+            top_k: Words returned
+
+        Returns:
+            Dict with the predicted class, its probability, the top words
+            with their surrogate weights (positive means the word supports
+            the prediction), the smallest removal that flips the verdict
+            (None if removing the supporting words does not), the
+            surrogate's fidelity and the sampling parameters
+        """
+        num_samples = max(2, num_samples or self.num_samples)
+        seed = self.seed if seed is None else seed
+        classes = self.engine.model.classes_
+
+        space = self._space(text)
+        candidates = self._candidate_words(text, space.words)
+        space.select(candidates)
+        n_features = len(candidates)
+
+        if n_features == 0:
+            probabilities = space.predict_proba(np.ones((1, 0), dtype=bool))[0]
+            label = int(probabilities.argmax())
+            return {
+                "prediction": _plain(classes[label]),
+                "probability": float(probabilities[label]),
+                "words": [],
+                "counterfactual": None,
+                "fidelity": None,
+                "num_samples": 1,
+                "seed": seed,
+            }
+
+        # LIME sampling: the first variant is the original text, the others
+        # drop a uniformly chosen number of uniformly chosen words
+        rng = np.random.default_rng(seed)
+        masks = np.ones((num_samples, n_features), dtype=bool)
+        removed_counts = rng.integers(1, n_features + 1, size=num_samples - 1)
+        for row, count in enumerate(removed_counts, start=1):
+            masks[row, rng.choice(n_features, size=count, replace=False)] = False
+
+        probabilities = space.predict_proba(masks)
+        label = int(probabilities[0].argmax())
+        target = probabilities[:, label]
+
+        # Exponential kernel on the cosine distance to the original
+        kept = masks.sum(axis=1)
+        distance = (1.0 - np.sqrt(kept / n_features)) * 100
+        weights = np.sqrt(np.exp(-(distance ** 2) / self.KERNEL_WIDTH ** 2))
+
+        coef, fidelity = self._fit_surrogate(masks.astype(np.float64), target, weights)
+
+        order = np.argsort(-np.abs(coef), kind="stable")
+        words = [
+            {"word": candidates[i], "weight": float(coef[i])}
+            for i in order[:top_k]
+        ]
+
+        return {
+            "prediction": _plain(classes[label]),
+            "probability": float(target[0]),
+            "words": words,
+            "counterfactual": self._counterfactual(space, candidates, coef, label),
+            "fidelity": fidelity,
+            "num_samples": num_samples,
+            "seed": seed,
+        }
+
+    def _counterfactual(
+        self,
+        space,
+        candidates: List[str],
+        coef: np.ndarray,
+        label: int,
+    ) -> Optional[Dict]:
+        """Remove the strongest supporting words one by one until the verdict flips."""
+        supporting = [i for i in np.argsort(-coef, kind="stable") if coef[i] > 0]
+        if not supporting:
+            return None
+
+        # All cumulative removals in one batch
+        masks = np.ones((len(supporting), len(candidates)), dtype=bool)
+        for row in range(len(supporting)):
+            masks[row:, supporting[row]] = False
+
+        probabilities = space.predict_proba(masks)
+        flipped = np.nonzero(probabilities.argmax(axis=1) != label)[0]
+        if not len(flipped):
+            return None
+
+        row = int(flipped[0])
+        return {
+            "removed": [candidates[i] for i in supporting[:row + 1]],
+            "probability": float(probabilities[row, label]),
+        }
@@ -1,50 +1,33 @@
-import pickle, string, re, requests, numpy as np, nltk
+import os, pickle, string, re, requests, numpy as np
 from bs4 import BeautifulSoup
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
-from textblob import TextBlob
 from sklearn.base import BaseEstimator, TransformerMixin
+from services.sentiment_engine import get_sentiment_engine
+from services.red_flags import get_red_flag_detector
+from ml.artifacts import is_artifact_dir, load_artifact
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-stemmer = PorterStemmer()
-try:
-    from nltk.corpus import stopwords
-    stop_words = set(stopwords.words('english'))
-except Exception:
-    stop_words = set()
-
-def clean_for_tfidf(text):
-    if not isinstance(text, str):
-        return ""
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    tokens = word_tokenize(text)
-    tokens = [stemmer.stem(w) for w in tokens if w not in stop_words and len(w) > 2]
-    return " ".join(tokens)
+# NLTK data is pre-baked (scripts/prebake_nltk_data.py), never downloaded here
+from services.text_features import clean_for_tfidf, stemmer, stop_words  # noqa: F401
 
 class TextStatsExtractor(BaseEstimator, TransformerMixin):
     def fit(self, X, y=None): return self
     def transform(self, X):
-        feats = []
-        for t in X:
-            try:
-                b = TextBlob(str(t))
-                feats.append([len(str(t)), len(str(t).split()), b.sentiment.polarity, b.sentiment.subjectivity])
-            except Exception:
-                feats.append([0,0,0,0])
-        return np.array(feats)
+        texts = [str(t) for t in X]
+        try:
+            sentiments = get_sentiment_engine().score_many(texts)
+        except Exception:
+            return np.array([[0,0,0,0] for _ in texts])
+        return np.array([[len(t), len(t.split()), p, s] for t, (p, s) in zip(texts, sentiments)])
 
 print("⏳ Loading AI Model...")
+MODEL_PATH = os.getenv("MODEL_PATH", "model_final.pkl")
+TFIDF_PATH = os.getenv("TFIDF_PATH", "tfidf_final.pkl")
 try:
-    with open("model_final.pkl","rb") as f: model = pickle.load(f)
-    with open("tfidf_final.pkl","rb") as f: tfidf = pickle.load(f)
+    if is_artifact_dir(MODEL_PATH):
+        artifact = load_artifact(MODEL_PATH)
+        model = artifact.model; tfidf = artifact.tfidf
+    else:
+        with open(MODEL_PATH,"rb") as f: model = pickle.load(f)
+        with open(TFIDF_PATH,"rb") as f: tfidf = pickle.load(f)
     class_order = list(model.classes_)
     print(f"✅ Loaded model/tfidf. Classes: {class_order}")
 except Exception as e:
@@ -54,7 +37,7 @@ except Exception as e:
 def google_fact_check(_query):  # stub (optional: fill if you use API key)
     return None
 
-def generate_explanation(text, is_real, probability, red_flags, fact_check):
+def generate_explanation(text, is_real, probability, red_flags, fact_check, sentiment=None):
     reasons = []
     if probability > 90:
         reasons.append(f"Model is extremely confident ({probability:.1f}%).")
@@ -62,7 +45,7 @@ def generate_explanation(text, is_real, probability, red_flags, fact_check):
         reasons.append(f"Model shows strong indicators ({probability:.1f}%).")
     elif probability > 50:
         reasons.append(f"Model leans this way ({probability:.1f}%), lower certainty.")
-    blob = TextBlob(text); sentiment = blob.sentiment.polarity; subjectivity = blob.sentiment.subjectivity
+    sentiment, subjectivity = sentiment if sentiment is not None else get_sentiment_engine().score(text)
     if is_real:
         if subjectivity < 0.4: reasons.append("Objective/neutral writing.")
         if -0.1 < sentiment < 0.1: reasons.append("Balanced tone.")
@@ -112,11 +95,11 @@ def analyze_news(input_data):
         prediction = model.predict(vec)[0]
         is_real = prediction in real_labels
 
+        report = get_red_flag_detector().scan(news_text)
         red_flags = []
-        if news_text.count("!") > 2: red_flags.append("Excessive exclamation marks.")
-        if news_text.isupper(): red_flags.append("ALL CAPS text.")
-        clickbait = ["shocking", "secret", "you won't believe", "urgent", "share this", "censored"]
-        if any(w in news_text.lower() for w in clickbait): red_flags.append("Clickbait terms detected.")
+        if report.exclamation_count > 2: red_flags.append("Excessive exclamation marks.")
+        if report.is_all_caps: red_flags.append("ALL CAPS text.")
+        if report.matches: red_flags.append("Clickbait terms detected.")
 
         fact_check_result = google_fact_check(news_text)
         if fact_check_result and ("False" in fact_check_result or "Pants on Fire" in fact_check_result):
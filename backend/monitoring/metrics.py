@@ -12,6 +12,37 @@ analysis_count = Counter('analysis_total', 'Total analyses', ['verdict'])
 analysis_duration = Histogram('analysis_duration_seconds', 'Analysis duration')
 cache_hits = Counter('cache_hits_total', 'Cache hits')
 cache_misses = Counter('cache_misses_total', 'Cache misses')
+cache_tier_hits = Counter('cache_tier_hits_total', 'Cache hits by tier (l1 = in-process, l2 = Redis)', ['tier'])
+cache_coalesced = Counter(
+    'cache_coalesced_total', 'Cache misses served by a computation already in flight (local = same process, remote = lease holder)', ['scope']
+)
+cache_lease_timeouts = Counter('cache_lease_timeouts_total', 'Single-flight waits that gave up on the lease holder')
+cache_value_bytes = Histogram(
+    'cache_value_bytes', 'Encoded size of values written to the cache', ['codec'],
+    buckets=(256, 512, 1024, 2048, 4096, 8192, 16384, 65536, 262144)
+)
+cache_stale_hits = Counter('cache_stale_hits_total', 'Cache hits past the soft TTL (served stale)')
+cache_refreshes = Counter('cache_refreshes_total', 'Stale cache values recomputed in the background')
+cache_rule_events = Counter(
+    'cache_rule_events_total',
+    'Cache admission policy events by rule (hit, miss, admitted, negative, evicted, rejected_size, rejected_frequency, rejected_negative)',
+    ['rule', 'event']
+)
+analysis_cache_lookups = Counter(
+    'analysis_cache_lookups_total', 'Analysis cache lookups by outcome (exact, near_duplicate, miss)', ['result']
+)
+analysis_path = Counter(
+    'analysis_path_total', 'Analyses by cascade path (fast, uncertain, requested, cached)', ['path']
+)
+
+# Inference batching metrics
+inference_queue_depth = Gauge('inference_queue_depth', 'Texts waiting for the inference batcher')
+inference_batch_size = Histogram(
+    'inference_batch_size', 'Texts scored per batched model call',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+inference_executor_pending = Gauge('inference_executor_pending', 'Analyses in flight in the process pool')
+inference_executor_rejected = Counter('inference_executor_rejected_total', 'Analyses rejected because the process pool queue was full')
 
 # Model metrics
 model_predictions = Counter('model_predictions_total', 'Model predictions', ['version', 'prediction'])
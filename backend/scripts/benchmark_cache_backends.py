@@ -0,0 +1,127 @@
+"""
+Latency benchmark of the cache backends.
+
+Runs the same workload through a ``CacheManager`` on each backend, with
+the L1 tier, admission rules and TTL jitter disabled so every call
+reaches storage: single-key sets, hits and misses, then 10-key batch
+reads and writes. Values are result-sized dictionaries built from the
+sample articles. Reports the median and 99th percentile latency per
+operation. The SQLite backend uses a fresh database in a temporary
+directory; Redis is skipped if it is not reachable. Exits with status 1
+if a backend returns a value different from the one written.
+
+Usage:
+    python scripts/benchmark_cache_backends.py [redis_url] [rounds]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache import CacheManager, RedisBackend, SQLiteBackend
+from config.settings import get_settings
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+BATCH = 10
+
+
+def _percentiles(timings):
+    """Median and p99 of timings in microseconds."""
+    timings = sorted(timings)
+    return timings[len(timings) // 2] * 1e6, timings[int(len(timings) * 0.99)] * 1e6
+
+
+async def _timed(timings, operation):
+    """Await an operation and record its duration."""
+    start = time.perf_counter()
+    result = await operation
+    timings.append(time.perf_counter() - start)
+    return result
+
+
+async def _run(cache: CacheManager, values, rounds: int):
+    """Run the workload; returns timings by operation, or None on a mismatch."""
+    timings = {name: [] for name in ("set", "get hit", "get miss", "set_many", "get_many")}
+    keys = [f"bench:{i}" for i in range(len(values))]
+
+    for _ in range(rounds):
+        for key, value in zip(keys, values):
+            await _timed(timings["set"], cache.set(key, value, ttl=600))
+            if await _timed(timings["get hit"], cache.get(key)) != value:
+                print(f"FAIL: {cache.backend.name} returned a different value for {key}")
+                return None
+            await _timed(timings["get miss"], cache.get(f"{key}:missing"))
+
+        for start in range(0, len(keys), BATCH):
+            batch = dict(zip(keys[start:start + BATCH], values[start:start + BATCH]))
+            await _timed(timings["set_many"], cache.set_many(batch, ttl=600))
+            found = await _timed(timings["get_many"], cache.get_many(list(batch)))
+            if found != list(batch.values()):
+                print(f"FAIL: {cache.backend.name} returned different values for a batch")
+                return None
+
+    await cache.delete_many(keys)
+    return timings
+
+
+async def _benchmark(backend, values, rounds: int) -> bool:
+    """Benchmark one backend and print its rows."""
+    cache = CacheManager("redis://unused", ttl_jitter=0.0, backend=backend)
+    try:
+        timings = await _run(cache, values, rounds)
+    finally:
+        await cache.disconnect()
+    if timings is None:
+        return False
+
+    print(f"{backend.name}:")
+    for name, samples in timings.items():
+        p50, p99 = _percentiles(samples)
+        print(f"{name:>12}: p50 {p50:8.1f} us  p99 {p99:8.1f} us  ({len(samples)} calls)")
+    return True
+
+
+async def _redis_available(redis_url: str) -> bool:
+    """Whether Redis answers a read."""
+    backend = RedisBackend(redis_url)
+    try:
+        await backend.get_many(["bench:ping"])
+        return True
+    except Exception:
+        return False
+    finally:
+        await backend.close()
+
+
+def main(redis_url: str = None, rounds: str = "20") -> int:
+    """Run the benchmark."""
+    redis_url = redis_url or get_settings().redis_url
+    rounds = int(rounds)
+    values = [
+        {"v": 2, "title": "✅ AUTHENTIC NEWS", "p": [0.8, 0.2], "reasons": article.split(". ")[:5]}
+        for article in SAMPLE_ARTICLES
+    ]
+    # A whole number of batches
+    values = values[:max(BATCH, len(values) - len(values) % BATCH)]
+    print(f"{len(values)} values, {rounds} rounds")
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteBackend(str(Path(directory) / "cache.sqlite3"))
+        if not asyncio.run(_benchmark(backend, values, rounds)):
+            return 1
+
+    if asyncio.run(_redis_available(redis_url)):
+        if not asyncio.run(_benchmark(RedisBackend(redis_url), values, rounds)):
+            return 1
+    else:
+        print(f"Redis not reachable at {redis_url} (skipped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
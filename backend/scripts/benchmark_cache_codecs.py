@@ -0,0 +1,114 @@
+"""
+Benchmark of the cache value codecs on real analysis results.
+
+Analyzes the sample corpus (full pipeline, no cache) and encodes every
+result with each installed serializer and compressor, reporting the mean
+bytes per entry and the median encode/decode time. Two baselines are
+included: the pickled ``(verdict, html, probabilities)`` tuple the cache
+used to store, and the untagged JSON dictionary. Before timing, checks
+that every codec decodes back to the same dictionary. Exits with status 1
+on any round-trip mismatch.
+
+Usage:
+    python scripts/benchmark_cache_codecs.py [compression_threshold]
+"""
+
+import asyncio
+import json
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache import serialization
+from config.settings import get_settings
+from services.analysis_service import AnalysisService
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+REPEAT = 200
+
+
+def _median_us(func, values) -> float:
+    """Median microseconds of ``func(value)`` over all values."""
+    timings = []
+    for _ in range(REPEAT):
+        for value in values:
+            start = time.perf_counter()
+            func(value)
+            timings.append((time.perf_counter() - start) * 1e6)
+    return sorted(timings)[len(timings) // 2]
+
+
+def _report(name: str, encoded, encode, decode, values):
+    """Print one row of the table."""
+    size = sum(len(data) for data in encoded) / len(encoded)
+    print(f"{name:>18}: {size:8.0f} B/entry  "
+          f"encode {_median_us(encode, values):7.1f} us  "
+          f"decode {_median_us(decode, encoded):7.1f} us")
+
+
+def main(threshold: str = None) -> int:
+    """Run the checks and benchmark."""
+    settings = get_settings()
+    threshold = int(threshold) if threshold else settings.cache_compression_threshold
+    service = AnalysisService(
+        model_path=settings.model_path,
+        tfidf_path=settings.tfidf_path,
+        enable_cache=False,
+    )
+    if not service.is_loaded():
+        print("FAIL: model not loaded")
+        return 1
+
+    results = asyncio.run(service.analyze_results(SAMPLE_ARTICLES, full=True))
+    entries = [result.to_dict() for result in results if result.ok]
+    tuples = [result.to_tuple() for result in results if result.ok]
+    canonical = [json.dumps(entry, sort_keys=True) for entry in entries]
+    print(f"{len(entries)} analysis results, compression threshold {threshold} B")
+
+    _report(
+        "pickle tuple",
+        [pickle.dumps(value) for value in tuples],
+        pickle.dumps,
+        pickle.loads,
+        tuples,
+    )
+    _report(
+        "json (untagged)",
+        [json.dumps(entry).encode("utf-8") for entry in entries],
+        lambda entry: json.dumps(entry).encode("utf-8"),
+        json.loads,
+        entries,
+    )
+
+    compressors = [None] + serialization.available_compressors()
+    for serializer in serialization.available_serializers():
+        if serializer == "text":
+            continue
+        for compression in compressors:
+            def encode(entry, serializer=serializer, compression=compression):
+                return serialization.encode(entry, serializer, compression, threshold)[0]
+
+            encoded = [encode(entry) for entry in entries]
+            for data, expected in zip(encoded, canonical):
+                if json.dumps(serialization.decode(data), sort_keys=True) != expected:
+                    print(f"FAIL: {serializer}+{compression} does not round-trip")
+                    return 1
+
+            name = f"{serializer}+{compression}" if compression else serializer
+            _report(name, encoded, encode, serialization.decode, entries)
+
+    missing = [
+        name for name in ("msgpack", "zstd", "lz4")
+        if name not in serialization.available_serializers() + serialization.available_compressors()
+    ]
+    if missing:
+        print(f"Not installed (skipped): {', '.join(missing)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
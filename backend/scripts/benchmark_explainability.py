@@ -0,0 +1,90 @@
+"""
+Parity check and benchmark for the sparse explainability engine.
+
+Compares ``ExplainabilityEngine`` (compiled and sparse-matrix paths) with
+the dense ``toarray() * coef_`` computation it replaced on the sample
+corpus, then times an explanation against a plain prediction. Exits with
+status 1 if the top terms or their weights disagree.
+
+Usage:
+    python scripts/benchmark_explainability.py [model_path] [tfidf_path]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import get_settings
+from ml.explainability import ExplainabilityEngine
+from services.analysis_service import AnalysisService
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+TOP_N = 10
+REPEAT = 200
+
+
+def _dense_importance(model, vectorizer, text: str, top_n: int):
+    """The original dense implementation."""
+    vec = vectorizer.transform([text])
+    feature_names = vectorizer.get_feature_names_out()
+    feature_scores = vec.toarray()[0] * model.coef_[0]
+    top_indices = np.argsort(np.abs(feature_scores))[-top_n:][::-1]
+    return [(feature_names[i], float(feature_scores[i]))
+            for i in top_indices if feature_scores[i] != 0]
+
+
+def _time(function, texts) -> float:
+    """Mean milliseconds per text."""
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        function(texts[i % len(texts)])
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(model_path: str = None, tfidf_path: str = None) -> int:
+    """Run the parity check and benchmark."""
+    settings = get_settings()
+    service = AnalysisService(
+        model_path=model_path or settings.model_path,
+        tfidf_path=tfidf_path or settings.tfidf_path,
+        enable_cache=False,
+    )
+    if not service.is_loaded():
+        print("FAIL: model not loaded")
+        return 1
+
+    engines = {
+        "compiled": service.explainer,
+        "sparse": ExplainabilityEngine(service.model, service.tfidf, version=service.model_version),
+    }
+
+    for name, engine in engines.items():
+        for text in SAMPLE_ARTICLES:
+            expected = _dense_importance(service.model, service.tfidf, text, TOP_N)
+            actual = engine.get_feature_importance(text, top_n=TOP_N)
+            if (
+                [term for term, _ in actual] != [str(term) for term, _ in expected]
+                or not np.allclose([w for _, w in actual], [w for _, w in expected], atol=1e-9)
+            ):
+                print(f"FAIL: {name} engine disagrees on {text[:60]!r}")
+                return 1
+    print(f"Parity: top-{TOP_N} terms and weights match on {len(SAMPLE_ARTICLES)} texts")
+
+    timings = {
+        "dense (old)": _time(lambda t: _dense_importance(service.model, service.tfidf, t, TOP_N), SAMPLE_ARTICLES),
+        "sparse engine": _time(lambda t: engines["sparse"].get_feature_importance(t, TOP_N), SAMPLE_ARTICLES),
+        "explain_many": _time(lambda t: service.explain_many([t], TOP_N), SAMPLE_ARTICLES),
+        "prediction": _time(lambda t: service._score_texts([t]), SAMPLE_ARTICLES),
+    }
+    for name, ms in timings.items():
+        print(f"{name:>14}: {ms:8.3f} ms/text")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
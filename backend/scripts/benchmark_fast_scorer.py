@@ -0,0 +1,60 @@
+"""
+Latency benchmark for the compiled fast scorer.
+
+Reports per-text latency of ``CompiledLinearScorer.predict_proba`` and of
+the sklearn ``tfidf.transform`` + ``model.predict_proba`` path on the
+sample corpus. Parity with ``predict_proba`` is asserted by
+``tests/test_fast_scorer.py``. Exits with status 1 if the model does not
+support the compiled fast path.
+
+Usage:
+    python scripts/benchmark_fast_scorer.py [model_path] [tfidf_path]
+"""
+
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.fast_scorer import CompiledLinearScorer
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+
+def _time_per_text(func, texts, repeat: int) -> float:
+    """Return mean latency per text in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func([text])
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(texts)) * 1e6
+
+
+def main(model_path: str = "model_final.pkl", tfidf_path: str = "tfidf_final.pkl") -> int:
+    """Run the benchmark."""
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    with open(tfidf_path, "rb") as f:
+        tfidf = pickle.load(f)
+
+    scorer = CompiledLinearScorer.compile(model, tfidf)
+    if scorer is None:
+        print("Model does not support the compiled fast path")
+        return 1
+
+    # Single-text latency (the API request path)
+    repeat = 20
+    sklearn_us = _time_per_text(lambda t: model.predict_proba(tfidf.transform(t)), SAMPLE_ARTICLES, repeat)
+    fast_us = _time_per_text(scorer.predict_proba, SAMPLE_ARTICLES, repeat)
+
+    print(f"sklearn transform + predict_proba: {sklearn_us:8.1f} us/text")
+    print(f"compiled fast scorer:              {fast_us:8.1f} us/text")
+    print(f"speedup:                           {sklearn_us / fast_us:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
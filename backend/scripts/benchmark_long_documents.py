@@ -0,0 +1,92 @@
+"""
+Latency benchmark for long-document mode.
+
+Builds documents of growing size from the sample corpus and times the
+uncached analysis pipeline on each. With chunking, latency should level
+off once a document exceeds ``chunk_chars * max_chunks_per_document``
+instead of growing with the input. Exits with status 1 if the largest
+document takes more than ``MAX_SLOWDOWN`` times as long as the capped size.
+
+Usage:
+    python scripts/benchmark_long_documents.py [model_path] [tfidf_path]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import get_settings
+from services.analysis_service import AnalysisService
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+# Allowed latency ratio between the largest document and the capped size
+MAX_SLOWDOWN = 3.0
+
+REPEAT = 5
+
+
+def _document(size: int) -> str:
+    """Build a multi-paragraph document of about ``size`` characters."""
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = SAMPLE_ARTICLES[len(paragraphs) % len(SAMPLE_ARTICLES)]
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size]
+
+
+def _time_analysis(service: AnalysisService, text: str) -> float:
+    """Median milliseconds for one uncached analysis."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        asyncio.run(service._analyze_uncached([text]))
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main(model_path: str = None, tfidf_path: str = None) -> int:
+    """Run the benchmark."""
+    settings = get_settings()
+    service = AnalysisService(
+        model_path=model_path or settings.model_path,
+        tfidf_path=tfidf_path or settings.tfidf_path,
+        enable_cache=False,
+        long_document_chars=settings.long_document_chars,
+        chunk_chars=settings.chunk_chars,
+        max_chunks=settings.max_chunks_per_document,
+    )
+    if not service.is_loaded():
+        print("FAIL: model not loaded")
+        return 1
+
+    capped = service.chunker.max_chars
+    sizes = sorted({1_000, settings.long_document_chars, capped, capped * 10, 1_000_000, 10_000_000})
+
+    # Warm up lazy imports and the sentiment lexicon
+    _time_analysis(service, _document(1_000))
+
+    timings = {}
+    for size in sizes:
+        text = _document(size)
+        timings[size] = _time_analysis(service, text)
+        result = asyncio.run(service._analyze_uncached([text]))[0]
+        chunks = len(result.chunks) if result.chunks is not None else "-"
+        print(f"{size:>10,} chars: {timings[size]:8.1f} ms  chunks={chunks}  "
+              f"truncated={result.truncated}  {result.title}")
+
+    slowdown = timings[sizes[-1]] / timings[capped]
+    print(f"Largest document vs capped size: {slowdown:.2f}x (limit {MAX_SLOWDOWN:.1f}x)")
+    if slowdown > MAX_SLOWDOWN:
+        print("FAIL: latency keeps growing past the chunk cap")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
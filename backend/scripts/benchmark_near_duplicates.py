@@ -0,0 +1,133 @@
+"""
+Hit-rate benchmark for the near-duplicate analysis cache.
+
+Builds a corpus of syndicated stories from the sample articles and
+replays it with the kinds of edits syndication makes (bylines,
+datelines, whitespace, tracking footers). Each text is looked up the way
+``AnalysisService.analyze_results`` does: exact key first, then the
+``NearDuplicateIndex``. Reports the hit rate of the exact cache alone
+against exact + near-duplicate lookups, the false matches (a copy
+matched to a different story; any two stories share at most one
+paragraph) and the lookup cost. Exits with status 1
+on any false match.
+
+Usage:
+    python scripts/benchmark_near_duplicates.py [threshold] [stories]
+"""
+
+import hashlib
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache.near_duplicate import NearDuplicateIndex
+from config.settings import get_settings
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+BYLINES = ["By Jane Smith, Reuters", "By Staff Reporter", "By Ahmed Khan | AP", "By Maria Garcia"]
+DATELINES = ["LONDON (Reuters) - ", "WASHINGTON (AP) — ", "NEW YORK, March 3 - "]
+FOOTERS = [
+    "Read more: https://news.example.com/story?utm_source=twitter&utm_medium=social",
+    "Share this article. Follow us for updates. © 2024 Example Media. All rights reserved.",
+    "Reporting by Jane Smith; Editing by Tom Brown",
+]
+
+
+def _stories(count: int, rng: random.Random):
+    """Stories of three paragraphs; any two share at most one paragraph."""
+    articles = [a for a in SAMPLE_ARTICLES if len(a) > 80]
+    triples = list(itertools.combinations(range(len(articles)), 3))
+    rng.shuffle(triples)
+
+    stories = []
+    for triple in triples:
+        if all(len(set(triple) & set(other)) <= 1 for other in stories):
+            stories.append(triple)
+            if len(stories) == count:
+                break
+    return ["\n\n".join(articles[i] for i in story) for story in stories]
+
+
+def _variants(story: str, rng: random.Random):
+    """Syndicated copies of a story."""
+    return [
+        f"{rng.choice(BYLINES)}\n\n{story}",
+        rng.choice(DATELINES) + story,
+        story.replace("\n\n", "\n \n").replace(". ", ".  "),
+        f"{story}\n\n{rng.choice(FOOTERS)}",
+        f"{rng.choice(BYLINES)}\n\n{rng.choice(DATELINES)}{story}\n\n{rng.choice(FOOTERS)}",
+    ]
+
+
+def _exact_key(text: str) -> str:
+    """Same normalization as ``AnalysisService._generate_cache_key``."""
+    return hashlib.sha256(text.strip().lower().encode()).hexdigest()
+
+
+def main(threshold: str = None, stories: str = "50") -> int:
+    """Run the benchmark."""
+    settings = get_settings()
+    rng = random.Random(0)
+    index = NearDuplicateIndex(
+        threshold=float(threshold) if threshold else settings.near_duplicate_threshold,
+        max_entries=settings.near_duplicate_max_entries,
+    )
+
+    # Every story is seen once as published, then as syndicated copies
+    stream = []
+    corpus = _stories(int(stories), rng)
+    for story_id, story in enumerate(corpus):
+        stream.append((story_id, story))
+        stream.extend((story_id, variant) for variant in _variants(story, rng))
+    rng.shuffle(stream)
+
+    exact_cache = {}
+    story_of_key = {}
+    exact_hits = near_hits = false_matches = 0
+    lookup_seconds = 0.0
+
+    for story_id, text in stream:
+        key = _exact_key(text)
+        if key in exact_cache:
+            exact_hits += 1
+            continue
+
+        start = time.perf_counter()
+        signature = index.signature(text)
+        match = index.lookup(signature) if signature is not None else None
+        lookup_seconds += time.perf_counter() - start
+
+        if match is not None:
+            near_hits += 1
+            if story_of_key[match[0]] != story_id:
+                false_matches += 1
+            continue
+
+        # Miss: "analyze" and cache it
+        exact_cache[key] = story_id
+        story_of_key[key] = story_id
+        if signature is not None:
+            index.add(signature, key)
+
+    total = len(stream)
+    lookups = total - exact_hits
+    print(f"texts: {total} ({len(corpus)} stories, {total - len(corpus)} syndicated copies)")
+    print(f"exact cache only:        {exact_hits / total:6.1%} hit rate")
+    print(f"exact + near-duplicate:  {(exact_hits + near_hits) / total:6.1%} hit rate "
+          f"(+{near_hits} hits, threshold {index.threshold})")
+    print(f"false matches:           {false_matches}")
+    print(f"fingerprint + lookup:    {lookup_seconds / max(lookups, 1) * 1e6:8.1f} us/text")
+
+    if false_matches:
+        print("FAIL: near-duplicate lookup matched a different story")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
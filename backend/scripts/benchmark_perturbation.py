@@ -0,0 +1,127 @@
+"""
+Benchmark for the perturbation (LIME-style) explainer.
+
+Times one explanation of the sample corpus at several sample budgets,
+for the token-space batch (TF-IDF rows built from keep masks) and for the
+text-space fallback (masked texts vectorized in one call). Before timing,
+checks that token-space rows match ``vectorizer.transform`` of the masked
+texts and that explanations are deterministic for a fixed seed. Exits
+with status 1 if either check fails.
+
+Usage:
+    python scripts/benchmark_perturbation.py [model_path] [tfidf_path]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import get_settings
+from ml.perturbation import PerturbationExplainer, _TokenSpace
+from services.analysis_service import AnalysisService
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+BUDGETS = (100, 500, 2000, 5000)
+
+REPEAT = 3
+
+
+def _check_token_space(service: AnalysisService, text: str) -> bool:
+    """Compare token-space rows with vectorizing the masked token stream."""
+    vectorizer = service.tfidf
+    space = _TokenSpace(service.explainer, text)
+    candidates = space.words[:40]
+    space.select(candidates)
+
+    masks = np.random.default_rng(0).random((64, len(candidates))) > 0.5
+    stop_words = vectorizer.get_stop_words() or frozenset()
+    tokens = [
+        token
+        for token in vectorizer.build_tokenizer()(vectorizer.build_preprocessor()(text))
+        if token not in stop_words
+    ]
+    feature_of = {word: i for i, word in enumerate(candidates)}
+    variants = [
+        " ".join(t for t in tokens if t not in feature_of or mask[feature_of[t]])
+        for mask in masks
+    ]
+    difference = abs(space.transform(masks) - vectorizer.transform(variants)).max()
+    return difference < 1e-9
+
+
+def _time(explainer: PerturbationExplainer, texts, num_samples: int) -> float:
+    """Median milliseconds per explanation."""
+    timings = []
+    for _ in range(REPEAT):
+        for text in texts:
+            start = time.perf_counter()
+            explainer.explain(text, num_samples=num_samples)
+            timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def _time_prediction(service: AnalysisService) -> float:
+    """Median milliseconds for one model prediction."""
+    timings = []
+    for _ in range(REPEAT * 10):
+        for text in SAMPLE_ARTICLES:
+            start = time.perf_counter()
+            service._score_texts([text])
+            timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main(model_path: str = None, tfidf_path: str = None) -> int:
+    """Run the checks and benchmark."""
+    settings = get_settings()
+    service = AnalysisService(
+        model_path=model_path or settings.model_path,
+        tfidf_path=tfidf_path or settings.tfidf_path,
+        enable_cache=False,
+    )
+    if not service.is_loaded():
+        print("FAIL: model not loaded")
+        return 1
+
+    explainers = {
+        "text space": PerturbationExplainer(
+            service.explainer, max_features=settings.perturbation_max_features
+        ),
+    }
+    explainers["text space"].token_space = False
+    if _TokenSpace.supports(service.tfidf):
+        explainers["token space"] = PerturbationExplainer(
+            service.explainer, max_features=settings.perturbation_max_features
+        )
+        for text in SAMPLE_ARTICLES:
+            if not _check_token_space(service, text):
+                print(f"FAIL: token-space rows differ from transform on {text[:60]!r}")
+                return 1
+        print(f"Parity: token-space rows match transform on {len(SAMPLE_ARTICLES)} texts")
+    else:
+        print("Vectorizer does not support the token space; timing the text space only")
+
+    for name, explainer in explainers.items():
+        for text in SAMPLE_ARTICLES:
+            if explainer.explain(text, seed=7) != explainer.explain(text, seed=7):
+                print(f"FAIL: {name} explanation is not deterministic")
+                return 1
+    print("Determinism: identical explanations for a fixed seed")
+
+    prediction_ms = _time_prediction(service)
+    print(f"{'prediction':>12}: {prediction_ms:8.2f} ms/text")
+    for name, explainer in explainers.items():
+        for budget in BUDGETS:
+            ms = _time(explainer, SAMPLE_ARTICLES, budget)
+            print(f"{name:>12}: {budget:>5} samples  {ms:8.1f} ms/explanation  "
+                  f"({ms / prediction_ms:6.0f}x a prediction)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
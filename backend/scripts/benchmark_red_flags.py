@@ -0,0 +1,84 @@
+"""
+Parity check and lexicon-size benchmark for the red-flag detector.
+
+Compares ``RedFlagDetector.scan`` with the per-phrase substring checks it
+replaced on the sample corpus, then times scans against lexicons of
+growing size to show that latency does not grow with the phrase count.
+Exits with status 1 if the flags or match offsets disagree.
+
+Usage:
+    python scripts/benchmark_red_flags.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.red_flags import DEFAULT_CLICKBAIT_PHRASES, RedFlagDetector
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+
+def _substring_flags(text: str):
+    """The original per-phrase implementation."""
+    red_flags = []
+    if text.count("!") > 2:
+        red_flags.append("Excessive exclamation marks (sensationalism)")
+    if text.isupper() and len(text) > 20:
+        red_flags.append("Text in ALL CAPS (aggressive formatting)")
+    if any(word in text.lower() for word in DEFAULT_CLICKBAIT_PHRASES):
+        red_flags.append("Contains clickbait trigger words")
+    return red_flags
+
+
+def main() -> int:
+    """Run the parity check and benchmark."""
+    detector = RedFlagDetector()
+    corpus = SAMPLE_ARTICLES + ["BREAKING NEWS THAT EVERYONE MUST READ RIGHT NOW"]
+
+    for text in corpus:
+        report = detector.scan(text)
+        lowered = text.lower()
+        expected = sorted(
+            (i, i + len(phrase), phrase)
+            for phrase in DEFAULT_CLICKBAIT_PHRASES
+            for i in range(len(text))
+            if lowered.startswith(phrase, i)
+        )
+        if report.flags != _substring_flags(text) or sorted(report.matches) != expected:
+            print(f"FAIL: detector disagrees on {text[:60]!r}")
+            return 1
+    print(f"Parity: flags and offsets match on {len(corpus)} texts")
+
+    rng = random.Random(42)
+    words = sorted({word.strip(".,:!").lower() for text in SAMPLE_ARTICLES for word in text.split()})
+    document = " ".join(SAMPLE_ARTICLES)
+    repeat = 50
+
+    for size in (10, 100, 1000, 10000):
+        phrases = DEFAULT_CLICKBAIT_PHRASES + [
+            " ".join(rng.sample(words, rng.randint(2, 4))) for _ in range(size)
+        ]
+        sized = RedFlagDetector(phrases)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            sized.scan(document)
+        scan_us = (time.perf_counter() - start) / repeat * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            lowered = document.lower()
+            [phrase for phrase in phrases if phrase in lowered]
+        substring_us = (time.perf_counter() - start) / repeat * 1e6
+
+        print(f"{len(sized.automaton):6d} phrases: automaton {scan_us:9.1f} us/doc, "
+              f"substring scan {substring_us:9.1f} us/doc")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Parity check and throughput benchmark for the batch sentiment engine.
+
+Compares ``SentimentEngine.score_many`` with ``TextBlob(text).sentiment``
+on the sample corpus plus randomly assembled lexicon sentences and
+reports documents per second for both. Exits with status 1 if any result
+differs by more than ``TEXTBLOB_TOLERANCE``.
+
+Usage:
+    python scripts/benchmark_sentiment.py [n_random_docs]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from textblob import TextBlob
+
+from services.sentiment_engine import TEXTBLOB_TOLERANCE, SentimentEngine
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+# Tokens that exercise negation, modifiers, punctuation and abbreviations
+EXTRA_TOKENS = [
+    "not", "never", "no", "very", "really", "extremely", "the", "a", "is",
+    "!", "...", "U.S.", "(!)", "don't", "isn't", "it's", ":)", ":-(", "Mr.",
+    "e.g.", '"quoted"', "well-known", "$4.2", "(great)", "bad!!", "I'm",
+    "great:)", "terrible:)", "bad:(", "ok:-)", "sad:'(",
+]
+
+
+def main(n_random_docs: int = 2000) -> int:
+    """Run the parity check and benchmark."""
+    engine = SentimentEngine()
+
+    rng = random.Random(42)
+    vocabulary = sorted(engine.lexicon)[:5000] + EXTRA_TOKENS
+    docs = list(SAMPLE_ARTICLES) + [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 200)))
+        for _ in range(n_random_docs)
+    ]
+
+    start = time.perf_counter()
+    expected = [TextBlob(doc).sentiment for doc in docs]
+    textblob_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = engine.score_many(docs)
+    engine_seconds = time.perf_counter() - start
+
+    max_diff = max(
+        max(abs(e[0] - a[0]), abs(e[1] - a[1]))
+        for e, a in zip(expected, actual)
+    )
+    print(f"Parity: max |delta| = {max_diff:.2e} over {len(docs)} docs "
+          f"(tolerance {TEXTBLOB_TOLERANCE})")
+
+    print(f"TextBlob per document: {len(docs) / textblob_seconds:10.0f} docs/s")
+    print(f"SentimentEngine batch: {len(docs) / engine_seconds:10.0f} docs/s")
+    print(f"speedup:               {textblob_seconds / engine_seconds:10.1f}x")
+
+    if max_diff > TEXTBLOB_TOLERANCE:
+        print("FAIL: sentiment engine differs from TextBlob beyond tolerance")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -0,0 +1,141 @@
+"""
+Balance and key movement of the consistent-hash ring, plus a live check.
+
+Offline: hashes 100k cache-style keys onto rings of 2-8 nodes and reports
+how evenly they spread (largest node share against the ideal 1/N) and
+how many keys move when one node is added, against modulo hashing. The
+ring must move at most 1.5x the ideal 1/(N+1) of the keys and never move
+a key between two existing nodes.
+
+Live (when Redis URLs are given): writes keys through a sharded
+``CacheManager`` and a sharded ``RateLimitStore``, checks that every key
+landed on the node the ring picked, then adds an unreachable node and
+checks that health-aware routing skips it. To run several nodes locally:
+
+    for port in 6380 6381 6382; do
+        redis-server --port $port --save "" --appendonly no --daemonize yes
+    done
+    python scripts/benchmark_sharding.py redis://localhost:6380 redis://localhost:6381 redis://localhost:6382
+
+Exits with status 1 if any check fails.
+
+Usage:
+    python scripts/benchmark_sharding.py [redis_url ...]
+"""
+
+import asyncio
+import hashlib
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cache import CacheManager, HashRing, RedisBackend, ShardedRedisBackend
+from middleware.rate_limiter import RateLimitStore
+
+KEYS = [f"analysis:g0:v2:{hashlib.sha256(str(i).encode()).hexdigest()}" for i in range(100_000)]
+
+# Nothing listens on port 1
+UNREACHABLE = "redis://127.0.0.1:1/0"
+
+
+def _modulo_node(key: str, nodes) -> str:
+    """Node of a key under plain modulo hashing."""
+    digest = int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+    return nodes[digest % len(nodes)]
+
+
+def check_ring() -> bool:
+    """Run the offline checks; returns False on failure."""
+    ok = True
+    for count in range(2, 9):
+        nodes = [f"redis://node{i}:6379" for i in range(count)]
+        ring = HashRing(nodes)
+        start = time.perf_counter()
+        before = [ring.node_for(key) for key in KEYS]
+        lookup_us = (time.perf_counter() - start) / len(KEYS) * 1e6
+
+        largest = max(Counter(before).values()) / len(KEYS)
+        ring.add_node(f"redis://node{count}:6379")
+        after = [ring.node_for(key) for key in KEYS]
+        moved = sum(1 for old, new in zip(before, after) if old != new) / len(KEYS)
+        between_old = sum(1 for old, new in zip(before, after) if old != new and new in nodes)
+
+        grown = nodes + [f"redis://node{count}:6379"]
+        modulo_moved = sum(
+            1 for key in KEYS if _modulo_node(key, nodes) != _modulo_node(key, grown)
+        ) / len(KEYS)
+
+        ideal = 1 / (count + 1)
+        print(f"{count} nodes: largest share {largest:.3f} (ideal {1 / count:.3f}), "
+              f"adding one moves {moved:.3f} (ideal {ideal:.3f}, modulo {modulo_moved:.3f}), "
+              f"{lookup_us:.1f} us/lookup")
+        if moved > 1.5 * ideal or between_old:
+            print(f"FAIL: {count} -> {count + 1} nodes moved {moved:.3f} of the keys, "
+                  f"{between_old} between existing nodes")
+            ok = False
+    return ok
+
+
+async def check_live(urls) -> bool:
+    """Run the checks against live Redis nodes; returns False on failure."""
+    keys = KEYS[:500]
+    backend = ShardedRedisBackend(urls, retry_interval=30)
+    cache = CacheManager("redis://unused", ttl_jitter=0.0, backend=backend)
+    store = RateLimitStore(redis_urls=urls, retry_interval=30)
+    direct = {url: RedisBackend(url) for url in urls}
+    try:
+        await cache.set_many({key: i for i, key in enumerate(keys)}, ttl=60)
+        if await cache.get_many(keys) != list(range(len(keys))):
+            print("FAIL: sharded cache returned different values")
+            return False
+
+        for key in keys:
+            value, _ = (await direct[backend.ring.node_for(key)].get_many([key]))[0]
+            if value is None:
+                print(f"FAIL: {key} is not on the node the ring picked")
+                return False
+        spread = Counter(backend.ring.node_for(key) for key in keys)
+        print(f"live: {len(keys)} keys over {len(urls)} nodes, largest share "
+              f"{max(spread.values()) / len(keys):.3f}")
+
+        for _ in range(3):
+            count, _, _ = await store.increment("ratelimit:bench", 60, 100)
+        if count != 3:
+            print(f"FAIL: sharded rate limiter counted {count} of 3 requests")
+            return False
+
+        # An unreachable node is skipped after its first failure
+        backend.ring.add_node(UNREACHABLE)
+        backend.shards[UNREACHABLE] = RedisBackend(UNREACHABLE)
+        await cache.set_many({key: i for i, key in enumerate(keys)}, ttl=60)
+        if await cache.get_many(keys) != list(range(len(keys))):
+            print("FAIL: health-aware routing lost values with a node down")
+            return False
+        if backend.ring.get_stats()["down"] != [UNREACHABLE]:
+            print("FAIL: the unreachable node was not marked down")
+            return False
+        print("live: unreachable node skipped, all values served")
+        return True
+    finally:
+        await cache.delete_many(keys)
+        await cache.disconnect()
+        await store.close()
+        for client in direct.values():
+            await client.close()
+
+
+def main(*redis_urls: str) -> int:
+    """Run the checks."""
+    if not check_ring():
+        return 1
+    if redis_urls and not asyncio.run(check_live(list(redis_urls))):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
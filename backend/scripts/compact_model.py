@@ -0,0 +1,97 @@
+"""
+Compact a model version and deploy it through the model manager.
+
+Drops terms whose coefficient is below ``threshold``, casts the weights to
+float32, evaluates the result against the base version and deploys it as
+a new (inactive) version whose metadata in ``models/versions.json`` holds
+the term counts, agreement, accuracy delta, latency and load RSS. Activate
+it with ``ModelManager.set_active_version`` and go back with
+``ModelManager.rollback`` if accuracy drops.
+
+The evaluation file is optional; each line is ``<label>\\t<text>`` with
+the model's class labels. Without it the sample corpus is used and only
+agreement with the base version is reported.
+
+Usage:
+    python scripts/compact_model.py version [threshold] [base_version] [eval_file]
+
+If no version is registered yet, the configured ``MODEL_PATH``/``TFIDF_PATH``
+pickles are registered as ``base`` first.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import get_settings
+from ml.compaction import DEFAULT_THRESHOLD, deploy_compact_version
+from ml.model_manager import get_model_manager
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+
+def _read_eval_file(path: str):
+    """Read ``<label>\\t<text>`` lines into (texts, labels)."""
+    texts, labels = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            label, text = line.rstrip("\n").split("\t", 1)
+            labels.append(int(label) if label.lstrip("-").isdigit() else label)
+            texts.append(text)
+    return texts, labels
+
+
+def main(
+    version: str = None,
+    threshold: str = None,
+    base_version: str = None,
+    eval_file: str = None,
+) -> int:
+    """Compact, evaluate and deploy."""
+    if not version:
+        print(__doc__)
+        return 1
+
+    manager = get_model_manager()
+    if not manager.versions:
+        settings = get_settings()
+        manager.register_version("base", settings.model_path, settings.tfidf_path, set_active=True)
+        print(f"Registered {settings.model_path} as version base")
+
+    if eval_file:
+        texts, labels = _read_eval_file(eval_file)
+    else:
+        texts, labels = list(SAMPLE_ARTICLES), None
+
+    try:
+        model_version = deploy_compact_version(
+            manager,
+            version,
+            base_version=base_version,
+            threshold=float(threshold) if threshold else DEFAULT_THRESHOLD,
+            texts=texts,
+            labels=labels,
+        )
+    except ValueError as e:
+        print(f"FAIL: {e}")
+        return 1
+
+    report = model_version.metadata["compaction"]
+    print(f"Deployed {version} (from {model_version.metadata['compacted_from']}, inactive)")
+    print(f"terms:      {report['terms_before']:>10,} -> {report['terms_after']:,}")
+    print(f"agreement:  {report['agreement']:10.4f}  (max probability diff {report['max_probability_diff']:.4f})")
+    if report["accuracy_delta"] is not None:
+        print(f"accuracy:   {report['accuracy']:10.4f} -> {report['compact_accuracy']:.4f} "
+              f"({report['accuracy_delta']:+.4f})")
+    print(f"latency:    {report['latency_ms']:10.3f} -> {report['compact_latency_ms']:.3f} ms/text")
+    if "rss_bytes" in report:
+        print(f"load RSS:   {report['rss_bytes'] / 1e6:10.1f} -> {report['compact_rss_bytes'] / 1e6:.1f} MB")
+        print(f"file size:  {report['file_bytes'] / 1e6:10.1f} -> {report['compact_file_bytes'] / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:5]))
@@ -0,0 +1,169 @@
+"""
+Cold-start budget check: import cost per module and time to first request.
+
+1. Imports ``main`` in a fresh interpreter under ``python -X importtime``
+   and reports the cumulative cost of each module ``main`` pulls in
+   directly, plus the heaviest third-party packages.
+2. Starts the app with uvicorn in a fresh process and measures the time
+   until ``/health`` first answers.
+
+Exits with status 1 if either exceeds its budget
+(``settings.import_budget_ms`` / ``settings.first_request_budget_ms``).
+
+Usage:
+    python scripts/import_budget.py [import_budget_ms] [first_request_budget_ms]
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(BACKEND_DIR))
+
+from config.settings import get_settings
+
+# How many of the heaviest packages to list
+TOP_PACKAGES = 10
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, str, float]]:
+    """Parse ``-X importtime`` output into (depth, module, cumulative ms)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # One separator space, then two spaces per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+    return entries
+
+
+def measure_imports(module: str = "main") -> Tuple[float, Dict[str, float], Dict[str, float]]:
+    """
+    Import a module in a fresh interpreter and collect import times.
+
+    Returns:
+        Tuple of (total ms, direct dependency ms, third-party package ms)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = _parse_importtime(result.stderr)
+    total = next(ms for depth, name, ms in entries if name == module and depth == 0)
+
+    # Entries are printed children-first, so the direct dependencies of
+    # the module are the depth-1 entries right before it.
+    direct: Dict[str, float] = {}
+    packages: Dict[str, float] = {}
+    for depth, name, ms in entries:
+        if depth == 1:
+            direct[name] = ms
+        elif depth == 0:
+            if name == module:
+                break
+            direct.clear()
+
+    for depth, name, ms in entries:
+        top = name.split(".")[0]
+        first_party = (BACKEND_DIR / top).is_dir() or (BACKEND_DIR / f"{top}.py").exists()
+        if name == top and not first_party:
+            packages[top] = max(packages.get(top, 0.0), ms)
+
+    return total, direct, packages
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(timeout: float) -> float:
+    """
+    Start the app and return milliseconds until ``/health`` answers.
+
+    Args:
+        timeout: Seconds to wait before giving up
+
+    Returns:
+        Time to first request in ms (``inf`` if it never answered)
+    """
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=dict(os.environ),
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.02)
+        return float("inf")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(import_budget_ms: float = None, first_request_budget_ms: float = None) -> int:
+    """Run both measurements and compare them with the budgets."""
+    settings = get_settings()
+    import_budget_ms = float(import_budget_ms or settings.import_budget_ms)
+    first_request_budget_ms = float(first_request_budget_ms or settings.first_request_budget_ms)
+
+    total, direct, packages = measure_imports()
+
+    print("Direct imports of main (cumulative):")
+    for name, ms in sorted(direct.items(), key=lambda item: -item[1]):
+        print(f"  {ms:8.1f} ms  {name}")
+
+    print("Heaviest third-party packages:")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:TOP_PACKAGES]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    print(f"import main:          {total:8.1f} ms (budget {import_budget_ms:.0f} ms)")
+
+    first_request = measure_first_request(timeout=max(first_request_budget_ms / 1000 * 3, 30))
+    print(f"time to first request: {first_request:8.1f} ms (budget {first_request_budget_ms:.0f} ms)")
+
+    failed = False
+    if total > import_budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if first_request > first_request_budget_ms:
+        print("FAIL: time to first request over budget")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
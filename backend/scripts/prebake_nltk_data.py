@@ -0,0 +1,46 @@
+"""
+Download the NLTK data the service needs into the pre-baked data directory.
+
+Run this at image build time (see the Dockerfile) so that no process ever
+calls ``nltk.download`` at runtime. The target directory defaults to
+``settings.nltk_data_dir``.
+
+Usage:
+    python scripts/prebake_nltk_data.py [target_dir]
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import nltk
+
+from config.settings import get_settings
+
+# Keep in sync with services.text_features.NLTK_RESOURCES
+NLTK_PACKAGES = ["punkt_tab", "stopwords"]
+
+
+def main(target_dir: str = None) -> int:
+    """Download each package; exit non-zero if any download fails."""
+    target = Path(target_dir or get_settings().nltk_data_dir).resolve()
+    target.mkdir(parents=True, exist_ok=True)
+
+    failed = [
+        package
+        for package in NLTK_PACKAGES
+        if not nltk.download(package, download_dir=str(target), quiet=True, raise_on_error=False)
+    ]
+
+    if failed:
+        print(f"FAIL: could not download {', '.join(failed)} into {target}")
+        return 1
+
+    print(f"NLTK data ready in {target}: {', '.join(NLTK_PACKAGES)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
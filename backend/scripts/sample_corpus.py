@@ -0,0 +1,70 @@
+"""
+Fixed sample corpus for benchmarks and parity checks.
+
+The texts cover the kinds of input the analyzer sees in production:
+wire-style reporting, opinion pieces, clickbait and very short snippets.
+"""
+
+SAMPLE_ARTICLES = [
+    "The Federal Reserve held interest rates steady on Wednesday, saying inflation "
+    "had eased over the past year but remained above its 2 percent target. Officials "
+    "signalled that cuts could come later this year if the labour market continues to cool.",
+
+    "Officials in the city council voted 7-2 on Tuesday to approve a new budget that "
+    "increases funding for public transport and road maintenance, according to minutes "
+    "published after the meeting.",
+
+    "Scientists at the university published the results of a three-year clinical trial "
+    "in a peer-reviewed journal, reporting that the new treatment reduced hospital "
+    "admissions by 18 percent compared with a placebo group.",
+
+    "SHOCKING: Doctors don't want you to know this one secret trick that cures "
+    "everything!!! Share this before it gets censored!!!",
+
+    "You won't believe what this celebrity said about the government. The truth they "
+    "don't want you to know is finally out. Urgent: share this now!",
+
+    "The company reported quarterly revenue of $4.2 billion, up 6 percent from a year "
+    "earlier, beating analyst expectations. Shares rose 3 percent in after-hours trading.",
+
+    "Heavy rain caused flooding across the region on Sunday, forcing hundreds of "
+    "residents to leave their homes. Emergency services said no injuries had been reported.",
+
+    "BREAKING!!! Secret documents PROVE the election was stolen and the media is "
+    "hiding it from you. Wake up people!!!",
+
+    "The prime minister met European leaders in Brussels to discuss trade, energy "
+    "security and migration, a spokesperson said in a statement released on Thursday.",
+
+    "In my opinion this is the most disgraceful, outrageous and frankly pathetic "
+    "decision any leader has ever made. It is absolutely terrible and everyone knows it.",
+
+    "A new study suggests that drinking coffee in moderation is associated with a "
+    "slightly lower risk of heart disease, though researchers cautioned that the "
+    "findings do not prove cause and effect.",
+
+    "Miracle weight loss pill melts fat overnight, experts stunned. Big pharma is "
+    "furious about this cheap natural remedy.",
+
+    "The football club confirmed on Friday that its captain will miss the rest of the "
+    "season after suffering a knee injury in training.",
+
+    "Police arrested two men on Saturday in connection with a robbery at a jewellery "
+    "store in the city centre, a police statement said.",
+
+    "Aliens have been living among us for decades and the government has covered it "
+    "up. Insiders reveal the shocking truth.",
+
+    "The central bank said it would continue to monitor market conditions closely.",
+
+    "Local schools will reopen next week after repairs to heating systems were "
+    "completed ahead of schedule, the education department said.",
+
+    "Vaccines contain microchips used to track your every move, a viral post claims "
+    "without providing any evidence.",
+
+    "Exports fell 2.1 percent in March from a year earlier, customs data showed, as "
+    "weaker demand from major trading partners weighed on manufacturers.",
+
+    "Breaking news: short update.",
+]
@@ -9,8 +9,6 @@ from .analysis_service import (
     AnalysisService,
     get_analysis_service,
     analyze_news,
-    TextStatsExtractor,
-    clean_for_tfidf,
 )
 
 __all__ = [
@@ -20,3 +18,11 @@ __all__ = [
     "TextStatsExtractor",
     "clean_for_tfidf",
 ]
+
+
+def __getattr__(name: str):
+    """Import the sklearn/nltk-backed text helpers only when first used."""
+    if name in ("TextStatsExtractor", "clean_for_tfidf"):
+        from . import text_features
+        return getattr(text_features, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,335 @@
+"""
+Structured analysis result.
+
+``AnalysisResult`` is what the analysis pipeline produces, what the result
+cache stores and what crosses the inference-executor process boundary. It
+only holds the verdict, the two class probabilities and the explanation;
+the styled HTML card shown by the web UI is rendered from it on demand
+(``render_html``) with templates that are compiled once at import time.
+"""
+
+from string import Template
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Legacy (verdict_title, html_output, probability_dict) tuple
+ResultTuple = Tuple[str, str, Dict[str, float]]
+
+# Long-document chunk: (start, end, score_real, score_fake)
+ChunkScore = Tuple[int, int, float, float]
+
+# Red-flag phrase match: (start, end, phrase), offsets into the analyzed text
+PhraseMatch = Tuple[int, int, str]
+
+# Bumped whenever the cached dict layout changes
+CACHE_FORMAT_VERSION = 2
+
+REAL_TITLE = "✅ AUTHENTIC NEWS"
+FAKE_TITLE = "⚠️ QUESTIONABLE CONTENT"
+
+# Cascade paths: "fast" results skipped the expensive stages (fact check,
+# sentiment-based explanation); "full" results went through all of them
+FAST_PATH = "fast"
+FULL_PATH = "full"
+
+# Per-verdict presentation
+_VERDICT_STYLES = {
+    True: {
+        "color": "#10b981",
+        "gradient": "linear-gradient(135deg, #10b981 0%, #059669 100%)",
+        "sub_msg": "Reliable content detected",
+        "icon": "✓",
+        "title": REAL_TITLE,
+    },
+    False: {
+        "color": "#ef4444",
+        "gradient": "linear-gradient(135deg, #ef4444 0%, #dc2626 100%)",
+        "sub_msg": "Suspicious patterns detected",
+        "icon": "⚠",
+        "title": FAKE_TITLE,
+    },
+}
+
+_HEADER_TEMPLATE = Template("""
+        <div style="background: $gradient; padding: 2rem; border-radius: 16px; color: white; text-align: center; box-shadow: 0 10px 30px rgba(0,0,0,0.3); margin-bottom: 1.5rem;">
+            <div style="font-size: 3rem; margin-bottom: 0.5rem;">$icon</div>
+            <h2 style="margin:0; font-size: 1.75rem; font-weight: 700; color: white;">$title</h2>
+            <p style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.95;">$sub_msg</p>
+            <div style="margin-top: 1rem; font-size: 2.5rem; font-weight: 700;">
+                $confidence%
+            </div>
+            <p style="font-size: 0.875rem; opacity: 0.9; margin-top: 0.25rem;">Confidence Score</p>
+            $status_msg
+        </div>
+
+        <div style="background: #2d2d2d; border-radius: 16px; padding: 1.5rem; border: 1px solid #3d3d3d;">
+            <h3 style="margin-top: 0; color: #e5e5e5; font-size: 1.25rem; font-weight: 600; margin-bottom: 1rem;">
+                🔍 Analysis Details
+            </h3>
+            <div style="background: #1a1a1a; border-radius: 12px; padding: 1.25rem; border: 1px solid #3d3d3d;">
+        """)
+
+_REASON_TEMPLATE = Template("""
+            <div style="margin-bottom: 1rem; padding: 0.75rem; background: #2d2d2d; border-radius: 8px; border-left: 3px solid $color;">
+                <span style="font-weight: 600; color: $color;">#$index</span>
+                <span style="margin-left: 0.5rem; color: #b5b5b5;">$reason</span>
+            </div>
+            """)
+
+_FACT_CHECK_TEMPLATE = Template("""
+            <div style="margin-top: 1rem; padding: 1rem; background: #3d2d1a; border-radius: 8px; border-left: 3px solid #f59e0b; border: 1px solid #4d3d2a;">
+                <span style="font-weight: 600; color: #fbbf24;">🔍 External Verification:</span>
+                <span style="margin-left: 0.5rem; color: #d4a574;">$fact_check</span>
+            </div>
+            """)
+
+_FOOTER = "</div></div>"
+
+# Verdict-independent parts are substituted once, per verdict
+_HEADER_BY_VERDICT = {
+    is_real: Template(_HEADER_TEMPLATE.safe_substitute(style))
+    for is_real, style in _VERDICT_STYLES.items()
+}
+_REASON_BY_VERDICT = {
+    is_real: Template(_REASON_TEMPLATE.safe_substitute(color=style["color"]))
+    for is_real, style in _VERDICT_STYLES.items()
+}
+
+
+class AnalysisResult:
+    """
+    Outcome of analyzing one text.
+
+    Successful results carry the verdict, probabilities and explanation;
+    error results carry a title and a message and no probabilities.
+    """
+
+    __slots__ = (
+        "title",
+        "is_real",
+        "score_real",
+        "score_fake",
+        "reasons",
+        "fact_check",
+        "status_msg",
+        "chunks",
+        "truncated",
+        "red_flag_matches",
+        "path",
+        "similarity",
+        "error",
+        "error_styled",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        is_real: bool = False,
+        score_real: float = 0.0,
+        score_fake: float = 0.0,
+        reasons: Sequence[str] = (),
+        fact_check: Optional[str] = None,
+        status_msg: str = "",
+        chunks: Optional[Sequence[ChunkScore]] = None,
+        truncated: bool = False,
+        red_flag_matches: Sequence[PhraseMatch] = (),
+        path: str = FULL_PATH,
+        similarity: Optional[float] = None,
+        error: Optional[str] = None,
+        error_styled: bool = True,
+    ):
+        """
+        Initialize result.
+
+        Args:
+            title: Verdict title shown to users
+            is_real: Final verdict
+            score_real: Probability of the real class
+            score_fake: Probability of the fake class
+            reasons: Explanation lines
+            fact_check: External fact-check summary, if any
+            status_msg: Optional status line (e.g. scraped URL)
+            chunks: Per-chunk scores when the text was scored in chunks
+            truncated: Whether text past the last chunk was not analyzed
+            red_flag_matches: Clickbait phrases found, with their offsets
+                into the analyzed text
+            path: Cascade path the analysis took (``FAST_PATH`` or ``FULL_PATH``)
+            similarity: Set when the result was reused from a near-duplicate
+                text: estimated similarity to that text (not cached)
+            error: Error message; set only for failed analyses
+            error_styled: Whether the error is rendered as a red block
+        """
+        self.title = title
+        self.is_real = is_real
+        self.score_real = score_real
+        self.score_fake = score_fake
+        self.reasons = tuple(reasons)
+        self.fact_check = fact_check
+        self.status_msg = status_msg
+        self.chunks = tuple(tuple(chunk) for chunk in chunks) if chunks is not None else None
+        self.truncated = truncated
+        self.red_flag_matches = tuple(tuple(match) for match in red_flag_matches)
+        self.path = path
+        self.similarity = similarity
+        self.error = error
+        self.error_styled = error_styled
+
+    @classmethod
+    def failure(cls, title: str, message: str, styled: bool = True) -> "AnalysisResult":
+        """
+        Build an error result.
+
+        Args:
+            title: Verdict title (e.g. "⚠️ URL Error")
+            message: Message shown to the user
+            styled: Whether the message is rendered as a red block
+
+        Returns:
+            AnalysisResult without probabilities
+        """
+        return cls(title, error=message, error_styled=styled)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the analysis produced a verdict."""
+        return self.error is None
+
+    @property
+    def probabilities(self) -> Dict[str, float]:
+        """Class probabilities keyed by label (empty for errors)."""
+        if not self.ok:
+            return {}
+        return {
+            "Real News": float(self.score_real),
+            "Fake News": float(self.score_fake),
+        }
+
+    @property
+    def confidence(self) -> float:
+        """Highest class probability in percent (0.0 for errors)."""
+        if not self.ok:
+            return 0.0
+        return max(self.score_real, self.score_fake) * 100
+
+    @property
+    def verdict_confidence(self) -> float:
+        """Probability of the reported verdict in percent."""
+        return (self.score_real if self.is_real else self.score_fake) * 100
+
+    def chunk_scores(self) -> Optional[List[Dict]]:
+        """Per-chunk scores for API responses (None unless chunked)."""
+        if self.chunks is None:
+            return None
+        return [
+            {"start": start, "end": end, "score_real": score_real, "score_fake": score_fake}
+            for start, end, score_real, score_fake in self.chunks
+        ]
+
+    def red_flag_match_list(self) -> List[Dict]:
+        """Red-flag phrase matches for API responses, for highlighting."""
+        return [
+            {"phrase": phrase, "start": start, "end": end}
+            for start, end, phrase in self.red_flag_matches
+        ]
+
+    def render_html(self) -> str:
+        """Render the result card shown by the web UI."""
+        if not self.ok:
+            if self.error_styled:
+                return f"<div style='color:red'>{self.error}</div>"
+            return self.error
+
+        reason_template = _REASON_BY_VERDICT[self.is_real]
+        parts = [
+            _HEADER_BY_VERDICT[self.is_real].substitute(
+                confidence=f"{self.verdict_confidence:.1f}",
+                status_msg=self.status_msg,
+            )
+        ]
+        parts.extend(
+            reason_template.substitute(index=i, reason=reason)
+            for i, reason in enumerate(self.reasons, 1)
+        )
+        if self.fact_check:
+            parts.append(_FACT_CHECK_TEMPLATE.substitute(fact_check=self.fact_check))
+        parts.append(_FOOTER)
+
+        return "".join(parts)
+
+    def to_tuple(self) -> ResultTuple:
+        """Convert to the legacy (verdict_title, html_output, probability_dict) tuple."""
+        return (self.title, self.render_html(), self.probabilities)
+
+    def to_dict(self) -> Dict:
+        """
+        Convert to the compact dictionary stored in the result cache.
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        if not self.ok:
+            return {
+                "v": CACHE_FORMAT_VERSION,
+                "title": self.title,
+                "error": self.error,
+                "styled": self.error_styled,
+            }
+
+        data = {
+            "v": CACHE_FORMAT_VERSION,
+            "title": self.title,
+            "real": self.is_real,
+            "p": [self.score_real, self.score_fake],
+            "reasons": list(self.reasons),
+        }
+        if self.fact_check:
+            data["fact_check"] = self.fact_check
+        if self.status_msg:
+            data["status"] = self.status_msg
+        if self.chunks is not None:
+            data["chunks"] = [list(chunk) for chunk in self.chunks]
+            data["truncated"] = self.truncated
+        if self.red_flag_matches:
+            data["flags"] = [list(match) for match in self.red_flag_matches]
+        if self.path != FULL_PATH:
+            data["path"] = self.path
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional["AnalysisResult"]:
+        """
+        Rebuild a result from ``to_dict`` output.
+
+        Args:
+            data: Cached dictionary
+
+        Returns:
+            AnalysisResult, or None if the layout is not recognized
+        """
+        if not isinstance(data, dict) or data.get("v") != CACHE_FORMAT_VERSION:
+            return None
+
+        if "error" in data:
+            return cls.failure(data["title"], data["error"], data.get("styled", True))
+
+        score_real, score_fake = data["p"]
+        return cls(
+            title=data["title"],
+            is_real=data["real"],
+            score_real=score_real,
+            score_fake=score_fake,
+            reasons=data.get("reasons", ()),
+            fact_check=data.get("fact_check"),
+            status_msg=data.get("status", ""),
+            chunks=data.get("chunks"),
+            truncated=data.get("truncated", False),
+            red_flag_matches=data.get("flags", ()),
+            path=data.get("path", FULL_PATH),
+        )
+
+    def __repr__(self) -> str:
+        if not self.ok:
+            return f"AnalysisResult(title={self.title!r}, error={self.error!r})"
+        return (
+            f"AnalysisResult(title={self.title!r}, "
+            f"score_real={self.score_real:.3f}, score_fake={self.score_fake:.3f})"
+        )
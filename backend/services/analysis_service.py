@@ -7,112 +7,55 @@ consolidating logic from app.py and model_runtime.py into a clean service layer.
 
 import os
 import re
-import string
 import pickle
-import requests
-import numpy as np
 import hashlib
-from typing import Tuple, Dict, List, Optional
+from typing import TYPE_CHECKING, Tuple, Dict, List, Optional
 from pathlib import Path
 import logging
 
-import nltk
-from bs4 import BeautifulSoup
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
-from textblob import TextBlob
-from sklearn.base import BaseEstimator, TransformerMixin
+from cache import NearDuplicateIndex, get_cache_manager, serialization
+from config.settings import get_settings
+from monitoring.metrics import analysis_cache_lookups, analysis_path
+from .analysis_result import (
+    FAKE_TITLE,
+    FAST_PATH,
+    FULL_PATH,
+    REAL_TITLE,
+    AnalysisResult,
+    ChunkScore,
+    ResultTuple,
+)
+from .chunking import DocumentChunker, Span, aggregate_chunk_scores
+from .inference_batcher import InferenceBatcher
+from .red_flags import RedFlagReport, get_red_flag_detector
+from .sentiment_engine import Sentiment, get_sentiment_engine
 
-from cache import get_cache_manager
+# Heavy dependencies (numpy/scipy/sklearn, nltk, bs4, requests) are imported
+# where they are first used so that importing this module stays cheap.
+if TYPE_CHECKING:
+    from ml.explainability import ExplainabilityEngine
+    from ml.fast_scorer import CompiledLinearScorer
+    from ml.perturbation import PerturbationExplainer
+    from .inference_executor import InferenceExecutor
 
 logger = logging.getLogger(__name__)
 
-# Initialize NLTK resources
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# Names that now live in text_features (imported lazily, see __getattr__)
+_TEXT_FEATURE_NAMES = ("TextStatsExtractor", "clean_for_tfidf", "stemmer", "stop_words")
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
 
-# Initialize stemmer and stopwords
-stemmer = PorterStemmer()
-try:
-    from nltk.corpus import stopwords
-    stop_words = set(stopwords.words('english'))
-except Exception:
-    stop_words = set()
-    logger.warning("Failed to load stopwords")
-
-
-class TextStatsExtractor(BaseEstimator, TransformerMixin):
+def __getattr__(name: str):
     """
-    Extracts sentiment and length features from text.
-    
-    This transformer is used in the ML pipeline to extract additional
-    features beyond TF-IDF.
-    """
-    
-    def fit(self, X, y=None):
-        """Fit method (no-op for this transformer)."""
-        return self
+    Resolve text-feature helpers on first access.
     
-    def transform(self, X):
-        """
-        Transform text into statistical features.
-        
-        Args:
-            X: List of text strings
-            
-        Returns:
-            numpy array of shape (n_samples, 4) with features:
-            [length, word_count, sentiment_polarity, sentiment_subjectivity]
-        """
-        features = []
-        for text in X:
-            try:
-                blob = TextBlob(str(text))
-                features.append([
-                    len(str(text)),                 # Length
-                    len(str(text).split()),         # Word Count
-                    blob.sentiment.polarity,        # Sentiment (-1 to 1)
-                    blob.sentiment.subjectivity     # Subjectivity (0 to 1)
-                ])
-            except Exception:
-                features.append([0, 0, 0, 0])
-        return np.array(features)
-
-
-def clean_for_tfidf(text: str) -> str:
-    """
-    Clean text for TF-IDF vectorization.
-    
-    Args:
-        text: Raw text to clean
-        
-    Returns:
-        Cleaned and stemmed text
+    ``TextStatsExtractor`` and ``clean_for_tfidf`` need sklearn and nltk,
+    which together take over a second to import; they are only loaded when
+    something actually uses them.
     """
-    if not isinstance(text, str):
-        return ""
-    
-    # Remove punctuation
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    
-    # Tokenize
-    tokens = word_tokenize(text)
-    
-    # Stem and filter
-    tokens = [
-        stemmer.stem(w) 
-        for w in tokens 
-        if w not in stop_words and len(w) > 2
-    ]
-    
-    return " ".join(tokens)
+    if name in _TEXT_FEATURE_NAMES:
+        from . import text_features
+        return getattr(text_features, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AnalysisService:
@@ -135,6 +78,17 @@ class AnalysisService:
     # Analysis configuration
     MIN_ANALYSIS_LENGTH = 20
     
+    # Bumped when the cached result layout changes
+    CACHE_KEY_VERSION = 2
+    
+    # Cache namespace of analysis results; its generation is bumped (see
+    # CacheManager.invalidate_namespace) when the active model changes
+    CACHE_NAMESPACE = "analysis"
+    
+    # Failures that depend only on the input (or on a page that is unlikely
+    # to change within minutes); cached briefly as negative entries
+    NEGATIVE_CACHE_TITLES = {"⚠️ URL Error", "⚠️ Text Too Short"}
+    
     # Label mappings (adjust based on your model)
     FAKE_LABELS = {1}
     REAL_LABELS = {0}
@@ -146,56 +100,156 @@ class AnalysisService:
         fact_check_api_key: Optional[str] = None,
         enable_cache: bool = True,
         cache_ttl: int = 3600,
+        batch_window_ms: Optional[float] = None,
+        max_batch_size: int = 32,
+        executor: Optional["InferenceExecutor"] = None,
+        load_on_init: bool = True,
+        long_document_chars: int = 4000,
+        chunk_chars: int = 2000,
+        max_chunks: int = 16,
+        perturbation_samples: int = 500,
+        perturbation_max_features: int = 40,
+        perturbation_seed: int = 0,
+        uncertainty_band: Optional[Tuple[float, float]] = None,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+        near_duplicate_min_chars: int = 200,
+        cache_codec: str = "json",
     ):
         """
         Initialize analysis service.
         
         Args:
-            model_path: Path to pickled ML model
+            model_path: Path to pickled ML model or memory-mapped artifact directory
             tfidf_path: Path to pickled TF-IDF vectorizer
             fact_check_api_key: Optional Google Fact Check API key
             enable_cache: Whether to enable result caching
             cache_ttl: Cache TTL in seconds (default: 1 hour)
+            batch_window_ms: Micro-batching window for single-text analyses
+                (None disables batching). With an executor attached, lone
+                cache misses are coalesced into one pool submission
+                instead of one model call.
+            max_batch_size: Maximum texts per batched model call
+            executor: Optional process-pool executor that runs the
+                uncached pipeline off the event loop
+            load_on_init: Whether to load the models in the constructor
+                (the API defers this to the model lifecycle manager)
+            long_document_chars: Texts longer than this are scored in chunks
+            chunk_chars: Maximum characters per chunk
+            max_chunks: Maximum chunks analyzed per document
+            perturbation_samples: Default sample budget of perturbation
+                explanations
+            perturbation_max_features: Maximum words masked per
+                perturbation explanation
+            perturbation_seed: Default perturbation sampling seed
+            uncertainty_band: (low, high) range of the fake-news
+                probability in which a verdict counts as uncertain. Only
+                uncertain verdicts (or callers asking for them) go through
+                the fact check and the full explanation; None runs every
+                analysis through the full pipeline.
+            near_duplicates: Optional fingerprint index; cache misses whose
+                text is a near-duplicate of a recently analyzed one reuse
+                its cached result
+            near_duplicate_min_chars: Texts shorter than this skip the
+                near-duplicate lookup
+            cache_codec: Serializer of cached results ("json", "msgpack"
+                or "pickle"); results cached with another codec are still
+                read
         """
         self.model = None
         self.tfidf = None
+        self.fast_scorer: Optional["CompiledLinearScorer"] = None
+        self.model_version: Optional[str] = None
+        self._explainer: Optional["ExplainabilityEngine"] = None
+        self._perturbation_explainer: Optional["PerturbationExplainer"] = None
+        self.perturbation_samples = perturbation_samples
+        self.perturbation_max_features = perturbation_max_features
+        self.perturbation_seed = perturbation_seed
         self.class_order = []
         self.fact_check_api_key = fact_check_api_key or os.getenv("GOOGLE_FACTCHECK_API_KEY")
         self.enable_cache = enable_cache
         self.cache_ttl = cache_ttl
+        self.cache_codec = cache_codec
+        self.executor = executor
+        self.long_document_chars = long_document_chars
+        self.uncertainty_band = uncertainty_band
+        self.chunker = DocumentChunker(chunk_chars=chunk_chars, max_chunks=max_chunks)
         
         if self.enable_cache:
+            serialization.validate(cache_codec)
             self.cache = get_cache_manager()
         else:
             self.cache = None
+        self.near_duplicates = near_duplicates if self.enable_cache else None
+        self.near_duplicate_min_chars = near_duplicate_min_chars
+        
+        self.batch_window_ms = batch_window_ms
+        self.max_batch_size = max_batch_size
+        if batch_window_ms is not None:
+            self.batcher: Optional[InferenceBatcher] = InferenceBatcher(
+                self._score_texts,
+                window_ms=batch_window_ms,
+                max_batch_size=max_batch_size,
+            )
+        else:
+            self.batcher = None
+        # Micro-batchers in front of the process pool, by ``full``
+        self._executor_batchers: Dict[bool, InferenceBatcher] = {}
         
-        self._load_models(model_path, tfidf_path)
+        if load_on_init:
+            self._load_models(model_path, tfidf_path)
+    
+    def is_loaded(self) -> bool:
+        """Check if the model and vectorizer are loaded."""
+        return self.model is not None and self.tfidf is not None
     
     def _load_models(self, model_path: str, tfidf_path: str):
         """
         Load ML model and TF-IDF vectorizer.
         
         Args:
-            model_path: Path to model file
-            tfidf_path: Path to TF-IDF file
+            model_path: Path to model file, or to a memory-mapped artifact
+                directory (see ``ml.artifacts``)
+            tfidf_path: Path to TF-IDF file (ignored for artifacts)
         """
+        from ml.artifacts import is_artifact_dir, load_artifact
+        from ml.fast_scorer import CompiledLinearScorer
+        
         try:
             logger.info("Loading ML model and TF-IDF vectorizer...")
             
-            with open(model_path, "rb") as f:
-                self.model = pickle.load(f)
-            
-            with open(tfidf_path, "rb") as f:
-                self.tfidf = pickle.load(f)
+            if is_artifact_dir(model_path):
+                # Memory-mapped artifact: weights are shared through the page cache
+                artifact = load_artifact(model_path)
+                self.model = artifact.model
+                self.tfidf = artifact.tfidf
+                self.fast_scorer = artifact.build_scorer()
+            else:
+                with open(model_path, "rb") as f:
+                    self.model = pickle.load(f)
+                
+                with open(tfidf_path, "rb") as f:
+                    self.tfidf = pickle.load(f)
+                
+                # Use the sparse linear fast path when the model supports it
+                self.fast_scorer = CompiledLinearScorer.compile(self.model, self.tfidf)
             
             self.class_order = list(self.model.classes_)
             
+            # Identifies this model for caches keyed by model version
+            self.model_version = f"{model_path}@{os.stat(model_path).st_mtime_ns}"
+            self._explainer = None
+            self._perturbation_explainer = None
+            
             logger.info(f"Successfully loaded model. Classes: {self.class_order}")
         
         except Exception as e:
             logger.error(f"Failed to load models: {e}")
             self.model = None
             self.tfidf = None
+            self.fast_scorer = None
+            self.model_version = None
+            self._explainer = None
+            self._perturbation_explainer = None
             self.class_order = []
     
     async def load_models_async(self, model_path: str, tfidf_path: str):
@@ -234,6 +288,9 @@ class AnalysisService:
         Returns:
             Tuple of (extracted_text, status_message)
         """
+        import requests
+        from bs4 import BeautifulSoup
+        
         try:
             # Validate URL scheme
             if not any(url.lower().startswith(f"{s}://") for s in self.ALLOWED_SCHEMES):
@@ -283,6 +340,8 @@ class AnalysisService:
         if not self.fact_check_api_key:
             return None
         
+        import requests
+        
         try:
             # Clean query
             clean_query = re.sub(r"[^\w\s]", "", query[:200])
@@ -308,6 +367,18 @@ class AnalysisService:
             logger.warning(f"Fact check API error: {e}")
             return None
     
+    def scan_red_flags(self, text: str) -> RedFlagReport:
+        """
+        Scan text for clickbait phrases and sensationalist formatting.
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            RedFlagReport with the flags and the phrase matches
+        """
+        return get_red_flag_detector().scan(text)
+    
     def detect_red_flags(self, text: str) -> List[str]:
         """
         Detect suspicious patterns in text.
@@ -318,25 +389,25 @@ class AnalysisService:
         Returns:
             List of detected red flags
         """
-        red_flags = []
-        
-        # Excessive exclamation marks
-        if text.count("!") > 2:
-            red_flags.append("Excessive exclamation marks (sensationalism)")
-        
-        # All caps
-        if text.isupper() and len(text) > 20:
-            red_flags.append("Text in ALL CAPS (aggressive formatting)")
-        
-        # Clickbait keywords
-        clickbait_words = [
-            "shocking", "secret", "you won't believe", "urgent",
-            "share this", "censored", "they don't want you to know"
-        ]
-        if any(word in text.lower() for word in clickbait_words):
-            red_flags.append("Contains clickbait trigger words")
-        
-        return red_flags
+        return self.scan_red_flags(text).flags
+    
+    @staticmethod
+    def _confidence_reason(confidence: float) -> str:
+        """Describe how sure the model is (confidence in percent)."""
+        if confidence > 90:
+            return (
+                f"AI model is extremely confident ({confidence:.1f}%) "
+                "based on training data patterns"
+            )
+        if confidence > 70:
+            return (
+                f"AI model shows strong indicators ({confidence:.1f}%) "
+                "matching this category"
+            )
+        return (
+            f"AI found patterns ({confidence:.1f}%) leaning towards "
+            "this verdict, though with lower certainty"
+        )
     
     def generate_explanation(
         self,
@@ -345,6 +416,7 @@ class AnalysisService:
         confidence: float,
         red_flags: List[str],
         fact_check: Optional[str],
+        sentiment: Optional[Sentiment] = None,
     ) -> List[str]:
         """
         Generate human-readable explanation for the verdict.
@@ -355,6 +427,8 @@ class AnalysisService:
             confidence: Confidence score (0-100)
             red_flags: List of detected red flags
             fact_check: Fact check result
+            sentiment: Precomputed (polarity, subjectivity); computed here
+                when not given
             
         Returns:
             List of explanation reasons
@@ -362,27 +436,14 @@ class AnalysisService:
         reasons = []
         
         # Confidence-based reasoning
-        if confidence > 90:
-            reasons.append(
-                f"AI model is extremely confident ({confidence:.1f}%) "
-                "based on training data patterns"
-            )
-        elif confidence > 70:
-            reasons.append(
-                f"AI model shows strong indicators ({confidence:.1f}%) "
-                "matching this category"
-            )
-        elif confidence > 50:
-            reasons.append(
-                f"AI found patterns ({confidence:.1f}%) leaning towards "
-                "this verdict, though with lower certainty"
-            )
+        if confidence > 50:
+            reasons.append(self._confidence_reason(confidence))
         
         # Sentiment analysis
         try:
-            blob = TextBlob(text)
-            sentiment = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
+            if sentiment is None:
+                sentiment = get_sentiment_engine().score(text)
+            polarity, subjectivity = sentiment
             
             if is_real:
                 if subjectivity < 0.4:
@@ -390,14 +451,14 @@ class AnalysisService:
                         "Writing style is objective and neutral "
                         "(common in professional journalism)"
                     )
-                if -0.1 < sentiment < 0.1:
+                if -0.1 < polarity < 0.1:
                     reasons.append("Tone is balanced, avoiding emotionally charged language")
                 if len(text) > 1000:
                     reasons.append("Article length indicates detailed reporting")
             else:
                 if subjectivity > 0.6:
                     reasons.append("Writing is highly subjective/opinionated rather than factual")
-                if abs(sentiment) > 0.6:
+                if abs(polarity) > 0.6:
                     reasons.append("Uses highly emotional language to trigger a reaction")
                 if len(text) < 200:
                     reasons.append("Text is very short, lacking detail typical of credible reports")
@@ -422,12 +483,124 @@ class AnalysisService:
         
         return reasons
     
-    def _generate_cache_key(self, text: str) -> str:
+    @property
+    def explainer(self) -> "ExplainabilityEngine":
+        """Explainability engine for the loaded model (created on first use)."""
+        if self._explainer is None:
+            from ml.explainability import get_explainability_engine
+            self._explainer = get_explainability_engine(
+                self.model, self.tfidf, version=self.model_version, scorer=self.fast_scorer
+            )
+        return self._explainer
+    
+    def explain_many(self, texts: List[str], top_k: int = 10) -> List[Dict]:
+        """
+        Explain the model's verdict on several texts.
+        
+        Texts go through one sparse ``transform``; the verdict and the
+        top-k term attributions both come from that matrix, so an
+        explanation costs about as much as a prediction.
+        
+        Args:
+            texts: Texts to explain (URLs are not resolved)
+            top_k: Attributions returned per text
+            
+        Returns:
+            List of dicts with verdict, scores and attributions, in the same
+            order as ``texts``
+        """
+        if not self.is_loaded():
+            raise RuntimeError("ML model not loaded")
+        
+        # Same bound on work per text as long-document mode
+        texts = [text[:self.chunker.max_chars] for text in texts]
+        
+        attributions, probabilities = self.explainer.attribute(texts, top_n=top_k)
+        if probabilities is not None:
+            scores = self._scores_from_probabilities(probabilities)
+        else:
+            # Model without coefficients: verdicts only
+            scores = self._score_texts(texts)
+        
+        # Positive attributions push towards the second class
+        positive = self.class_order[1] if len(self.class_order) > 1 else None
+        toward, away = (
+            ("Real News", "Fake News") if positive in self.REAL_LABELS
+            else ("Fake News", "Real News")
+        )
+        
+        explanations = []
+        for terms, (score_real, score_fake, is_real) in zip(attributions, scores):
+            explanations.append({
+                "verdict": REAL_TITLE if is_real else FAKE_TITLE,
+                "scores": {"Real News": score_real, "Fake News": score_fake},
+                "attributions": [
+                    {"term": term, "weight": weight, "supports": toward if weight > 0 else away}
+                    for term, weight in terms
+                ],
+            })
+        
+        return explanations
+    
+    @property
+    def perturbation_explainer(self) -> "PerturbationExplainer":
+        """Perturbation explainer for the loaded model (created on first use)."""
+        if self._perturbation_explainer is None:
+            from ml.perturbation import PerturbationExplainer
+            self._perturbation_explainer = PerturbationExplainer(
+                self.explainer,
+                num_samples=self.perturbation_samples,
+                max_features=self.perturbation_max_features,
+                seed=self.perturbation_seed,
+            )
+        return self._perturbation_explainer
+    
+    def explain_perturbation(
+        self,
+        text: str,
+        num_samples: Optional[int] = None,
+        seed: Optional[int] = None,
+        top_k: int = 10,
+    ) -> Dict:
+        """
+        Explain the model's verdict on one text by masking its words.
+        
+        All masked variants are scored in one sparse batch; the cost grows
+        with ``num_samples``, not with the number of model calls.
+        
+        Args:
+            text: Text to explain (URLs are not resolved)
+            num_samples: Masked variants to score (defaults to the
+                configured budget)
+            seed: Sampling seed (defaults to the configured seed)
+            top_k: Words returned
+            
+        Returns:
+            Dict with verdict, probability of the verdict, the most
+            influential words, the smallest removal that flips the verdict,
+            the surrogate's fidelity and the sampling parameters
+        """
+        if not self.is_loaded():
+            raise RuntimeError("ML model not loaded")
+        
+        # Same bound on work per text as long-document mode
+        text = text[:self.chunker.max_chars]
+        
+        explanation = self.perturbation_explainer.explain(
+            text, num_samples=num_samples, seed=seed, top_k=top_k
+        )
+        is_real = explanation.pop("prediction") in self.REAL_LABELS
+        explanation["verdict"] = REAL_TITLE if is_real else FAKE_TITLE
+        return explanation
+    
+    def _generate_cache_key(self, text: str, prefix: str = CACHE_NAMESPACE) -> str:
         """
         Generate cache key for analysis result.
         
         Args:
             text: Input text
+            prefix: Key prefix, normally the namespace generation prefix
+                from ``CacheManager.namespace_prefix``
             
         Returns:
             Cache key string
@@ -438,70 +611,537 @@ class AnalysisService:
         # Generate hash
         text_hash = hashlib.sha256(normalized.encode()).hexdigest()
         
-        return f"analysis:{text_hash}"
+        return f"{prefix}:v{self.CACHE_KEY_VERSION}:{text_hash}"
     
-    async def analyze(self, input_text: str) -> Tuple[str, str, Dict[str, float]]:
+    async def analyze(self, input_text: str, full: bool = False) -> ResultTuple:
         """
         Analyze news text for authenticity.
         
         Args:
             input_text: Text or URL to analyze
+            full: Run the full pipeline even for a confident verdict
             
         Returns:
             Tuple of (verdict_title, html_output, probability_dict)
         """
-        # Check cache first
+        result = await self.analyze_result(input_text, full=full)
+        return result.to_tuple()
+    
+    async def analyze_many(self, texts: List[str], full: bool = False) -> List[ResultTuple]:
+        """
+        Analyze several news texts, returning legacy result tuples.
+        
+        Args:
+            texts: Texts or URLs to analyze
+            full: Run the full pipeline even for confident verdicts
+            
+        Returns:
+            List of (verdict_title, html_output, probability_dict) tuples,
+            in the same order as ``texts``
+        """
+        results = await self.analyze_results(texts, full=full)
+        return [result.to_tuple() for result in results]
+    
+    async def analyze_result(self, input_text: str, full: bool = False) -> AnalysisResult:
+        """
+        Analyze news text, returning the structured result.
+        
+        Args:
+            input_text: Text or URL to analyze
+            full: Run the full pipeline even for a confident verdict
+            
+        Returns:
+            AnalysisResult (HTML is only rendered if asked for)
+        """
+        results = await self.analyze_results([input_text], full=full)
+        return results[0]
+    
+    async def analyze_results(self, texts: List[str], full: bool = False) -> List[AnalysisResult]:
+        """
+        Analyze several news texts with a single vectorized model call.
+        
+        Cache lookups, URL scraping and explanation are still done per item,
+        but every text that reaches the model goes through one sparse
+        ``transform`` and one ``predict_proba``. Results are cached in
+        their compact dictionary form, without HTML.
+        
+        Verdicts outside the uncertainty band take the fast path and skip
+        the fact check and the sentiment-based explanation; a cached
+        fast-path result is not reused when ``full`` is requested.
+        
+        Concurrent misses of the same text are computed once (see
+        ``CacheManager.get_or_compute_many``).
+        
+        Args:
+            texts: Texts or URLs to analyze
+            full: Run the full pipeline even for confident verdicts
+            
+        Returns:
+            List of AnalysisResult, in the same order as ``texts``
+        """
+        results: List[Optional[AnalysisResult]] = [None] * len(texts)
+        pending: List[int] = []
+        signatures: Dict[int, object] = {}
+        
+        # One generation for the whole batch
+        key_prefix = None
         if self.cache and self.enable_cache:
-            cache_key = self._generate_cache_key(input_text)
-            cached_result = await self.cache.get(cache_key, deserialize="pickle")
+            key_prefix = await self.cache.namespace_prefix(self.CACHE_NAMESPACE)
+        
+        # Check cache first: exact keys (one round trip), then near-duplicates
+        if key_prefix is not None:
+            cache_keys = [self._generate_cache_key(text, key_prefix) for text in texts]
+            cached_entries = await self.cache.get_many_with_status(cache_keys, deserialize="json")
+        
+        for i, input_text in enumerate(texts):
+            if key_prefix is not None:
+                cache_key = cache_keys[i]
+                cached, stale = cached_entries[i]
+                cached_result = AnalysisResult.from_dict(cached)
+                
+                if cached_result is not None and not (full and cached_result.path == FAST_PATH):
+                    logger.info(f"Cache hit for analysis: {cache_key[:16]}...")
+                    if stale:
+                        self._refresh_in_background(
+                            input_text, cache_key, key_prefix, cached_result.path == FULL_PATH
+                        )
+                    analysis_cache_lookups.labels(result="exact").inc()
+                    analysis_path.labels(path="cached").inc()
+                    results[i] = cached_result
+                    continue
+                
+                signature = self._fingerprint(input_text)
+                if signature is not None:
+                    signatures[i] = signature
+                    near_result = await self._near_duplicate_result(signature, full, key_prefix)
+                    if near_result is not None:
+                        analysis_cache_lookups.labels(result="near_duplicate").inc()
+                        analysis_path.labels(path="cached").inc()
+                        results[i] = near_result
+                        continue
+                
+                analysis_cache_lookups.labels(result="miss").inc()
             
-            if cached_result is not None:
-                logger.info(f"Cache hit for analysis: {cache_key[:16]}...")
-                return cached_result
+            pending.append(i)
         
-        if not self.model or not self.tfidf:
-            return (
-                "❌ Model Error",
-                "<div style='color:red'>ML model not loaded</div>",
-                {}
+        if not pending:
+            return results
+        
+        async def compute(indices: List[int]) -> List[AnalysisResult]:
+            return await self._compute_results(
+                texts, [pending[j] for j in indices], full, key_prefix, signatures
+            )
+        
+        if key_prefix is not None and not full:
+            # Concurrent misses of the same text, here or in other
+            # processes, wait for a single computation (full requests
+            # can't use a fast-path result, so they compute their own)
+            computed = await self.cache.get_or_compute_many(
+                [cache_keys[i] for i in pending],
+                compute,
+                decode=AnalysisResult.from_dict,
+            )
+        else:
+            computed = await compute(list(range(len(pending))))
+        
+        for i, result in zip(pending, computed):
+            results[i] = result
+        
+        return results
+    
+    def _refresh_in_background(self, text: str, cache_key: str, key_prefix: str, full: bool):
+        """
+        Recompute a stale cached result without blocking the request.
+        
+        Args:
+            text: Text or URL of the cached result
+            cache_key: Its cache key
+            key_prefix: Prefix of the current cache generation
+            full: Whether the cached result came from the full pipeline
+        """
+        async def refresh():
+            await self._compute_results([text], [0], full, key_prefix, {})
+        
+        self.cache.schedule_refresh(cache_key, refresh)
+    
+    async def _compute_results(
+        self,
+        texts: List[str],
+        indices: List[int],
+        full: bool,
+        key_prefix: Optional[str],
+        signatures: Dict[int, object],
+    ) -> List[AnalysisResult]:
+        """
+        Analyze cache misses and cache the results.
+        
+        Args:
+            texts: Texts or URLs of the whole batch
+            indices: Indices into ``texts`` to analyze
+            full: Run the full pipeline even for confident verdicts
+            key_prefix: Prefix of the current cache generation (None when
+                caching is disabled)
+            signatures: Near-duplicate signatures by index into ``texts``
+            
+        Returns:
+            List of AnalysisResult, in the same order as ``indices``
+        """
+        pending_texts = [texts[i] for i in indices]
+        
+        # Run the CPU-bound pipeline in the process pool when one is attached
+        if self.executor is not None:
+            computed = await self._analyze_in_executor(pending_texts, full)
+        else:
+            computed = await self._analyze_uncached(pending_texts, full=full)
+        
+        to_cache: Dict[str, Dict] = {}
+        negative: List[str] = []
+        for i, result in zip(indices, computed):
+            if result.ok:
+                path = "fast" if result.path == FAST_PATH else "requested" if full else "uncertain"
+                analysis_path.labels(path=path).inc()
+            
+            if key_prefix is None:
+                continue
+            
+            # Cache the result; input errors are cached as negative entries
+            # (short TTL set by the cache rules), other errors not at all
+            cache_key = self._generate_cache_key(texts[i], key_prefix)
+            if result.ok:
+                to_cache[cache_key] = result.to_dict()
+            elif result.title in self.NEGATIVE_CACHE_TITLES:
+                to_cache[cache_key] = result.to_dict()
+                negative.append(cache_key)
+        
+        if to_cache:
+            # One pipelined write for the whole batch; the cache's admission
+            # policy may skip results that were only requested once
+            stored = await self.cache.set_many(
+                to_cache, ttl=self.cache_ttl, serialize=self.cache_codec, negative=negative
             )
+            logger.info(f"Cached {len(stored)} of {len(to_cache)} analysis results")
+            
+            # Only index results that were written: a rejected key would
+            # count as a near-duplicate hit and then miss the cache
+            written = set(stored).difference(negative)
+            for i in indices:
+                if i in signatures:
+                    cache_key = self._generate_cache_key(texts[i], key_prefix)
+                    if cache_key in written:
+                        self.near_duplicates.add(signatures[i], cache_key)
+        
+        return computed
+    
+    async def _analyze_in_executor(self, texts: List[str], full: bool) -> List[AnalysisResult]:
+        """
+        Run the uncached pipeline in the process pool.
+        
+        A lone text is handed to the micro-batcher so that concurrent
+        requests share one pool submission (and one model call in the
+        worker) instead of paying for one each.
+        
+        Args:
+            texts: Texts or URLs to analyze
+            full: Run the full pipeline even for confident verdicts
+            
+        Returns:
+            List of AnalysisResult, in the same order as ``texts``
+        """
+        if self.batch_window_ms is None or len(texts) != 1:
+            return await self.executor.analyze_many(texts, full=full)
+        
+        batcher = self._executor_batchers.get(full)
+        if batcher is None:
+            # Looks the executor up per batch: it is attached after startup
+            batcher = InferenceBatcher(
+                lambda batch: self.executor.analyze_many(batch, full=full),
+                window_ms=self.batch_window_ms,
+                max_batch_size=self.max_batch_size,
+            )
+            self._executor_batchers[full] = batcher
+        return [await batcher.submit(texts[0])]
+    
+    def _fingerprint(self, text: str):
+        """
+        MinHash signature for the near-duplicate index.
+        
+        Args:
+            text: Text or URL to analyze
+            
+        Returns:
+            Signature, or None if the index is disabled or the text is a
+            URL or too short to fingerprint reliably
+        """
+        if self.near_duplicates is None:
+            return None
+        text = text.strip()
+        if len(text) < self.near_duplicate_min_chars or text[:8].lower().startswith(("http://", "https://")):
+            return None
+        # Same bound on work per text as long-document mode
+        return self.near_duplicates.signature(text[:self.chunker.max_chars])
+    
+    async def _near_duplicate_result(
+        self,
+        signature,
+        full: bool,
+        key_prefix: str,
+    ) -> Optional[AnalysisResult]:
+        """
+        Reuse the cached result of a near-duplicate text, if any.
+        
+        Args:
+            signature: Signature of the text being analyzed
+            full: Whether the caller asked for the full pipeline
+            key_prefix: Prefix of the current cache generation
+            
+        Returns:
+            Copy of the matching result marked with its similarity, or None
+        """
+        match = self.near_duplicates.lookup(signature)
+        if match is None:
+            return None
+        
+        cache_key, similarity = match
+        if not cache_key.startswith(f"{key_prefix}:"):
+            # Cached under an invalidated generation
+            self.near_duplicates.discard(cache_key)
+            return None
         
+        result = AnalysisResult.from_dict(await self.cache.get(cache_key, deserialize="json"))
+        if result is None:
+            # Expired from (or never written to) the shared cache
+            self.near_duplicates.discard(cache_key)
+            return None
+        if full and result.path == FAST_PATH:
+            return None
+        
+        logger.info(f"Near-duplicate cache hit ({similarity:.2f}): {cache_key[:16]}...")
+        result.similarity = similarity
+        # Chunk and red-flag offsets point into the other text
+        result.chunks = None
+        result.red_flag_matches = ()
+        result.reasons = result.reasons + (
+            f"Near-duplicate of a previously analyzed text ({similarity * 100:.0f}% similar); "
+            "verdict reused",
+        )
+        return result
+    
+    async def _analyze_uncached(
+        self,
+        texts: List[str],
+        full: bool = False,
+    ) -> List[AnalysisResult]:
+        """
+        Run the analysis pipeline in-process, without the cache.
+        
+        Args:
+            texts: Texts or URLs to analyze
+            full: Run the full pipeline even for confident verdicts
+            
+        Returns:
+            List of AnalysisResult, in the same order as ``texts``
+        """
+        if not self.is_loaded():
+            return [
+                AnalysisResult.failure("❌ Model Error", "ML model not loaded")
+                for _ in texts
+            ]
+        
+        results: List[Optional[AnalysisResult]] = [None] * len(texts)
+        
+        # Resolve URLs and validate input
+        prepared: List[Tuple[int, str, str]] = []
+        for i, input_text in enumerate(texts):
+            try:
+                news_text, status_msg, error = self._prepare_input(input_text)
+            except Exception as e:
+                logger.error(f"Analysis error: {e}", exc_info=True)
+                results[i] = self._error_result(e)
+                continue
+            
+            if error is not None:
+                results[i] = error
+            else:
+                prepared.append((i, news_text, status_msg))
+        
+        if not prepared:
+            return results
+        
+        # Long documents are split into bounded chunks, which are scored in
+        # the same model call as everything else
+        chunk_plans: List[Optional[List[Span]]] = []
+        score_inputs: List[str] = []
+        for _, news_text, _ in prepared:
+            if len(news_text) > self.long_document_chars:
+                spans = self.chunker.chunk(news_text)
+                chunk_plans.append(spans)
+                score_inputs.extend(news_text[start:end] for start, end in spans)
+            else:
+                chunk_plans.append(None)
+                score_inputs.append(news_text)
+        
+        # Score every remaining text in one model call. A lone text is
+        # handed to the micro-batcher so that it shares a model call with
+        # concurrent requests.
         try:
-            status_msg = ""
-            news_text = input_text.strip()
-            
-            # Handle URL input
-            if news_text.lower().startswith(("http://", "https://")):
-                extracted_text, msg = self.scrape_url(news_text)
-                if extracted_text:
-                    news_text = extracted_text
-                    status_msg = f"<br><small>{msg}</small>"
-                else:
-                    return (
-                        "⚠️ URL Error",
-                        f"<div style='color:red'>{msg}</div>",
-                        {}
-                    )
+            if self.batcher is not None and len(score_inputs) == 1:
+                raw_scores = [await self.batcher.submit(score_inputs[0])]
+            else:
+                raw_scores = self._score_texts(score_inputs)
+        except Exception as e:
+            logger.error(f"Analysis error: {e}", exc_info=True)
+            for i, _, _ in prepared:
+                results[i] = self._error_result(e)
+            return results
+        
+        # Fold chunk scores back into one verdict per document. The rest of
+        # the pipeline only sees the analyzed part of a long document.
+        documents = []
+        position = 0
+        for (i, news_text, status_msg), spans in zip(prepared, chunk_plans):
+            if spans is None:
+                score_real, score_fake, is_real = raw_scores[position]
+                position += 1
+                documents.append((i, news_text, status_msg, score_real, score_fake, is_real, None, False))
+                continue
+            
+            chunk_scores = raw_scores[position:position + len(spans)]
+            position += len(spans)
             
-            # Validate text length
-            if len(news_text) < self.MIN_ANALYSIS_LENGTH:
-                return (
-                    "⚠️ Text Too Short",
-                    "Please enter at least one full sentence or a valid URL",
-                    {}
+            score_real, score_fake = aggregate_chunk_scores(
+                spans, [(real, fake) for real, fake, _ in chunk_scores]
+            )
+            chunks = [
+                (start, end, real, fake)
+                for (start, end), (real, fake, _) in zip(spans, chunk_scores)
+            ]
+            analyzed_end = spans[-1][1]
+            documents.append((
+                i, news_text[:analyzed_end], status_msg, score_real, score_fake,
+                score_real >= score_fake, chunks, analyzed_end < len(news_text),
+            ))
+        
+        # Cascade: only uncertain verdicts go on to the expensive stages
+        deep = [full or self.is_uncertain(document[4]) for document in documents]
+        
+        # Sentiment is computed once per text and shared with the explanation
+        sentiments: List[Optional[Sentiment]] = [None] * len(documents)
+        deep_indices = [k for k, is_deep in enumerate(deep) if is_deep]
+        if deep_indices:
+            try:
+                scored = get_sentiment_engine().score_many(
+                    [documents[k][1] for k in deep_indices]
                 )
+                for k, sentiment in zip(deep_indices, scored):
+                    sentiments[k] = sentiment
+            except Exception as e:
+                logger.warning(f"Sentiment analysis failed: {e}")
+        
+        for (i, news_text, status_msg, score_real, score_fake, is_real, chunks, truncated), sentiment, is_deep in zip(
+            documents, sentiments, deep
+        ):
+            try:
+                results[i] = self._build_result(
+                    news_text, status_msg, score_real, score_fake, is_real, sentiment,
+                    chunks=chunks, truncated=truncated, full=is_deep,
+                )
+            except Exception as e:
+                logger.error(f"Analysis error: {e}", exc_info=True)
+                results[i] = self._error_result(e)
+        
+        return results
+    
+    def _prepare_input(
+        self,
+        input_text: str,
+    ) -> Tuple[str, str, Optional[AnalysisResult]]:
+        """
+        Resolve URL input and validate text length.
+        
+        Args:
+            input_text: Text or URL to analyze
+            
+        Returns:
+            Tuple of (news_text, status_message, error_result). When
+            ``error_result`` is not None the text must not be scored.
+        """
+        status_msg = ""
+        news_text = input_text.strip()
+        
+        # Handle URL input
+        if news_text[:8].lower().startswith(("http://", "https://")):
+            extracted_text, msg = self.scrape_url(news_text)
+            if extracted_text:
+                news_text = extracted_text
+                status_msg = f"<br><small>{msg}</small>"
+            else:
+                return news_text, status_msg, AnalysisResult.failure("⚠️ URL Error", msg)
+        
+        # Validate text length
+        if len(news_text) < self.MIN_ANALYSIS_LENGTH:
+            return news_text, status_msg, AnalysisResult.failure(
+                "⚠️ Text Too Short",
+                "Please enter at least one full sentence or a valid URL",
+                styled=False
+            )
+        
+        return news_text, status_msg, None
+    
+    def is_uncertain(self, score_fake: float) -> bool:
+        """
+        Whether a verdict falls inside the uncertainty band.
+        
+        Args:
+            score_fake: Probability of the fake class
+            
+        Returns:
+            True if the verdict should go through the full pipeline
+        """
+        if self.uncertainty_band is None:
+            return True
+        low, high = self.uncertainty_band
+        return low <= score_fake <= high
+    
+    def _score_texts(self, texts: List[str]) -> List[Tuple[float, float, bool]]:
+        """
+        Score texts with one vectorizer and one model call.
+        
+        The verdict is taken from the predicted probabilities (the most
+        probable class), so no separate ``predict`` call is needed. When a
+        compiled fast scorer is available it replaces the sklearn calls.
+        
+        Args:
+            texts: Cleaned texts to score
             
-            # Vectorize text
-            text_vectorized = self.tfidf.transform([news_text])
+        Returns:
+            List of (score_real, score_fake, is_real) tuples
+        """
+        if self.fast_scorer is not None:
+            probabilities = self.fast_scorer.predict_proba(texts)
+        else:
+            text_vectorized = self.tfidf.transform(texts)
+            probabilities = self.model.predict_proba(text_vectorized)
+        
+        return self._scores_from_probabilities(probabilities)
+    
+    def _scores_from_probabilities(self, probabilities) -> List[Tuple[float, float, bool]]:
+        """
+        Map model probability rows to (score_real, score_fake, is_real).
+        
+        Args:
+            probabilities: Array of shape (n_texts, n_classes), ordered
+                like ``class_order``
             
-            # Get predictions
-            probabilities = self.model.predict_proba(text_vectorized)[0]
+        Returns:
+            List of (score_real, score_fake, is_real) tuples
+        """
+        scores = []
+        for row in probabilities:
             prob_by_class = {
                 cls: float(prob)
-                for cls, prob in zip(self.class_order, probabilities)
+                for cls, prob in zip(self.class_order, row)
             }
             
-            # Calculate scores
             score_fake = max(
                 (prob_by_class.get(lbl, 0.0) for lbl in self.FAKE_LABELS),
                 default=0.0
@@ -511,150 +1151,148 @@ class AnalysisService:
                 default=0.0
             )
             
-            # Get prediction
-            prediction = self.model.predict(text_vectorized)[0]
-            is_real = prediction in self.REAL_LABELS
-            
-            # Detect red flags
-            red_flags = self.detect_red_flags(news_text)
-            
-            # Check fact database
-            fact_check_result = self.check_fact_database(news_text)
-            
-            # Override if fact check shows false
-            if fact_check_result and any(
-                word in fact_check_result
-                for word in ["False", "Pants on Fire", "Incorrect"]
-            ):
-                is_real = False
-                score_fake = 0.99
-                score_real = 0.01
-            
-            # Calculate confidence
-            confidence = (score_real if is_real else score_fake) * 100
+            prediction = self.class_order[int(row.argmax())]
+            scores.append((score_real, score_fake, prediction in self.REAL_LABELS))
+        
+        return scores
+    
+    def _build_result(
+        self,
+        news_text: str,
+        status_msg: str,
+        score_real: float,
+        score_fake: float,
+        is_real: bool,
+        sentiment: Optional[Sentiment] = None,
+        chunks: Optional[List[ChunkScore]] = None,
+        truncated: bool = False,
+        full: bool = True,
+    ) -> AnalysisResult:
+        """
+        Turn model scores into the final verdict and explanation.
+        
+        The fast path (``full=False``) skips the fact-check API and the
+        sentiment-based explanation; the verdict is the model's and the
+        reasons are its confidence and the red flags.
+        
+        Args:
+            news_text: Analyzed text
+            status_msg: Optional status line (e.g. scraped URL)
+            score_real: Probability of the real class
+            score_fake: Probability of the fake class
+            is_real: Model verdict
+            sentiment: Precomputed (polarity, subjectivity)
+            chunks: Per-chunk scores for long documents
+            truncated: Whether text past the last chunk was not analyzed
+            full: Whether to run the expensive stages
             
-            # Generate explanation
+        Returns:
+            AnalysisResult
+        """
+        # Detect red flags; the phrase matches are kept for highlighting
+        red_flag_report = self.scan_red_flags(news_text)
+        red_flags = red_flag_report.flags
+        
+        # Check fact database
+        fact_check_result = self.check_fact_database(news_text) if full else None
+        
+        # Override if fact check shows false
+        if fact_check_result and any(
+            word in fact_check_result
+            for word in ["False", "Pants on Fire", "Incorrect"]
+        ):
+            is_real = False
+            score_fake = 0.99
+            score_real = 0.01
+        
+        # Calculate confidence
+        confidence = (score_real if is_real else score_fake) * 100
+        
+        # Generate explanation
+        if full:
             reasons = self.generate_explanation(
-                news_text, is_real, confidence, red_flags, fact_check_result
+                news_text, is_real, confidence, red_flags, fact_check_result, sentiment
             )
-            
-            # Format output
-            if is_real:
-                title = "✅ AUTHENTIC NEWS"
-                color = "#10b981"
-                gradient = "linear-gradient(135deg, #10b981 0%, #059669 100%)"
-                sub_msg = "Reliable content detected"
-                icon = "✓"
-            else:
-                title = "⚠️ QUESTIONABLE CONTENT"
-                color = "#ef4444"
-                gradient = "linear-gradient(135deg, #ef4444 0%, #dc2626 100%)"
-                sub_msg = "Suspicious patterns detected"
-                icon = "⚠"
-            
-            # Build HTML output
-            html_out = self._format_html_output(
-                icon, title, sub_msg, confidence, gradient,
-                color, reasons, fact_check_result, status_msg
-            )
-            
-            # Build probability dictionary
-            prob_dict = {
-                "Real News": float(score_real),
-                "Fake News": float(score_fake)
-            }
-            
-            result = (title, html_out, prob_dict)
-            
-            # Cache the result
-            if self.cache and self.enable_cache:
-                cache_key = self._generate_cache_key(input_text)
-                await self.cache.set(
-                    cache_key,
-                    result,
-                    ttl=self.cache_ttl,
-                    serialize="pickle"
-                )
-                logger.info(f"Cached analysis result: {cache_key[:16]}...")
-            
-            return result
+        else:
+            reasons = [self._confidence_reason(confidence)] + red_flags
         
-        except Exception as e:
-            logger.error(f"Analysis error: {e}", exc_info=True)
-            return (
-                "❌ Error",
-                f"<div style='color:red'>Analysis failed: {str(e)}</div>",
-                {}
+        # Point at the most suspect section of a long document
+        if chunks and len(chunks) > 1:
+            index, (_, _, _, chunk_fake) = max(
+                enumerate(chunks), key=lambda item: item[1][3]
+            )
+            reasons.append(
+                f"Section {index + 1} of {len(chunks)} looks most suspect "
+                f"({chunk_fake * 100:.1f}% fake)"
             )
+        if truncated:
+            reasons.append(f"Only the first {len(news_text):,} characters were analyzed")
+        
+        return AnalysisResult(
+            title=REAL_TITLE if is_real else FAKE_TITLE,
+            is_real=is_real,
+            score_real=float(score_real),
+            score_fake=float(score_fake),
+            reasons=reasons,
+            fact_check=fact_check_result,
+            status_msg=status_msg,
+            chunks=chunks,
+            truncated=truncated,
+            red_flag_matches=red_flag_report.matches,
+            path=FULL_PATH if full else FAST_PATH,
+        )
     
-    def _format_html_output(
-        self,
-        icon: str,
-        title: str,
-        sub_msg: str,
-        confidence: float,
-        gradient: str,
-        color: str,
-        reasons: List[str],
-        fact_check: Optional[str],
-        status_msg: str,
-    ) -> str:
-        """Format analysis results as HTML."""
-        html = f"""
-        <div style="background: {gradient}; padding: 2rem; border-radius: 16px; color: white; text-align: center; box-shadow: 0 10px 30px rgba(0,0,0,0.3); margin-bottom: 1.5rem;">
-            <div style="font-size: 3rem; margin-bottom: 0.5rem;">{icon}</div>
-            <h2 style="margin:0; font-size: 1.75rem; font-weight: 700; color: white;">{title}</h2>
-            <p style="font-size: 1rem; margin-top: 0.5rem; opacity: 0.95;">{sub_msg}</p>
-            <div style="margin-top: 1rem; font-size: 2.5rem; font-weight: 700;">
-                {confidence:.1f}%
-            </div>
-            <p style="font-size: 0.875rem; opacity: 0.9; margin-top: 0.25rem;">Confidence Score</p>
-            {status_msg}
-        </div>
-        
-        <div style="background: #2d2d2d; border-radius: 16px; padding: 1.5rem; border: 1px solid #3d3d3d;">
-            <h3 style="margin-top: 0; color: #e5e5e5; font-size: 1.25rem; font-weight: 600; margin-bottom: 1rem;">
-                🔍 Analysis Details
-            </h3>
-            <div style="background: #1a1a1a; border-radius: 12px; padding: 1.25rem; border: 1px solid #3d3d3d;">
-        """
-        
-        for i, reason in enumerate(reasons, 1):
-            html += f"""
-            <div style="margin-bottom: 1rem; padding: 0.75rem; background: #2d2d2d; border-radius: 8px; border-left: 3px solid {color};">
-                <span style="font-weight: 600; color: {color};">#{i}</span>
-                <span style="margin-left: 0.5rem; color: #b5b5b5;">{reason}</span>
-            </div>
-            """
-        
-        if fact_check:
-            html += f"""
-            <div style="margin-top: 1rem; padding: 1rem; background: #3d2d1a; border-radius: 8px; border-left: 3px solid #f59e0b; border: 1px solid #4d3d2a;">
-                <span style="font-weight: 600; color: #fbbf24;">🔍 External Verification:</span>
-                <span style="margin-left: 0.5rem; color: #d4a574;">{fact_check}</span>
-            </div>
-            """
-        
-        html += "</div></div>"
-        
-        return html
+    @staticmethod
+    def _error_result(error: Exception) -> AnalysisResult:
+        """Build the result returned when analysis fails."""
+        return AnalysisResult.failure("❌ Error", f"Analysis failed: {str(error)}")
 
 
 # Global service instance
 _analysis_service: Optional[AnalysisService] = None
 
 
-def get_analysis_service() -> AnalysisService:
+def get_analysis_service(load_on_init: bool = True) -> AnalysisService:
     """
     Get or create the global analysis service instance.
     
+    Args:
+        load_on_init: Whether to load the models when the instance is
+            created (ignored if it already exists)
+    
     Returns:
         AnalysisService instance
     """
     global _analysis_service
     
     if _analysis_service is None:
-        _analysis_service = AnalysisService()
+        settings = get_settings()
+        _analysis_service = AnalysisService(
+            model_path=settings.model_path,
+            tfidf_path=settings.tfidf_path,
+            batch_window_ms=(
+                settings.inference_batch_window_ms
+                if settings.inference_batching_enabled else None
+            ),
+            max_batch_size=settings.inference_max_batch_size,
+            load_on_init=load_on_init,
+            long_document_chars=settings.long_document_chars,
+            chunk_chars=settings.chunk_chars,
+            max_chunks=settings.max_chunks_per_document,
+            perturbation_samples=settings.perturbation_samples,
+            perturbation_max_features=settings.perturbation_max_features,
+            perturbation_seed=settings.perturbation_seed,
+            uncertainty_band=settings.cascade_band,
+            near_duplicates=(
+                NearDuplicateIndex(
+                    threshold=settings.near_duplicate_threshold,
+                    max_entries=settings.near_duplicate_max_entries,
+                )
+                if settings.near_duplicate_enabled else None
+            ),
+            near_duplicate_min_chars=settings.near_duplicate_min_chars,
+            cache_codec=settings.analysis_cache_codec,
+        )
     
     return _analysis_service
 
@@ -0,0 +1,152 @@
+"""
+Long-document chunking.
+
+The model was trained on article-length texts and every stage of the
+pipeline (vectorizing, sentiment, red flags) is linear in the input, so a
+multi-megabyte paste would be scored as one huge bag of words and take
+unbounded time. ``DocumentChunker`` splits long inputs into
+paragraph-aligned chunks of bounded size and caps how many are analyzed;
+the chunks are scored in the same vectorized model call as everything
+else and ``aggregate_chunk_scores`` combines them into a document verdict.
+"""
+
+import re
+from typing import Iterator, List, Sequence, Tuple
+
+# (start, end) character offsets into the document
+Span = Tuple[int, int]
+
+# Paragraph breaks: a blank line, possibly with whitespace on it
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+
+# Preferred cut points inside an over-long paragraph, best first
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s")
+_WHITESPACE = re.compile(r"\s")
+
+
+class DocumentChunker:
+    """
+    Splits documents into paragraph-aligned chunks with a cap on total work.
+    """
+
+    def __init__(self, chunk_chars: int = 2000, max_chunks: int = 16):
+        """
+        Initialize chunker.
+
+        Args:
+            chunk_chars: Maximum characters per chunk
+            max_chunks: Maximum chunks analyzed per document; text past
+                the last chunk is not analyzed
+        """
+        self.chunk_chars = max(1, chunk_chars)
+        self.max_chunks = max(1, max_chunks)
+
+    @property
+    def max_chars(self) -> int:
+        """Upper bound on the characters analyzed per document."""
+        return self.chunk_chars * self.max_chunks
+
+    @staticmethod
+    def paragraphs(text: str) -> Iterator[Span]:
+        """
+        Iterate over paragraph spans (separated by blank lines).
+
+        Lazy, so that chunking stops scanning once ``max_chunks`` is reached.
+
+        Args:
+            text: Document text
+
+        Yields:
+            Spans of the non-empty paragraphs, in order
+        """
+        start = 0
+        for match in _PARAGRAPH_BREAK.finditer(text):
+            if match.start() > start:
+                yield start, match.start()
+            start = match.end()
+        if start < len(text):
+            yield start, len(text)
+
+    def _split_window(self, text: str, start: int, end: int) -> int:
+        """Find where to cut a span that is longer than one chunk."""
+        limit = start + self.chunk_chars
+        # Don't produce slivers: only look for a cut in the second half
+        floor = start + self.chunk_chars // 2
+
+        for pattern in (_SENTENCE_END, _WHITESPACE):
+            cut = None
+            for match in pattern.finditer(text, floor, limit):
+                cut = match.end()
+            if cut is not None:
+                return cut
+
+        return limit
+
+    def chunk(self, text: str) -> List[Span]:
+        """
+        Split a document into chunks.
+
+        Consecutive paragraphs are merged while they fit in one chunk;
+        paragraphs longer than a chunk are cut at the last sentence end
+        (or whitespace) inside the window. At most ``max_chunks`` spans
+        are returned.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Chunk spans, in order
+        """
+        chunks: List[Span] = []
+        current = None
+
+        for para_start, para_end in self.paragraphs(text):
+            # Merge into the current chunk if it still fits
+            if current is not None and para_end - current[0] <= self.chunk_chars:
+                current = (current[0], para_end)
+                continue
+
+            if current is not None:
+                chunks.append(current)
+                if len(chunks) == self.max_chunks:
+                    return chunks
+
+            # Window over-long paragraphs
+            while para_end - para_start > self.chunk_chars:
+                cut = self._split_window(text, para_start, para_end)
+                chunks.append((para_start, cut))
+                if len(chunks) == self.max_chunks:
+                    return chunks
+                para_start = cut
+                while para_start < para_end and text[para_start].isspace():
+                    para_start += 1
+
+            current = (para_start, para_end) if para_start < para_end else None
+
+        if current is not None:
+            chunks.append(current)
+
+        return chunks
+
+
+def aggregate_chunk_scores(
+    spans: Sequence[Span],
+    scores: Sequence[Tuple[float, float]],
+) -> Tuple[float, float]:
+    """
+    Combine per-chunk probabilities into document probabilities.
+
+    Chunks are weighted by length, so a short caption does not count as
+    much as a long section.
+
+    Args:
+        spans: Chunk spans
+        scores: (score_real, score_fake) per chunk
+
+    Returns:
+        Tuple of (score_real, score_fake)
+    """
+    total = sum(end - start for start, end in spans) or 1
+    score_real = sum((end - start) * real for (start, end), (real, _) in zip(spans, scores))
+    score_fake = sum((end - start) * fake for (start, end), (_, fake) in zip(spans, scores))
+    return score_real / total, score_fake / total
@@ -0,0 +1,175 @@
+"""
+Dynamic micro-batching for model inference.
+
+Concurrent single-text analyses each pay the fixed per-call overhead of the
+vectorizer and model. The batcher collects texts that arrive within a short
+window (or until a maximum batch size is reached), scores them with one
+vectorized call and resolves each caller's future with its own result.
+
+The scoring function may also be asynchronous (e.g. a submission to the
+inference process pool); its batches then run in the background so the
+next batch is collected while earlier ones are in flight.
+"""
+
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+import logging
+
+from monitoring.metrics import inference_batch_size, inference_queue_depth
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent scoring requests into batched model calls.
+
+    The batcher is bound to the event loop it was first used on. If it is
+    used from a different loop (e.g. Celery tasks that create a fresh loop
+    per call) it transparently starts a new worker on that loop.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[str]], Union[List[Any], Awaitable[List[Any]]]],
+        window_ms: float = 5.0,
+        max_batch_size: int = 32,
+    ):
+        """
+        Initialize inference batcher.
+
+        Args:
+            score_fn: Function (or coroutine function) scoring a list of
+                texts, returning one result per text
+            window_ms: Maximum time to wait for more texts after the first one (milliseconds)
+            max_batch_size: Maximum number of texts per model call
+        """
+        self.score_fn = score_fn
+        self.window_seconds = max(window_ms, 0.0) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Batches of an asynchronous score_fn still being scored
+        self._in_flight: Set[asyncio.Task] = set()
+
+        self.batches_scored = 0
+        self.texts_scored = 0
+        self.largest_batch = 0
+
+    def _ensure_worker(self):
+        """Start the batching worker on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, text: str) -> Any:
+        """
+        Score a single text as part of the next batch.
+
+        Args:
+            text: Text to score
+
+        Returns:
+            The result ``score_fn`` produced for this text
+        """
+        self._ensure_worker()
+
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future))
+        inference_queue_depth.set(self._queue.qsize())
+
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for the first item, then gather more until the window closes."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.window_seconds
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        inference_queue_depth.set(self._queue.qsize())
+        return batch
+
+    async def _run(self):
+        """Worker loop: collect a batch, score it and resolve the futures."""
+        while True:
+            batch = await self._collect()
+            batch = [(text, future) for text, future in batch if not future.done()]
+
+            if not batch:
+                continue
+
+            try:
+                results = self.score_fn([text for text, _ in batch])
+            except Exception as e:
+                self._fail(batch, e)
+                continue
+
+            if inspect.isawaitable(results):
+                task = self._loop.create_task(self._resolve_later(batch, results))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            else:
+                self._resolve(batch, results)
+
+    async def _resolve_later(self, batch: List[Tuple[str, asyncio.Future]], pending: Awaitable):
+        """Wait for an asynchronous batch and resolve its futures."""
+        try:
+            results = await pending
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        self._resolve(batch, results)
+
+    def _resolve(self, batch: List[Tuple[str, asyncio.Future]], results: List[Any]):
+        """Hand each caller its result and record the batch."""
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+        self.batches_scored += 1
+        self.texts_scored += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        inference_batch_size.observe(len(batch))
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, asyncio.Future]], error: Exception):
+        """Propagate a scoring error to every caller of the batch."""
+        logger.error(f"Batched inference failed: {error}", exc_info=error)
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches_in_flight": len(self._in_flight),
+            "batches_scored": self.batches_scored,
+            "texts_scored": self.texts_scored,
+            "largest_batch": self.largest_batch,
+            "average_batch_size": (
+                self.texts_scored / self.batches_scored if self.batches_scored else 0.0
+            ),
+            "window_ms": self.window_seconds * 1000.0,
+            "max_batch_size": self.max_batch_size,
+        }
@@ -0,0 +1,217 @@
+"""
+Process-pool inference executor.
+
+Vectorization, model inference, TextBlob sentiment, HTML parsing and the
+fact-check HTTP call are all blocking. Running them on the asyncio event
+loop stalls every other connection on the same uvicorn worker, so the API
+hands the uncached analysis pipeline to a pool of worker processes, each
+with the model preloaded. Submissions are bounded: when too many analyses
+are already in flight the caller gets an ``InferenceQueueFullError`` that
+the API turns into HTTP 503 with ``Retry-After``.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import logging
+
+from monitoring.metrics import inference_executor_pending, inference_executor_rejected
+
+if TYPE_CHECKING:
+    from services.analysis_result import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(Exception):
+    """Raised when the inference executor cannot accept more work."""
+
+    def __init__(self, retry_after: int):
+        """
+        Initialize error.
+
+        Args:
+            retry_after: Suggested delay before retrying (seconds)
+        """
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+# Per-process analysis service, created by the pool initializer
+_worker_service = None
+
+
+def _init_worker(model_path: str, tfidf_path: str):
+    """Load the model once in each worker process."""
+    global _worker_service
+
+    from config.settings import get_settings
+    from services.analysis_service import AnalysisService
+
+    settings = get_settings()
+    _worker_service = AnalysisService(
+        model_path=model_path,
+        tfidf_path=tfidf_path,
+        enable_cache=False,
+        long_document_chars=settings.long_document_chars,
+        chunk_chars=settings.chunk_chars,
+        max_chunks=settings.max_chunks_per_document,
+        uncertainty_band=settings.cascade_band,
+    )
+
+
+def _ping() -> bool:
+    """No-op task used to start workers ahead of the first request."""
+    return _worker_service is not None
+
+
+def _analyze_in_worker(texts: List[str], full: bool = False) -> List["AnalysisResult"]:
+    """Run the uncached analysis pipeline inside a worker process."""
+    return asyncio.run(_worker_service.analyze_results(texts, full=full))
+
+
+class InferenceExecutor:
+    """
+    Runs analyses in a pool of worker processes with a bounded queue.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        tfidf_path: str,
+        max_workers: int = 2,
+        max_pending: int = 64,
+        retry_after: int = 2,
+    ):
+        """
+        Initialize inference executor.
+
+        Args:
+            model_path: Path to pickled ML model loaded by each worker
+            tfidf_path: Path to pickled TF-IDF vectorizer loaded by each worker
+            max_workers: Number of worker processes
+            max_pending: Maximum submissions in flight (running + queued)
+            retry_after: Retry-After value reported when the queue is full (seconds)
+        """
+        self.model_path = model_path
+        self.tfidf_path = tfidf_path
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.retry_after = retry_after
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """Create the worker pool (spawned, so no event loop state is forked)."""
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_path, self.tfidf_path),
+        )
+
+    async def start(self):
+        """Start the pool and wait until every worker has loaded the model."""
+        if self._pool is None:
+            self._pool = self._create_pool()
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _ping)
+            for _ in range(self.max_workers)
+        ))
+        logger.info(f"Inference executor started with {self.max_workers} workers")
+
+    async def shutdown(self):
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Inference executor stopped")
+
+    async def analyze_many(self, texts: List[str], full: bool = False) -> List["AnalysisResult"]:
+        """
+        Analyze texts in a worker process.
+
+        Only the compact results are pickled back to the API process; HTML
+        is rendered there if a client asks for it.
+
+        Args:
+            texts: Texts or URLs to analyze
+            full: Run the full pipeline even for confident verdicts
+
+        Returns:
+            List of AnalysisResult, in the same order as ``texts``
+
+        Raises:
+            InferenceQueueFullError: If ``max_pending`` submissions are in flight
+        """
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            inference_executor_rejected.inc()
+            raise InferenceQueueFullError(self.retry_after)
+
+        if self._pool is None:
+            self._pool = self._create_pool()
+
+        self._pending += 1
+        inference_executor_pending.set(self._pending)
+
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._pool, _analyze_in_worker, texts, full)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM kill); replace the pool for later calls
+            logger.error("Inference worker pool broken, restarting it")
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            raise
+        finally:
+            self._pending -= 1
+            inference_executor_pending.set(self._pending)
+
+        self.completed += 1
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics."""
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+# Global executor instance
+_inference_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """
+    Get global inference executor instance.
+
+    Returns:
+        InferenceExecutor configured from application settings
+    """
+    global _inference_executor
+
+    if _inference_executor is None:
+        from config.settings import get_settings
+
+        settings = get_settings()
+        _inference_executor = InferenceExecutor(
+            model_path=settings.model_path,
+            tfidf_path=settings.tfidf_path,
+            max_workers=settings.inference_executor_workers,
+            max_pending=settings.inference_executor_max_pending,
+            retry_after=settings.inference_executor_retry_after,
+        )
+
+    return _inference_executor
@@ -0,0 +1,273 @@
+"""
+Model lifecycle: single background load, warmup and readiness.
+
+The API process creates the analysis service without loading anything,
+then ``ModelLifecycle.start`` loads the model exactly once in a
+background task, starts the inference executor and pushes a warmup corpus
+through the full analysis pipeline so that model pages, lexicons, worker
+processes and the cache client are hot before traffic arrives. ``/ready``
+reports 503 until that has finished; ``/health`` stays a plain liveness
+check.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+from config.settings import get_settings
+from .analysis_service import AnalysisService, get_analysis_service
+
+logger = logging.getLogger(__name__)
+
+# Built-in warmup corpus (override with settings.warmup_corpus_path)
+DEFAULT_WARMUP_TEXTS = [
+    "The central bank held interest rates steady on Wednesday, saying inflation "
+    "had eased over the past year but remained above its target.",
+    "SHOCKING: doctors don't want you to know this one secret trick that cures "
+    "everything!!! Share this before it gets censored!!!",
+    "Scientists published the results of a three-year clinical trial in a "
+    "peer-reviewed journal, reporting a modest reduction in hospital admissions.",
+]
+
+
+class ModelState:
+    """Lifecycle states reported by ``/ready``."""
+
+    COLD = "cold"
+    LOADING = "loading"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+def load_warmup_texts(path: Optional[str] = None) -> List[str]:
+    """
+    Load the warmup corpus.
+
+    Args:
+        path: Text file with one document per line (blank lines and lines
+            starting with "#" are skipped); None for the built-in corpus
+
+    Returns:
+        List of warmup texts
+    """
+    if not path:
+        return list(DEFAULT_WARMUP_TEXTS)
+
+    with open(Path(path), "r", encoding="utf-8") as f:
+        return [
+            line.strip()
+            for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+class ModelLifecycle:
+    """
+    Loads the analysis model once and tracks readiness.
+    """
+
+    def __init__(
+        self,
+        warmup_texts: Optional[List[str]] = None,
+        executor_enabled: bool = False,
+    ):
+        """
+        Initialize lifecycle manager.
+
+        Args:
+            warmup_texts: Texts pushed through the pipeline before reporting
+                ready (empty list disables warmup)
+            executor_enabled: Whether to start the process-pool executor
+        """
+        self.warmup_texts = warmup_texts if warmup_texts is not None else list(DEFAULT_WARMUP_TEXTS)
+        self.executor_enabled = executor_enabled
+
+        self.state = ModelState.COLD
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the model is loaded and warm."""
+        return self.state == ModelState.READY
+
+    def _load(self) -> AnalysisService:
+        """Load the model into the global service exactly once (thread-safe)."""
+        service = get_analysis_service(load_on_init=False)
+
+        with self._load_lock:
+            if not service.is_loaded():
+                settings = get_settings()
+                start = time.perf_counter()
+                service._load_models(settings.model_path, settings.tfidf_path)
+                self.timings["load_seconds"] = time.perf_counter() - start
+
+                if not service.is_loaded():
+                    raise RuntimeError("ML model failed to load")
+
+        return service
+
+    def ensure_loaded(self) -> AnalysisService:
+        """
+        Return the global service with its model loaded (blocking).
+
+        Used by processes without an event-loop startup hook (Celery
+        workers); the model is still only loaded once per process.
+
+        Returns:
+            AnalysisService instance
+        """
+        service = self._load()
+        if self.state in (ModelState.COLD, ModelState.LOADING):
+            self.state = ModelState.READY
+        return service
+
+    async def start(self):
+        """Start loading and warmup in the background (idempotent)."""
+        if self._task is None:
+            # Create the service now (cheap) so requests never trigger a
+            # synchronous load of their own.
+            get_analysis_service(load_on_init=False)
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the lifecycle to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            True if the model is ready
+        """
+        if self._task is not None:
+            await asyncio.wait({self._task}, timeout=timeout)
+        return self.is_ready
+
+    async def stop(self):
+        """Cancel a pending load/warmup and stop the executor."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self.executor_enabled:
+            from .inference_executor import get_inference_executor
+            await get_inference_executor().shutdown()
+
+    async def _run(self):
+        """Load, start the executor and warm up."""
+        loop = asyncio.get_running_loop()
+        settings = get_settings()
+
+        try:
+            self.state = ModelState.LOADING
+            service = await loop.run_in_executor(None, self._load)
+
+            # Heavy modules are imported on first use unless lazy imports are off
+            if not settings.lazy_imports:
+                from .preload import preload_heavy_modules
+                await loop.run_in_executor(None, preload_heavy_modules)
+
+            # Compile the red-flag lexicon once
+            from .red_flags import get_red_flag_detector
+            await loop.run_in_executor(None, get_red_flag_detector)
+
+            # Move CPU-bound analysis off the event loop
+            if self.executor_enabled:
+                from .inference_executor import get_inference_executor
+
+                start = time.perf_counter()
+                try:
+                    executor = get_inference_executor()
+                    await executor.start()
+                    service.executor = executor
+                    self.timings["executor_seconds"] = time.perf_counter() - start
+                except Exception as e:
+                    logger.error(f"Failed to start inference executor: {e}")
+
+            # Drop in-process cache entries computed by another model version
+            if service.cache is not None:
+                await service.cache.notify_model_version(service.model_version)
+
+            self.state = ModelState.WARMING
+            await self._warmup(service)
+
+            self.state = ModelState.READY
+            logger.info(f"Model ready: {self.status()}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.state = ModelState.FAILED
+            self.error = str(e)
+            logger.error(f"Model lifecycle failed: {e}", exc_info=True)
+
+    async def _warmup(self, service: AnalysisService):
+        """Run the warmup corpus through the full pipeline."""
+        if not self.warmup_texts:
+            return
+
+        start = time.perf_counter()
+
+        # Run the uncached pipeline where requests will run it, so cache
+        # hits from other replicas cannot skip the warmup: once per worker
+        # process with the executor, otherwise in this process.
+        if service.executor is not None:
+            await asyncio.gather(*(
+                service.executor.analyze_many(self.warmup_texts)
+                for _ in range(service.executor.max_workers)
+            ))
+        else:
+            await service._analyze_uncached(self.warmup_texts)
+
+        # Then go through the normal entry point, which warms the cache
+        # client; results are only cached if the admission policy lets
+        # them in (frequency-gated rules need a second lookup)
+        await service.analyze_results(self.warmup_texts)
+
+        self.timings["warmup_seconds"] = time.perf_counter() - start
+
+    def status(self) -> Dict:
+        """Readiness details for the ``/ready`` endpoint."""
+        return {
+            "status": self.state,
+            "error": self.error,
+            "warmup_texts": len(self.warmup_texts),
+            "timings": {name: round(value, 3) for name, value in self.timings.items()},
+        }
+
+
+# Global lifecycle instance
+_model_lifecycle: Optional[ModelLifecycle] = None
+
+
+def get_model_lifecycle() -> ModelLifecycle:
+    """
+    Get global model lifecycle instance.
+
+    Returns:
+        ModelLifecycle configured from settings
+    """
+    global _model_lifecycle
+
+    if _model_lifecycle is None:
+        settings = get_settings()
+        _model_lifecycle = ModelLifecycle(
+            warmup_texts=(
+                load_warmup_texts(settings.warmup_corpus_path)
+                if settings.warmup_enabled else []
+            ),
+            executor_enabled=settings.inference_executor_enabled,
+        )
+
+    return _model_lifecycle
@@ -0,0 +1,58 @@
+"""
+Eager import of the heavy modules the service layer loads lazily.
+
+With ``settings.lazy_imports`` enabled (the default) the analysis code
+imports nltk, scikit-learn, scipy, bs4 and friends on first use so that a
+fresh process can serve requests quickly. Long-lived deployments that
+prefer to pay the cost at startup instead of on the first request can
+disable it; startup then calls ``preload_heavy_modules``.
+"""
+
+import importlib
+import time
+from typing import Dict, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Deferred modules, roughly in order of import cost
+HEAVY_MODULES = [
+    "services.text_features",  # nltk + sklearn.base
+    "ml.artifacts",            # scipy.sparse
+    "ml.fast_scorer",          # numpy + scipy.special
+    "sklearn.linear_model",
+    "textblob",
+    "bs4",
+    "requests",
+    "langdetect",
+    "deep_translator",
+    "googlesearch",
+]
+
+
+def preload_heavy_modules(modules: Sequence[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """
+    Import the deferred modules now.
+    
+    Args:
+        modules: Module names to import
+        
+    Returns:
+        Mapping of module name to import time in seconds (modules that
+        fail to import are logged and skipped)
+    """
+    timings = {}
+    
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Could not preload {name}: {e}")
+            continue
+        timings[name] = time.perf_counter() - start
+    
+    logger.info(
+        f"Preloaded {len(timings)} modules in {sum(timings.values()) * 1000:.0f} ms"
+    )
+    return timings
@@ -0,0 +1,287 @@
+"""
+Single-pass red-flag and clickbait detection.
+
+The phrase lexicon is compiled once into an Aho-Corasick automaton, so
+finding every phrase occurrence costs one linear pass over the text no
+matter how many phrases the lexicon holds. Exclamation marks and
+upper/lower-case letters are counted alongside, and every match is
+reported with its character offsets so clients can highlight it.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Built-in clickbait lexicon (extended via settings.red_flag_lexicon_path)
+DEFAULT_CLICKBAIT_PHRASES = [
+    "shocking",
+    "secret",
+    "you won't believe",
+    "urgent",
+    "share this",
+    "censored",
+    "they don't want you to know",
+]
+
+# (start, end, phrase) with end exclusive, offsets into the original text
+Match = Tuple[int, int, str]
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton over lowercase phrases.
+
+    Failure links are folded into each state's transition table at build
+    time, so scanning needs at most two dictionary lookups per character.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        """
+        Build the automaton.
+
+        Args:
+            phrases: Phrases to match (case-insensitive)
+        """
+        self.phrases: List[str] = []
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[int]] = [[]]
+
+        for phrase in phrases:
+            phrase = phrase.strip().lower()
+            if not phrase or phrase in self.phrases:
+                continue
+            self._add(phrase, len(self.phrases))
+            self.phrases.append(phrase)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def _add(self, phrase: str, index: int):
+        """Insert a phrase into the trie."""
+        state = 0
+        for char in phrase:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions.append({})
+                self._outputs.append([])
+                self._transitions[state][char] = next_state
+            state = next_state
+        self._outputs[state].append(index)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and fold them into transitions."""
+        root = self._transitions[0]
+        failure = [0] * len(self._transitions)
+        goto = [dict(transitions) for transitions in self._transitions]
+        queue = deque(root.values())
+
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+
+                fallback = failure[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = failure[fallback]
+                target = goto[fallback].get(char, 0)
+                failure[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[failure[child]]
+
+            # Inherit the failure state's transitions; transitions that
+            # equal the root's are resolved at scan time instead of stored.
+            if state:
+                inherited = {
+                    char: target
+                    for char, target in self._transitions[failure[state]].items()
+                    if root.get(char) != target
+                }
+                inherited.update(goto[state])
+                self._transitions[state] = inherited
+
+
+class RedFlagReport:
+    """Result of scanning a text for red flags."""
+
+    # Thresholds matching the original per-phrase checks
+    EXCLAMATION_THRESHOLD = 2
+    ALL_CAPS_MIN_LENGTH = 20
+
+    def __init__(
+        self,
+        text_length: int,
+        matches: List[Match],
+        exclamation_count: int,
+        uppercase_count: int,
+        cased_count: int,
+    ):
+        """
+        Initialize report.
+
+        Args:
+            text_length: Length of the scanned text
+            matches: Phrase matches as (start, end, phrase)
+            exclamation_count: Number of "!" characters
+            uppercase_count: Number of upper-case letters
+            cased_count: Number of letters that have a case
+        """
+        self.text_length = text_length
+        self.matches = matches
+        self.exclamation_count = exclamation_count
+        self.uppercase_count = uppercase_count
+        self.cased_count = cased_count
+
+    @property
+    def uppercase_ratio(self) -> float:
+        """Share of cased letters that are upper case."""
+        return self.uppercase_count / self.cased_count if self.cased_count else 0.0
+
+    @property
+    def is_all_caps(self) -> bool:
+        """Equivalent of ``str.isupper()`` on the scanned text."""
+        return self.cased_count > 0 and self.uppercase_count == self.cased_count
+
+    @property
+    def flags(self) -> List[str]:
+        """Human-readable red flags."""
+        red_flags = []
+
+        if self.exclamation_count > self.EXCLAMATION_THRESHOLD:
+            red_flags.append("Excessive exclamation marks (sensationalism)")
+
+        if self.is_all_caps and self.text_length > self.ALL_CAPS_MIN_LENGTH:
+            red_flags.append("Text in ALL CAPS (aggressive formatting)")
+
+        if self.matches:
+            red_flags.append("Contains clickbait trigger words")
+
+        return red_flags
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary representation."""
+        return {
+            "flags": self.flags,
+            "matches": [
+                {"start": start, "end": end, "phrase": phrase}
+                for start, end, phrase in self.matches
+            ],
+            "exclamation_count": self.exclamation_count,
+            "uppercase_ratio": self.uppercase_ratio,
+        }
+
+
+class RedFlagDetector:
+    """Scans texts for clickbait phrases and sensationalist formatting."""
+
+    def __init__(self, phrases: Optional[Iterable[str]] = None):
+        """
+        Initialize detector.
+
+        Args:
+            phrases: Phrase lexicon (defaults to DEFAULT_CLICKBAIT_PHRASES)
+        """
+        self.automaton = PhraseAutomaton(
+            DEFAULT_CLICKBAIT_PHRASES if phrases is None else phrases
+        )
+
+    @classmethod
+    def from_file(cls, path: str, include_defaults: bool = True) -> "RedFlagDetector":
+        """
+        Build a detector from a lexicon file (one phrase per line, # comments).
+
+        Args:
+            path: Lexicon file path
+            include_defaults: Whether to keep the built-in phrases
+
+        Returns:
+            RedFlagDetector instance
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            phrases = [
+                line.strip()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+
+        if include_defaults:
+            phrases = DEFAULT_CLICKBAIT_PHRASES + phrases
+
+        return cls(phrases)
+
+    def scan(self, text: str) -> RedFlagReport:
+        """
+        Scan a text for phrase matches and formatting statistics.
+
+        Phrase matching is one automaton pass over the text; the character
+        statistics are counted with C-level string primitives.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            RedFlagReport with matches, exclamation count and case statistics
+        """
+        automaton = self.automaton
+        transitions = automaton._transitions
+        root = transitions[0]
+        outputs = automaton._outputs
+        phrases = automaton.phrases
+
+        lowered = text.lower()
+        # Lowercasing can expand a few characters (e.g. "İ"); map offsets back
+        origin = None
+        if len(lowered) != len(text):
+            origin = [index for index, char in enumerate(text) for _ in char.lower()]
+
+        matches: List[Match] = []
+        state = 0
+
+        # Transition tables never store the root state, so a miss falls
+        # back to the root's transitions.
+        for end, char in enumerate(lowered, 1):
+            state = transitions[state].get(char) or root.get(char, 0)
+            if outputs[state]:
+                for phrase_index in outputs[state]:
+                    phrase = phrases[phrase_index]
+                    start = end - len(phrase)
+                    if origin is None:
+                        matches.append((start, end, phrase))
+                    else:
+                        matches.append((origin[start], origin[end - 1] + 1, phrase))
+
+        exclamations = text.count("!")
+        uppercase = sum(map(str.isupper, text))
+        cased = uppercase + sum(map(str.islower, text))
+
+        return RedFlagReport(len(text), matches, exclamations, uppercase, cased)
+
+
+# Global detector instance
+_red_flag_detector: Optional[RedFlagDetector] = None
+
+
+def get_red_flag_detector() -> RedFlagDetector:
+    """
+    Get global red-flag detector, compiling the lexicon on first use.
+
+    Returns:
+        RedFlagDetector built from settings.red_flag_lexicon_path, if set
+    """
+    global _red_flag_detector
+
+    if _red_flag_detector is None:
+        from config.settings import get_settings
+
+        lexicon_path = get_settings().red_flag_lexicon_path
+        if lexicon_path:
+            _red_flag_detector = RedFlagDetector.from_file(lexicon_path)
+        else:
+            _red_flag_detector = RedFlagDetector()
+
+        logger.info(f"Red-flag lexicon compiled: {len(_red_flag_detector.automaton)} phrases")
+
+    return _red_flag_detector
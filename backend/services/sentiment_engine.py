@@ -0,0 +1,272 @@
+"""
+Batch sentiment engine compatible with TextBlob's pattern analyzer.
+
+``TextBlob(text).sentiment`` builds a blob object per document, runs the
+general-purpose pattern tokenizer (sentence splitting, regex passes) and
+looks words up in a lazily loaded, nested part-of-speech dictionary.
+``SentimentEngine`` loads the same ``en-sentiment.xml`` lexicon once,
+flattens it into a compact ``word -> (polarity, subjectivity, intensity,
+is_modifier)`` table and scores a whole batch of texts in one pass with a
+single-pass tokenizer that reproduces the pattern tokenizer's word
+boundaries.
+
+Tolerance: the tokenizer follows pattern's ``find_tokens`` step by step
+(punctuation splitting, sentence grouping, then re-joining "(!)" and
+emoticons such as ``"great:)"`` within each sentence), so results match
+TextBlob up to floating-point rounding; ``TEXTBLOB_TOLERANCE`` bounds the
+difference and is asserted by ``tests/test_sentiment_engine.py``.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Documented maximum absolute difference from TextBlob's polarity/subjectivity
+TEXTBLOB_TOLERANCE = 1e-9
+
+# Tokenizer constants mirrored from pattern (textblob._text)
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_LEADING_PUNCTUATION = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING_PUNCTUATION = _LEADING_PUNCTUATION + (".",)
+_CONTRACTIONS = re.compile(r"('d|'m|'s|'ll|'re|'ve|n't)")
+_QUOTES = str.maketrans({
+    "“": " “ ",
+    "”": " ” ",
+    "‘": " ‘ ",
+    "’": " ’ ",
+    "'": " ' ",
+    '"': ' " ',
+})
+_ABBR1 = re.compile(r"^[A-Za-z]\.$")
+_ABBR2 = re.compile(r"^([A-Za-z]\.)+$")
+_ABBR3 = re.compile(r"^[A-Z][" + "|".join("bcdfghjklmnpqrstvwxz") + r"]+.$")
+_NEGATIONS = frozenset(("no", "not", "n't", "never"))
+# Paragraph breaks end a sentence
+_PARAGRAPH_BREAK = re.compile(r"\n{2,}")
+_EOS = "END-OF-SENTENCE"
+_SENTENCE_END = frozenset(("...", ".", "!", "?", _EOS))
+_SENTENCE_TRAIL = frozenset(("'", '"', "”", "’", "...", ".", "!", "?", ")", _EOS))
+
+
+def _join_emoticon(match) -> str:
+    """Drop the spaces the tokenizer put inside an emoticon."""
+    return match.group(1).replace(" ", "") + match.group(2)
+
+Sentiment = Tuple[float, float]
+
+
+class SentimentEngine:
+    """
+    Scores polarity and subjectivity for batches of texts.
+
+    Load the engine once (see ``get_sentiment_engine``) and reuse it; the
+    lexicon table is built on construction.
+    """
+
+    def __init__(self):
+        """Initialize the engine and build the compact lexicon table."""
+        from textblob._text import ABBREVIATIONS, EMOTICONS, RE_EMOTICONS, RE_SARCASM
+        from textblob.en import sentiment as pattern_sentiment
+
+        # Force the lazy XML lexicon to load, then flatten it
+        len(pattern_sentiment)
+
+        self.lexicon: Dict[str, Tuple[float, float, float, bool]] = {}
+        for word, by_pos in dict.items(pattern_sentiment):
+            polarity, subjectivity, intensity = by_pos[None]
+            self.lexicon[word] = (
+                polarity,
+                subjectivity,
+                intensity,
+                any(pos in by_pos for pos in pattern_sentiment.modifiers),
+            )
+
+        self.emoticons: Dict[str, float] = {}
+        for (_, polarity), faces in EMOTICONS.items():
+            for face in faces:
+                self.emoticons.setdefault(face.lower(), polarity)
+
+        self.abbreviations = frozenset(ABBREVIATIONS)
+        self._emoticon_spans = RE_EMOTICONS
+        self._sarcasm = RE_SARCASM
+        logger.info(f"Sentiment engine loaded {len(self.lexicon)} lexicon entries")
+
+    def _split_token(self, token: str, tokens: List[str]):
+        """Split leading/trailing punctuation off a token (pattern rules)."""
+        tail = []
+
+        while token.startswith(_LEADING_PUNCTUATION):
+            tokens.append(token[0])
+            token = token[1:]
+
+        while token.endswith(_TRAILING_PUNCTUATION):
+            if token.endswith(_LEADING_PUNCTUATION):
+                tail.append(token[-1])
+                token = token[:-1]
+            if token.endswith("..."):
+                tail.append("...")
+                token = token[:-3].rstrip(".")
+            if token.endswith("."):
+                if (
+                    token in self.abbreviations
+                    or _ABBR1.match(token)
+                    or _ABBR2.match(token)
+                    or _ABBR3.match(token)
+                ):
+                    break
+                tail.append(".")
+                token = token[:-1]
+
+        if token:
+            tokens.append(token)
+        tokens.extend(reversed(tail))
+
+    @staticmethod
+    def _sentences(tokens: List[str]) -> List[List[str]]:
+        """Group tokens into sentences (pattern rules, including its quirks)."""
+        sentences: List[List[str]] = [[]]
+        i = j = 0
+        while j < len(tokens):
+            if tokens[j] in _SENTENCE_END:
+                # Citations, trailing parentheses and repeated punctuation
+                # stay with the sentence
+                while j < len(tokens) and tokens[j] in _SENTENCE_TRAIL:
+                    if tokens[j] in ("'", '"') and sentences[-1].count(tokens[j]) % 2 == 0:
+                        break
+                    j += 1
+                sentences[-1].extend(token for token in tokens[i:j] if token != _EOS)
+                sentences.append([])
+                i = j
+            j += 1
+        sentences[-1].extend(tokens[i:j])
+        return [sentence for sentence in sentences if sentence]
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Tokenize text into lowercased words and punctuation marks.
+
+        Args:
+            text: Raw text
+
+        Returns:
+            List of tokens as the pattern tokenizer would produce them
+        """
+        text = _CONTRACTIONS.sub(r" \1", text).translate(_QUOTES)
+        text = _PARAGRAPH_BREAK.sub(f" {_EOS} ", text.replace("\r\n", "\n"))
+
+        tokens: List[str] = []
+        for raw in text.split():
+            self._split_token(raw, tokens)
+
+        # Punctuation split off above is re-joined into "(!)" and emoticons
+        # ("great:)" -> "great : )" -> "great :)"), within a sentence
+        words: List[str] = []
+        for sentence in self._sentences(tokens):
+            joined = self._sarcasm.sub("(!)", " ".join(sentence))
+            joined = self._emoticon_spans.sub(_join_emoticon, joined)
+            words.extend(joined.lower().split())
+
+        return words
+
+    def score(self, text: str) -> Sentiment:
+        """
+        Score a single text.
+
+        Args:
+            text: Raw text
+
+        Returns:
+            Tuple of (polarity, subjectivity)
+        """
+        lexicon = self.lexicon
+        assessments: List[List[float]] = []  # [polarity, subjectivity, intensity, negated]
+        modifier: Optional[str] = None
+        negation: Optional[str] = None
+
+        for word in self.tokenize(text):
+            entry = lexicon.get(word)
+
+            if entry is not None:
+                polarity, subjectivity, intensity, is_modifier = entry
+
+                if modifier is None:
+                    assessments.append([polarity, subjectivity, intensity, 1])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(polarity * last[2], 1.0))
+                    last[1] = max(-1.0, min(subjectivity * last[2], 1.0))
+                    last[2] = intensity
+
+                if negation is not None:
+                    assessments[-1][2] = 1.0 / assessments[-1][2]
+                    assessments[-1][3] = -1
+
+                modifier = word if is_modifier else None
+                negation = word if word in _NEGATIONS else None
+                continue
+
+            if word in _NEGATIONS:
+                negation = word
+            elif negation and len(word.strip("'")) > 1:
+                negation = None
+
+            if negation is not None and modifier is not None and modifier.endswith("ly"):
+                assessments[-1][3] = -1
+                negation = None
+            elif modifier and len(word) > 2:
+                modifier = None
+
+            if word == "!" and assessments:
+                assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+
+            if word == "(!)":
+                assessments.append([0.0, 1.0, 1.0, 1])
+
+            if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+                polarity = self.emoticons.get(word)
+                if polarity is not None:
+                    assessments.append([polarity, 1.0, 1.0, 1])
+
+        if not assessments:
+            return 0.0, 0.0
+
+        polarity_sum = 0.0
+        subjectivity_sum = 0.0
+        for polarity, subjectivity, _, negated in assessments:
+            polarity_sum += polarity * -0.5 if negated < 0 else polarity
+            subjectivity_sum += subjectivity
+
+        return polarity_sum / len(assessments), subjectivity_sum / len(assessments)
+
+    def score_many(self, texts: Sequence[str]) -> List[Sentiment]:
+        """
+        Score a batch of texts in one pass.
+
+        Args:
+            texts: Raw texts
+
+        Returns:
+            List of (polarity, subjectivity) tuples, in input order
+        """
+        return [self.score(str(text)) for text in texts]
+
+
+# Global engine instance
+_sentiment_engine: Optional[SentimentEngine] = None
+
+
+def get_sentiment_engine() -> SentimentEngine:
+    """
+    Get global sentiment engine instance.
+
+    Returns:
+        SentimentEngine instance (lexicon loaded once per process)
+    """
+    global _sentiment_engine
+
+    if _sentiment_engine is None:
+        _sentiment_engine = SentimentEngine()
+
+    return _sentiment_engine
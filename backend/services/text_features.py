@@ -0,0 +1,144 @@
+"""
+Text feature helpers: TF-IDF cleaning and the sentiment/length transformer.
+
+These depend on nltk and scikit-learn, which are slow to import, so the
+rest of the service layer only imports this module on first use.
+
+NLTK data is never downloaded at runtime (that hangs on hosts without
+network access). It is pre-baked into ``settings.nltk_data_dir`` at build
+time by ``scripts/prebake_nltk_data.py``; if a resource is still missing
+the helpers fall back to whitespace tokenization and an empty stopword
+list and log a warning.
+"""
+
+import string
+from pathlib import Path
+from typing import List
+import logging
+
+import nltk
+import numpy as np
+from nltk.stem import PorterStemmer
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from config.settings import get_settings
+from .sentiment_engine import get_sentiment_engine
+
+logger = logging.getLogger(__name__)
+
+# NLTK resources used here, as (nltk.data.find path, downloader package)
+NLTK_RESOURCES = [
+    ("tokenizers/punkt_tab", "punkt_tab"),
+    ("corpora/stopwords", "stopwords"),
+]
+
+
+def _has_nltk_resource(path: str) -> bool:
+    """Check whether an NLTK resource is available locally."""
+    try:
+        nltk.data.find(path)
+        return True
+    except LookupError:
+        return False
+
+
+# Use the pre-baked data directory ahead of NLTK's default search path
+_nltk_data_dir = Path(get_settings().nltk_data_dir).resolve()
+if _nltk_data_dir.is_dir() and str(_nltk_data_dir) not in nltk.data.path:
+    nltk.data.path.insert(0, str(_nltk_data_dir))
+
+_missing = [package for path, package in NLTK_RESOURCES if not _has_nltk_resource(path)]
+if _missing:
+    logger.warning(
+        f"NLTK data missing ({', '.join(_missing)}); run scripts/prebake_nltk_data.py. "
+        "Falling back to whitespace tokenization."
+    )
+
+# Initialize stemmer and stopwords
+stemmer = PorterStemmer()
+try:
+    from nltk.corpus import stopwords
+    stop_words = set(stopwords.words('english'))
+except Exception:
+    stop_words = set()
+    logger.warning("Failed to load stopwords")
+
+_punkt_available = _has_nltk_resource("tokenizers/punkt_tab")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Tokenize with punkt when available, otherwise on whitespace."""
+    if _punkt_available:
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(text)
+    return text.split()
+
+
+class TextStatsExtractor(BaseEstimator, TransformerMixin):
+    """
+    Extracts sentiment and length features from text.
+    
+    This transformer is used in the ML pipeline to extract additional
+    features beyond TF-IDF.
+    """
+    
+    def fit(self, X, y=None):
+        """Fit method (no-op for this transformer)."""
+        return self
+    
+    def transform(self, X):
+        """
+        Transform text into statistical features.
+        
+        Args:
+            X: List of text strings
+            
+        Returns:
+            numpy array of shape (n_samples, 4) with features:
+            [length, word_count, sentiment_polarity, sentiment_subjectivity]
+        """
+        texts = [str(text) for text in X]
+        try:
+            sentiments = get_sentiment_engine().score_many(texts)
+        except Exception:
+            return np.array([[0, 0, 0, 0] for _ in texts])
+        
+        features = [
+            [
+                len(text),                      # Length
+                len(text.split()),              # Word Count
+                polarity,                       # Sentiment (-1 to 1)
+                subjectivity                    # Subjectivity (0 to 1)
+            ]
+            for text, (polarity, subjectivity) in zip(texts, sentiments)
+        ]
+        return np.array(features)
+
+
+def clean_for_tfidf(text: str) -> str:
+    """
+    Clean text for TF-IDF vectorization.
+    
+    Args:
+        text: Raw text to clean
+        
+    Returns:
+        Cleaned and stemmed text
+    """
+    if not isinstance(text, str):
+        return ""
+    
+    # Remove punctuation
+    text = text.translate(str.maketrans('', '', string.punctuation))
+    
+    # Tokenize
+    tokens = _tokenize(text)
+    
+    # Stem and filter
+    tokens = [
+        stemmer.stem(w) 
+        for w in tokens 
+        if w not in stop_words and len(w) > 2
+    ]
+    
+    return " ".join(tokens)
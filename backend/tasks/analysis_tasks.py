@@ -7,7 +7,7 @@ text analysis, batch processing, and web scraping.
 
 from celery import Task
 from celery_app import celery_app
-from services.analysis_service import get_analysis_service
+from services.model_lifecycle import get_model_lifecycle
 from db import history, users
 from bson import ObjectId
 import asyncio
@@ -31,7 +31,7 @@ class AsyncAnalysisTask(Task):
     def analysis_service(self):
         """Get or create analysis service instance."""
         if self._analysis_service is None:
-            self._analysis_service = get_analysis_service()
+            self._analysis_service = get_model_lifecycle().ensure_loaded()
         return self._analysis_service
 
 
@@ -157,76 +157,68 @@ def batch_analyze_async(
         successful = 0
         failed = 0
         
-        for i, text in enumerate(texts):
-            try:
-                # Update task progress
-                self.update_state(
-                    state="PROGRESS",
-                    meta={
-                        "current": i + 1,
-                        "total": len(texts),
-                        "status": f"Analyzing text {i + 1}/{len(texts)}"
-                    }
-                )
-                
-                # Analyze text
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                try:
-                    verdict, html, prob = loop.run_until_complete(
-                        self.analysis_service.analyze(text)
-                    )
-                finally:
-                    loop.close()
-                
-                confidence = max(prob.values()) * 100 if prob else 0.0
-                
-                result = {
-                    "index": i,
-                    "text": text[:100] + "..." if len(text) > 100 else text,
+        self.update_state(
+            state="PROGRESS",
+            meta={
+                "current": 0,
+                "total": len(texts),
+                "status": f"Analyzing {len(texts)} texts"
+            }
+        )
+        
+        # Analyze all texts with a single vectorized model call
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            analyses = loop.run_until_complete(
+                self.analysis_service.analyze_results(texts)
+            )
+        finally:
+            loop.close()
+        
+        history_docs = []
+        
+        # Batch results carry no HTML, so none is rendered
+        for i, (text, analysis) in enumerate(zip(texts, analyses)):
+            verdict = analysis.title
+            prob = analysis.probabilities
+            confidence = analysis.confidence
+            
+            results.append({
+                "index": i,
+                "text": text[:100] + "..." if len(text) > 100 else text,
+                "verdict": verdict,
+                "confidence": confidence,
+                "scores": prob,
+                "status": "success",
+            })
+            successful += 1
+            
+            if save_to_history and user_id:
+                history_docs.append({
+                    "user_id": ObjectId(user_id),
+                    "query": bleach.clean(text),
+                    "translated": None,
                     "verdict": verdict,
                     "confidence": confidence,
                     "scores": prob,
-                    "status": "success",
-                }
-                
-                results.append(result)
-                successful += 1
-                
-                # Save to history if requested
-                if save_to_history and user_id:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        loop.run_until_complete(
-                            history.insert_one({
-                                "user_id": ObjectId(user_id),
-                                "query": bleach.clean(text),
-                                "translated": None,
-                                "verdict": verdict,
-                                "confidence": confidence,
-                                "scores": prob,
-                                "sources": [],
-                                "reviewed": False,
-                                "correct": None,
-                                "batch_task": True,
-                                "batch_index": i,
-                            })
-                        )
-                    finally:
-                        loop.close()
-            
-            except Exception as e:
-                logger.error(f"Failed to analyze text {i}: {e}")
-                results.append({
-                    "index": i,
-                    "text": text[:100] + "..." if len(text) > 100 else text,
-                    "status": "error",
-                    "error": str(e),
+                    "sources": [],
+                    "reviewed": False,
+                    "correct": None,
+                    "batch_task": True,
+                    "batch_index": i,
                 })
-                failed += 1
+        
+        # Save to history if requested
+        if history_docs:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            
+            try:
+                loop.run_until_complete(history.insert_many(history_docs))
+            finally:
+                loop.close()
         
         summary = {
             "status": "completed",
@@ -381,3 +373,50 @@ def scrape_and_analyze_async(
                 "error": str(e),
                 "url": url,
             }
+
+
+@celery_app.task(
+    bind=True,
+    base=AsyncAnalysisTask,
+    name="tasks.analysis_tasks.explain_perturbation_async",
+    max_retries=1,
+    default_retry_delay=30,
+)
+def explain_perturbation_async(
+    self,
+    text: str,
+    num_samples: Optional[int] = None,
+    seed: Optional[int] = None,
+    top_k: int = 10,
+) -> Dict:
+    """
+    Compute a perturbation explanation for a long text.
+    
+    Args:
+        text: Text to explain
+        num_samples: Masked variants to score
+        seed: Sampling seed
+        top_k: Words returned
+        
+    Returns:
+        Dict with the explanation
+    """
+    try:
+        logger.info(f"Starting perturbation explanation (length: {len(text)}, samples: {num_samples})")
+        
+        explanation = self.analysis_service.explain_perturbation(
+            text, num_samples=num_samples, seed=seed, top_k=top_k
+        )
+        explanation["status"] = "success"
+        return explanation
+    
+    except Exception as e:
+        logger.error(f"Perturbation explanation failed: {e}", exc_info=True)
+        
+        try:
+            raise self.retry(exc=e)
+        except self.MaxRetriesExceededError:
+            return {
+                "status": "error",
+                "error": str(e),
+            }
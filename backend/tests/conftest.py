@@ -0,0 +1,49 @@
+"""
+Shared test setup.
+
+Tests import the backend packages the way the API does, from the backend
+directory, and use the bundled model pickles and sample corpus.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(BACKEND_DIR))
+
+MODEL_PATH = str(BACKEND_DIR / "model_final.pkl")
+TFIDF_PATH = str(BACKEND_DIR / "tfidf_final.pkl")
+
+
+@pytest.fixture(scope="session")
+def model_paths():
+    """Paths of the bundled model and vectorizer pickles."""
+    return MODEL_PATH, TFIDF_PATH
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Database file of a fresh local SQLite cache."""
+    return str(tmp_path / "cache.sqlite3")
+
+
+@pytest.fixture
+def make_cache(cache_path):
+    """
+    Factory of cache managers on one SQLite file.
+
+    Managers built by the same test share storage, like worker processes
+    on one host. TTL jitter is off unless asked for.
+    """
+    from cache import CacheManager, SQLiteBackend
+
+    def make(**kwargs):
+        kwargs.setdefault("ttl_jitter", 0.0)
+        backend = SQLiteBackend(cache_path, poll_interval=kwargs.pop("poll_interval", 0.02))
+        return CacheManager("redis://unused", backend=backend, **kwargs)
+
+    return make
@@ -0,0 +1,176 @@
+"""
+Cache admission rules: frequency gating, sizes, TTL tiers, negative entries.
+
+Runs on the SQLite backend, and on the Redis backend's Lua admission
+script and BITFIELD sketch when fakeredis is installed.
+"""
+
+import asyncio
+
+import pytest
+
+from cache import AdmissionPolicy, CacheManager, CacheRule, RedisBackend
+
+
+def _policy() -> AdmissionPolicy:
+    """Fresh rules (with their own event counts) for one manager."""
+    return AdmissionPolicy(
+        [
+            CacheRule("analysis:", max_bytes=200, negative_ttl=30, min_frequency=2),
+            CacheRule("tiered:", size_ttls=[(20, 60), (100, 300)]),
+            CacheRule("explain:", ttl=120),
+        ],
+        sketch_width=1024,
+    )
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_admitting_cache(request, make_cache):
+    """Factory of managers with the test rules, on one shared store."""
+    if request.param == "sqlite":
+        return lambda: make_cache(admission=_policy())
+
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def make():
+        backend = RedisBackend("redis://unused")
+        backend._client = fakeredis.aioredis.FakeRedis(server=server)
+        return CacheManager("redis://unused", ttl_jitter=0.0, admission=_policy(), backend=backend)
+
+    return make
+
+
+def _run(cache: CacheManager, scenario):
+    """Run a scenario against a manager and disconnect it."""
+    async def run():
+        try:
+            return await scenario(cache)
+        finally:
+            await cache.disconnect()
+
+    return asyncio.run(run())
+
+
+def test_keys_are_admitted_after_enough_lookups(make_admitting_cache):
+    cache = make_admitting_cache()
+    key = "analysis:g0:v2:popular"
+
+    async def scenario(cache):
+        stored = []
+        for _ in range(3):
+            await cache.get(key)
+            stored.append(await cache.set(key, {"verdict": "real"}, ttl=600))
+        return stored, await cache.get(key)
+
+    stored, value = _run(cache, scenario)
+
+    # The first lookup is not enough with min_frequency=2
+    assert stored == [False, True, True]
+    assert value == {"verdict": "real"}
+    events = cache.policy.get_stats()["analysis"]
+    assert events["rejected_frequency"] == 1
+    assert events["admitted"] == 2
+
+
+def test_lookups_count_across_processes(make_admitting_cache):
+    key = "analysis:g0:v2:shared"
+
+    async def lookup(cache):
+        return await cache.get(key)
+
+    async def write(cache):
+        return await cache.set(key, {"verdict": "real"}, ttl=600)
+
+    # One lookup in each of two processes, then a write from a third
+    _run(make_admitting_cache(), lookup)
+    _run(make_admitting_cache(), lookup)
+    assert _run(make_admitting_cache(), write)
+
+
+def test_set_many_returns_the_admitted_keys(make_admitting_cache):
+    cache = make_admitting_cache()
+    popular = [f"analysis:g0:v2:popular:{i}" for i in range(3)]
+    once = [f"analysis:g0:v2:once:{i}" for i in range(2)]
+    ungated = ["other:1", "explain:1"]
+
+    async def scenario(cache):
+        await cache.get_many(popular + once)
+        await cache.get_many(popular)
+        return await cache.set_many(
+            {key: {"key": key} for key in popular + once + ungated}, ttl=600
+        )
+
+    assert _run(cache, scenario) == popular + ungated
+    events = cache.policy.get_stats()["analysis"]
+    assert events["admitted"] == len(popular)
+    assert events["rejected_frequency"] == len(once)
+
+
+def test_oversized_values_are_rejected(make_admitting_cache):
+    cache = make_admitting_cache()
+    key = "analysis:g0:v2:large"
+
+    async def scenario(cache):
+        await cache.get_many([key, key])
+        return await cache.set(key, {"text": "x" * 500}, ttl=600), await cache.get(key)
+
+    assert _run(cache, scenario) == (False, None)
+    assert cache.policy.get_stats()["analysis"]["rejected_size"] == 1
+
+
+def test_negative_entries_get_the_rule_ttl(make_admitting_cache):
+    cache = make_admitting_cache()
+    key = "analysis:g0:v2:error"
+
+    async def scenario(cache):
+        # Negative entries skip the frequency check
+        stored = await cache.set(key, {"error": "Text Too Short"}, ttl=600, negative=True)
+        return stored, await cache.get_ttl(key)
+
+    stored, ttl = _run(cache, scenario)
+
+    assert stored
+    assert 25 <= ttl <= 30
+    assert cache.policy.get_stats()["analysis"]["negative"] == 1
+
+
+def test_negative_entries_need_a_rule_with_a_negative_ttl(make_admitting_cache):
+    cache = make_admitting_cache()
+
+    async def scenario(cache):
+        return await cache.set_many(
+            {"explain:error": {"error": 1}, "other:error": {"error": 1}, "other:ok": {"ok": 1}},
+            ttl=600,
+            negative=["explain:error", "other:error"],
+        )
+
+    assert _run(cache, scenario) == ["other:ok"]
+    assert cache.policy.get_stats()["explain"]["rejected_negative"] == 1
+
+
+def test_ttls_follow_rules_and_size_tiers(make_admitting_cache):
+    cache = make_admitting_cache()
+
+    async def scenario(cache):
+        await cache.set_many(
+            {
+                "tiered:small": "x",
+                "tiered:medium": "x" * 50,
+                "tiered:large": "x" * 500,
+                "explain:1": "x",
+            },
+            ttl=600,
+            serialize="text",
+        )
+        return [
+            await cache.get_ttl(key)
+            for key in ("tiered:small", "tiered:medium", "tiered:large", "explain:1")
+        ]
+
+    small, medium, large, explain = _run(cache, scenario)
+
+    assert 55 <= small <= 60
+    assert 295 <= medium <= 300
+    assert 595 <= large <= 600
+    assert 115 <= explain <= 120
@@ -0,0 +1,143 @@
+"""
+Single-flight computation of concurrent cache misses.
+
+Two managers on one SQLite file stand in for two worker processes: the
+lease is taken in storage, so only one of them computes a missing value.
+"""
+
+import asyncio
+
+import pytest
+
+KEY = "analysis:g0:v2:single-flight"
+
+
+def test_concurrent_misses_in_one_process_compute_once(make_cache):
+    cache = make_cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"verdict": "real"}
+
+    async def run():
+        try:
+            return await asyncio.gather(*(cache.get_or_compute(KEY, compute) for _ in range(5)))
+        finally:
+            await cache.disconnect()
+
+    values = asyncio.run(run())
+
+    assert values == [{"verdict": "real"}] * 5
+    assert len(calls) == 1
+    assert cache.coalesced_local == 4
+
+
+def test_lease_follower_waits_for_the_winner(make_cache):
+    winner, follower = make_cache(lease_poll=0.01), make_cache(lease_poll=0.01)
+    computed = {"winner": 0, "follower": 0}
+
+    def computing(name, delay):
+        async def compute():
+            computed[name] += 1
+            await asyncio.sleep(delay)
+            return {"by": name}
+        return compute
+
+    async def run():
+        try:
+            first = asyncio.create_task(winner.get_or_compute(KEY, computing("winner", 0.2)))
+            # Let the winner take the lease before the follower misses
+            await asyncio.sleep(0.05)
+            second = await follower.get_or_compute(KEY, computing("follower", 0))
+            return await first, second
+        finally:
+            await winner.disconnect()
+            await follower.disconnect()
+
+    first, second = asyncio.run(run())
+
+    assert first == second == {"by": "winner"}
+    assert computed == {"winner": 1, "follower": 0}
+    assert follower.coalesced_remote == 1
+
+
+def test_follower_computes_when_the_winner_fails(make_cache):
+    winner, follower = make_cache(lease_poll=0.01), make_cache(lease_poll=0.01)
+
+    async def failing():
+        await asyncio.sleep(0.1)
+        raise RuntimeError("model crashed")
+
+    async def compute():
+        return {"by": "follower"}
+
+    async def run():
+        try:
+            first = asyncio.create_task(winner.get_or_compute(KEY, failing))
+            await asyncio.sleep(0.02)
+            second = await follower.get_or_compute(KEY, compute)
+            with pytest.raises(RuntimeError):
+                await first
+            return second
+        finally:
+            await winner.disconnect()
+            await follower.disconnect()
+
+    # The failed winner releases its lease, so the follower stops waiting
+    # and computes the value itself
+    assert asyncio.run(run()) == {"by": "follower"}
+    assert follower.coalesced_remote == 0
+    assert follower.lease_timeouts == 0
+
+
+def test_lease_is_released_after_computing(make_cache):
+    cache = make_cache()
+
+    async def compute():
+        return 1
+
+    async def run():
+        try:
+            await cache.get_or_compute(KEY, compute)
+            return await cache._acquire_leases([KEY])
+        finally:
+            await cache.disconnect()
+
+    token, = asyncio.run(run())
+    assert token is not None
+
+
+def test_batch_misses_split_between_leaders_and_followers(make_cache):
+    first, second = make_cache(lease_poll=0.01), make_cache(lease_poll=0.01)
+    keys = [f"{KEY}:{i}" for i in range(4)]
+    computed = {"first": [], "second": []}
+
+    def computing(cache, name, delay):
+        async def compute(indices):
+            await asyncio.sleep(delay)
+            computed[name].extend(keys[i] for i in indices)
+            values = {keys[i]: {"by": name} for i in indices}
+            await cache.set_many(values, ttl=60)
+            return list(values.values())
+        return compute
+
+    async def run():
+        try:
+            # The first manager leases the first two keys only
+            task = asyncio.create_task(
+                first.get_or_compute_many(keys[:2], computing(first, "first", 0.1))
+            )
+            await asyncio.sleep(0.02)
+            values = await second.get_or_compute_many(keys, computing(second, "second", 0))
+            await task
+            return values
+        finally:
+            await first.disconnect()
+            await second.disconnect()
+
+    values = asyncio.run(run())
+
+    assert values == [{"by": "first"}] * 2 + [{"by": "second"}] * 2
+    assert computed == {"first": keys[:2], "second": keys[2:]}
@@ -0,0 +1,101 @@
+"""
+Stale-while-revalidate: expired values are served while one refresh runs.
+"""
+
+import asyncio
+
+KEY = "analysis:g0:v2:stale"
+
+
+def _write(make_cache, value, ttl):
+    """Cache a value with no grace period, as seen by a manager with one."""
+    async def run():
+        writer = make_cache()
+        try:
+            await writer.set(KEY, value, ttl=ttl)
+        finally:
+            await writer.disconnect()
+
+    asyncio.run(run())
+
+
+def test_fresh_value_is_not_stale(make_cache):
+    cache = make_cache(stale_ttl=60)
+
+    async def run():
+        try:
+            await cache.set(KEY, {"n": 1}, ttl=600)
+            return await cache.get_with_status(KEY)
+        finally:
+            await cache.disconnect()
+
+    assert asyncio.run(run()) == ({"n": 1}, False)
+    assert cache.stale_hits == 0
+
+
+def test_stale_value_is_served_and_refreshed_once(make_cache):
+    # 30s left of a 60s grace period: past the soft TTL
+    _write(make_cache, {"n": 1}, ttl=30)
+    cache = make_cache(stale_ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"n": 2}
+
+    async def run():
+        try:
+            served = await asyncio.gather(*(cache.get_or_compute(KEY, compute) for _ in range(5)))
+            # Wait for the background refresh
+            await asyncio.gather(*cache._refreshing.values())
+            return served, await cache.get_with_status(KEY)
+        finally:
+            await cache.disconnect()
+
+    served, after = asyncio.run(run())
+
+    assert served == [{"n": 1}] * 5
+    assert after == ({"n": 2}, False)
+    assert len(calls) == 1
+    assert cache.refreshes == 1
+    assert cache.stale_hits == 5
+
+
+def test_stale_value_stays_out_of_l1(make_cache):
+    _write(make_cache, {"n": 1}, ttl=30)
+    cache = make_cache(stale_ttl=60, l1_max_bytes=1 << 20)
+
+    async def run():
+        try:
+            return [await cache.get_with_status(KEY) for _ in range(2)]
+        finally:
+            await cache.disconnect()
+
+    # Every read goes to storage and sees the value as stale
+    assert asyncio.run(run()) == [({"n": 1}, True)] * 2
+    assert cache.l1_hits == 0
+
+
+def test_refresh_is_skipped_while_another_process_holds_the_lease(make_cache):
+    _write(make_cache, {"n": 1}, ttl=30)
+    holder, cache = make_cache(), make_cache(stale_ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"n": 2}
+
+    async def run():
+        try:
+            await holder._acquire_leases([KEY])
+            value = await cache.get_or_compute(KEY, compute)
+            await asyncio.gather(*cache._refreshing.values())
+            return value
+        finally:
+            await holder.disconnect()
+            await cache.disconnect()
+
+    assert asyncio.run(run()) == {"n": 1}
+    assert calls == []
+    assert cache.refreshes == 0
@@ -0,0 +1,55 @@
+"""
+Parity of the compiled fast scorer with sklearn's predict_proba.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from ml.fast_scorer import CompiledLinearScorer
+from scripts.sample_corpus import SAMPLE_ARTICLES
+
+# The fixed corpus, a long concatenated document and inputs that stress
+# tokenization (no known terms, accents, punctuation, repeated terms)
+CORPUS = SAMPLE_ARTICLES + [
+    " ".join(SAMPLE_ARTICLES * 5),
+    "",
+    "zzzz qqqq xxxx",
+    "Élection présidentielle: résultats officiels publiés à 20h.",
+    "BREAKING!!! government government government SHARE NOW...",
+    "   leading and trailing whitespace\n\nwith a paragraph break   ",
+]
+
+
+@pytest.fixture(scope="module")
+def bundled_model(model_paths):
+    model_path, tfidf_path = model_paths
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    with open(tfidf_path, "rb") as f:
+        tfidf = pickle.load(f)
+    return model, tfidf
+
+
+@pytest.fixture(scope="module")
+def scorer(bundled_model):
+    scorer = CompiledLinearScorer.compile(*bundled_model)
+    assert scorer is not None, "bundled model does not support the compiled fast path"
+    return scorer
+
+
+def test_matches_predict_proba(bundled_model, scorer):
+    model, tfidf = bundled_model
+    expected = model.predict_proba(tfidf.transform(CORPUS))
+    actual = scorer.predict_proba(CORPUS)
+
+    assert actual.shape == expected.shape
+    assert np.max(np.abs(actual - expected)) < CompiledLinearScorer.PARITY_TOLERANCE
+
+
+def test_single_texts_match_batch(scorer):
+    batch = scorer.predict_proba(CORPUS)
+    single = np.vstack([scorer.predict_proba([text]) for text in CORPUS])
+
+    assert np.max(np.abs(batch - single)) < CompiledLinearScorer.PARITY_TOLERANCE
@@ -0,0 +1,72 @@
+"""
+Micro-batching of analyses, in-process and in front of the process pool.
+"""
+
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from scripts.sample_corpus import SAMPLE_ARTICLES
+from services.analysis_service import AnalysisService
+from services.inference_executor import InferenceExecutor
+
+TEXTS = SAMPLE_ARTICLES[:8]
+
+
+def _batch_size_count() -> float:
+    """Batches observed by the ``inference_batch_size`` histogram."""
+    return REGISTRY.get_sample_value("inference_batch_size_count") or 0.0
+
+
+def test_concurrent_analyses_share_a_model_call(model_paths):
+    model_path, tfidf_path = model_paths
+    service = AnalysisService(
+        model_path=model_path,
+        tfidf_path=tfidf_path,
+        enable_cache=False,
+        batch_window_ms=50,
+    )
+    before = _batch_size_count()
+
+    async def run():
+        return await asyncio.gather(*(service.analyze_result(text) for text in TEXTS))
+
+    results = asyncio.run(run())
+
+    assert all(result.ok for result in results)
+    assert service.batcher.largest_batch > 1
+    assert service.batcher.texts_scored == len(TEXTS)
+    assert _batch_size_count() > before
+
+
+def test_executor_submissions_are_batched(model_paths):
+    model_path, tfidf_path = model_paths
+    executor = InferenceExecutor(model_path, tfidf_path, max_workers=1)
+    service = AnalysisService(
+        model_path=model_path,
+        tfidf_path=tfidf_path,
+        enable_cache=False,
+        batch_window_ms=50,
+        load_on_init=False,
+    )
+    before = _batch_size_count()
+
+    async def run():
+        await executor.start()
+        # Attached after startup, like the model lifecycle does
+        service.executor = executor
+        try:
+            return await asyncio.gather(*(service.analyze_result(text) for text in TEXTS))
+        finally:
+            await executor.shutdown()
+
+    results = asyncio.run(run())
+    in_process = AnalysisService(model_path=model_path, tfidf_path=tfidf_path, enable_cache=False)
+    expected = asyncio.run(in_process.analyze_results(TEXTS))
+
+    assert [result.title for result in results] == [result.title for result in expected]
+    # Fewer pool submissions than requests, each with several texts
+    stats = service._executor_batchers[False].get_stats()
+    assert executor.completed == stats["batches_scored"] < len(TEXTS)
+    assert stats["largest_batch"] > 1
+    assert _batch_size_count() > before
@@ -0,0 +1,70 @@
+"""
+Near-duplicate reuse of cached analyses under the default cache rules.
+
+With the default admission rule a result is only written once its text
+has been looked up twice, so the index must only hold results that were
+actually cached.
+"""
+
+import asyncio
+
+import pytest
+
+from cache import AdmissionPolicy, NearDuplicateIndex
+from config.settings import Settings
+from scripts.sample_corpus import SAMPLE_ARTICLES
+from services.analysis_service import AnalysisService
+
+STORY = "\n\n".join(article for article in SAMPLE_ARTICLES if len(article) > 80)[:1500]
+COPY = f"By Staff Reporter\n\n{STORY}\n\nShare this article. Follow us for updates."
+
+
+@pytest.fixture
+def service(model_paths, make_cache):
+    model_path, tfidf_path = model_paths
+    service = AnalysisService(
+        model_path=model_path,
+        tfidf_path=tfidf_path,
+        near_duplicates=NearDuplicateIndex(threshold=0.8),
+    )
+    default_rules = Settings.model_fields["cache_rules"].default
+    service.cache = make_cache(admission=AdmissionPolicy.from_config(default_rules, sketch_width=1024))
+    return service
+
+
+def test_rejected_results_are_not_indexed(service):
+    async def scenario():
+        try:
+            first = await service.analyze_result(STORY)
+            indexed = len(service.near_duplicates)
+            copy = await service.analyze_result(COPY)
+            return first, indexed, copy
+        finally:
+            await service.cache.disconnect()
+
+    first, indexed, copy = asyncio.run(scenario())
+
+    # One lookup each is not enough for the default rule to admit them
+    assert first.ok
+    assert service.cache.policy.get_stats()["analysis"]["rejected_frequency"] == 2
+    assert indexed == 0
+    assert copy.ok and copy.similarity is None
+    assert service.near_duplicates.hits == 0
+
+
+def test_repasted_near_duplicate_reuses_the_cached_result(service):
+    async def scenario():
+        try:
+            await service.analyze_result(STORY)
+            await service.analyze_result(STORY)
+            indexed = len(service.near_duplicates)
+            return indexed, await service.analyze_result(COPY)
+        finally:
+            await service.cache.disconnect()
+
+    indexed, copy = asyncio.run(scenario())
+
+    # The second lookup admits the story, which is then indexed
+    assert indexed == 1
+    assert copy.similarity is not None and copy.similarity >= 0.8
+    assert service.near_duplicates.hits == 1
@@ -0,0 +1,59 @@
+"""
+Red-flag phrase matches, from the detector to the analyze response.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analyze_router import router
+from dependencies import get_analysis_service_dependency, get_current_user_optional
+from services.analysis_result import AnalysisResult
+from services.analysis_service import AnalysisService
+
+CLICKBAIT = (
+    "SHOCKING: doctors don't want you to know this one secret trick that cures "
+    "everything. Share this before it gets censored!"
+)
+
+
+@pytest.fixture(scope="module")
+def service(model_paths):
+    model_path, tfidf_path = model_paths
+    return AnalysisService(model_path=model_path, tfidf_path=tfidf_path, enable_cache=False)
+
+
+def test_result_carries_match_offsets(service):
+    result = asyncio.run(service.analyze_result(CLICKBAIT))
+
+    assert result.red_flag_matches
+    for start, end, phrase in result.red_flag_matches:
+        assert CLICKBAIT[start:end].lower() == phrase
+    assert "Contains clickbait trigger words" in result.reasons
+
+
+def test_matches_survive_the_cache_layout(service):
+    result = asyncio.run(service.analyze_result(CLICKBAIT))
+    restored = AnalysisResult.from_dict(result.to_dict())
+
+    assert restored.red_flag_matches == result.red_flag_matches
+
+
+def test_analyze_returns_matches_when_selected(service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_analysis_service_dependency] = lambda: service
+    app.dependency_overrides[get_current_user_optional] = lambda: None
+    client = TestClient(app)
+
+    default = client.post("/api/v1/analyze", json={"text": CLICKBAIT}).json()
+    selected = client.post(
+        "/api/v1/analyze?fields=verdict,red_flag_matches", json={"text": CLICKBAIT}
+    ).json()
+
+    assert "red_flag_matches" not in default
+    assert selected["red_flag_matches"]
+    for match in selected["red_flag_matches"]:
+        assert CLICKBAIT[match["start"]:match["end"]].lower() == match["phrase"]
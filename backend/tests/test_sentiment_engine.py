@@ -0,0 +1,51 @@
+"""
+Parity of the batch sentiment engine with TextBlob.
+"""
+
+import pytest
+from textblob import TextBlob
+
+from scripts.sample_corpus import SAMPLE_ARTICLES
+from services.sentiment_engine import TEXTBLOB_TOLERANCE, SentimentEngine
+
+# Emoticons glued to words, sarcasm marks, paragraph breaks, quotes and
+# abbreviations, which the pattern tokenizer splits and re-joins
+EDGE_CASES = [
+    "terrible:)",
+    "news:) ok",
+    "awful :( but ok:)",
+    "bad:(",
+    "great:)",
+    "sad:'(",
+    "ok>:(",
+    "wow:-)bad",
+    "nice!! :D:D",
+    "good :-) yes",
+    "it was fine (!) really",
+    "it was fine ( ! ) really",
+    "Hello.\n\nGreat :)",
+    'He said "great." Then :) fine',
+    "The U.S. economy is not very good... :( Mr. Smith disagrees!",
+    "I don't think it's bad, it isn't awful.",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return SentimentEngine()
+
+
+@pytest.mark.parametrize("text", list(SAMPLE_ARTICLES) + EDGE_CASES)
+def test_matches_textblob(engine, text):
+    expected = TextBlob(text).sentiment
+    polarity, subjectivity = engine.score(text)
+
+    assert abs(polarity - expected.polarity) <= TEXTBLOB_TOLERANCE
+    assert abs(subjectivity - expected.subjectivity) <= TEXTBLOB_TOLERANCE
+
+
+def test_score_many_matches_score(engine):
+    texts = list(SAMPLE_ARTICLES) + EDGE_CASES
+
+    assert engine.score_many(texts) == [engine.score(text) for text in texts]
@@ -0,0 +1,196 @@
+"""
+Consistent-hash routing over several nodes, with nodes marked down.
+
+The sharded backend is exercised with SQLite files as healthy nodes and a
+Redis URL nothing listens on as the failing one.
+"""
+
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from cache import CacheManager, HashRing, SQLiteBackend, ShardedRedisBackend
+from cache.sharding import hash_key
+
+NODES = [f"redis://node{i}:6379" for i in range(4)]
+KEYS = [f"analysis:g0:v2:{i}" for i in range(5000)]
+
+# Nothing listens on port 1
+UNREACHABLE = "redis://127.0.0.1:1/0"
+
+
+def test_keys_spread_evenly():
+    ring = HashRing(NODES)
+    counts = Counter(ring.node_for(key) for key in KEYS)
+
+    assert set(counts) == set(NODES)
+    assert max(counts.values()) < 1.3 * len(KEYS) / len(NODES)
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing(NODES)
+    before = {key: ring.node_for(key) for key in KEYS}
+    ring.add_node("redis://node4:6379")
+    moved = {key: ring.node_for(key) for key in KEYS if ring.node_for(key) != before[key]}
+
+    assert set(moved.values()) == {"redis://node4:6379"}
+    assert len(moved) < 1.5 * len(KEYS) / 5
+
+
+def test_keys_of_a_down_node_spread_over_the_others():
+    ring = HashRing(NODES, retry_interval=30)
+    before = {key: ring.node_for(key) for key in KEYS}
+    down = NODES[0]
+    ring.mark_down(down)
+    after = {key: ring.node_for(key) for key in KEYS}
+
+    # Only the down node's keys move, and not all to one node
+    moved = {key for key in KEYS if after[key] != before[key]}
+    assert moved == {key for key in KEYS if before[key] == down}
+    assert set(after[key] for key in moved) == set(NODES[1:])
+    assert ring.get_stats()["down"] == [down]
+
+
+def test_down_node_is_retried_after_the_interval():
+    ring = HashRing(NODES, retry_interval=0.05)
+    before = {key: ring.node_for(key) for key in KEYS}
+    ring.mark_down(NODES[0])
+    time.sleep(0.06)
+
+    assert {key: ring.node_for(key) for key in KEYS} == before
+    assert ring.get_stats()["down"] == []
+
+
+def test_marking_down_needs_health_aware_mode():
+    ring = HashRing(NODES)
+    before = {key: ring.node_for(key) for key in KEYS}
+    ring.mark_down(NODES[0])
+
+    assert {key: ring.node_for(key) for key in KEYS} == before
+
+
+def test_keys_stay_on_their_primary_when_every_node_is_down():
+    ring = HashRing(NODES, retry_interval=30)
+    primaries = {key: next(ring.preference(key)) for key in KEYS[:100]}
+    for node in NODES:
+        ring.mark_down(node)
+
+    assert {key: ring.node_for(key) for key in KEYS[:100]} == primaries
+
+
+def test_hash_tags_keep_related_keys_together():
+    ring = HashRing(NODES)
+
+    assert hash_key("lease:{analysis:1}") == "analysis:1"
+    assert hash_key("no:{}:tag") == "no:{}:tag"
+    assert len({ring.node_for(f"{{user:42}}:{suffix}") for suffix in range(50)}) == 1
+
+
+@pytest.fixture
+def make_sharded(tmp_path):
+    """Sharded backend over three SQLite nodes (plus optional extra URLs)."""
+    def make(extra=(), retry_interval=30):
+        urls = [f"redis://shard{i}:6379" for i in range(3)] + list(extra)
+        backend = ShardedRedisBackend(urls, vnodes=64, retry_interval=retry_interval)
+        for i, url in enumerate(urls[:3]):
+            backend.shards[url] = SQLiteBackend(str(tmp_path / f"shard{i}.sqlite3"))
+        return backend
+
+    return make
+
+
+def test_batches_are_split_by_node(make_sharded):
+    backend = make_sharded()
+    cache = CacheManager("redis://unused", ttl_jitter=0.0, backend=backend)
+    keys = KEYS[:200]
+
+    async def scenario():
+        try:
+            await cache.set_many({key: i for i, key in enumerate(keys)}, ttl=60)
+            values = await cache.get_many(keys)
+            # Every key is stored on the node the ring picked, and only there
+            placement = {}
+            for key in keys:
+                found = [
+                    url for url, shard in backend.shards.items()
+                    if (await shard.get_many([key]))[0][0] is not None
+                ]
+                placement[key] = found
+            return values, placement
+        finally:
+            await cache.disconnect()
+
+    values, placement = asyncio.run(scenario())
+
+    assert values == list(range(len(keys)))
+    assert all(found == [backend.ring.node_for(key)] for key, found in placement.items())
+
+
+def test_failing_node_is_marked_down_and_skipped(make_sharded):
+    backend = make_sharded(extra=[UNREACHABLE])
+    cache = CacheManager("redis://unused", ttl_jitter=0.0, backend=backend)
+    keys = KEYS[:200]
+    owned = [key for key in keys if backend.ring.node_for(key) == UNREACHABLE]
+
+    async def scenario():
+        try:
+            stored = await cache.set_many({key: i for i, key in enumerate(keys)}, ttl=60)
+            return stored, await cache.get_many(keys)
+        finally:
+            await cache.disconnect()
+
+    stored, values = asyncio.run(scenario())
+
+    # The failed part of the call was retried on the next nodes
+    assert owned
+    assert stored == keys
+    assert values == list(range(len(keys)))
+    assert backend.ring.get_stats()["down"] == [UNREACHABLE]
+    assert all(backend.ring.node_for(key) != UNREACHABLE for key in owned)
+
+
+def test_failing_node_fails_the_call_without_health_aware_mode(make_sharded):
+    backend = make_sharded(extra=[UNREACHABLE], retry_interval=None)
+    keys = KEYS[:200]
+
+    async def scenario():
+        try:
+            await backend.get_many(keys)
+        finally:
+            await backend.close()
+
+    with pytest.raises(Exception):
+        asyncio.run(scenario())
+    assert backend.ring.get_stats()["down"] == []
+
+
+
+def test_generation_survives_an_outage_of_its_node(make_sharded):
+    backend = make_sharded(retry_interval=0.2)
+    cache = CacheManager("redis://unused", ttl_jitter=0.0, generation_ttl=0, backend=backend)
+    counter = "cache:generation:analysis"
+    home = backend.ring.node_for(counter)
+
+    async def scenario():
+        try:
+            await cache.invalidate_namespace("analysis")
+            # A model switch while the counter's node is skipped
+            backend.ring.mark_down(home)
+            during = cache.invalidate_namespace_sync("analysis"), await cache.get_generation("analysis")
+            await asyncio.sleep(0.25)
+            after = await cache.get_generation("analysis")
+            # The returning node catches up on the next increment
+            following = await cache.invalidate_namespace("analysis")
+            counts = [await shard.get_counter(counter) for shard in backend.shards.values()]
+            return during, after, following, counts
+        finally:
+            await cache.disconnect()
+
+    during, after, following, counts = asyncio.run(scenario())
+
+    assert during == (2, 2)
+    assert after == 2
+    assert following == 3
+    assert counts == [3, 3, 3]
@@ -0,0 +1,161 @@
+"""
+Local SQLite cache backend: Redis TTL semantics, pub/sub emulation, eviction.
+"""
+
+import asyncio
+import time
+
+from cache import SQLiteBackend
+
+
+def _run(backend: SQLiteBackend, scenario):
+    """Run a scenario against a backend and close it."""
+    async def run():
+        try:
+            return await scenario(backend)
+        finally:
+            await backend.close()
+
+    return asyncio.run(run())
+
+
+def test_values_expire_with_their_ttl(cache_path):
+    async def scenario(backend):
+        await backend.set_many([("long", b"1", 600, None)])
+        await backend.add_many([("short", b"2", 100)])
+        before = await backend.get_many(["long", "short", "missing"])
+        await asyncio.sleep(0.15)
+        after = await backend.get_many(["long", "short"])
+        return before, after
+
+    before, after = _run(SQLiteBackend(cache_path), scenario)
+
+    (long_value, long_ttl), (short_value, short_ttl), missing = before
+    assert long_value == b"1" and 599_000 < long_ttl <= 600_000
+    assert short_value == b"2" and 0 < short_ttl <= 100
+    # Like PTTL: -2 for a missing key
+    assert missing == (None, -2)
+    assert after[0][0] == b"1"
+    assert after[1] == (None, -2)
+
+
+def test_counters_never_expire(cache_path):
+    async def scenario(backend):
+        counts = [await backend.incr("generation"), await backend.incr("generation")]
+        return counts, (await backend.get_many(["generation"]))[0]
+
+    counts, entry = _run(SQLiteBackend(cache_path), scenario)
+
+    assert counts == [1, 2]
+    assert entry == (b"2", -1)
+
+
+def test_add_only_inserts_missing_or_expired_keys(cache_path):
+    async def scenario(backend):
+        first = await backend.add_many([("lease:a", "one", 60_000), ("lease:b", "one", 50)])
+        await asyncio.sleep(0.1)
+        second = await backend.add_many([("lease:a", "two", 60_000), ("lease:b", "two", 60_000)])
+        # Compare-and-delete only removes the holder's own value
+        await backend.delete_if_equal([("lease:a", "two"), ("lease:b", "two")])
+        return first, second, await backend.get_many(["lease:a", "lease:b"])
+
+    first, second, entries = _run(SQLiteBackend(cache_path), scenario)
+
+    assert first == [True, True]
+    assert second == [False, True]
+    assert entries[0][0] == b"one"
+    assert entries[1] == (None, -2)
+
+
+def test_delete_counts_live_keys_and_matches_globs(cache_path):
+    async def scenario(backend):
+        await backend.set_many([
+            ("analysis:g0:1", b"1", 600, None),
+            ("analysis:g0:2", b"2", 600, None),
+            ("analysis:g1:1", b"3", 600, None),
+        ])
+        await backend.add_many([("expired", b"4", 1)])
+        await asyncio.sleep(0.01)
+        deleted = await backend.delete(["analysis:g1:1", "expired", "missing"])
+        matched = await backend.delete_matching("analysis:g0:*")
+        return deleted, matched
+
+    assert _run(SQLiteBackend(cache_path), scenario) == (1, 2)
+
+
+def test_entries_are_shared_between_processes(cache_path):
+    async def write(backend):
+        await backend.set_many([("shared", b"value", 600, None)])
+
+    async def read(backend):
+        return (await backend.get_many(["shared"]))[0][0]
+
+    _run(SQLiteBackend(cache_path), write)
+    assert _run(SQLiteBackend(cache_path), read) == b"value"
+
+
+def test_subscribers_receive_messages_published_after_subscribing(cache_path):
+    publisher = SQLiteBackend(cache_path)
+    subscriber = SQLiteBackend(cache_path, poll_interval=0.01)
+
+    async def scenario(_):
+        try:
+            await publisher.publish("cache:invalidate", "before")
+            messages = subscriber.subscribe("cache:invalidate")
+            # The first poll only records the current position
+            first = asyncio.ensure_future(messages.__anext__())
+            await asyncio.sleep(0.05)
+            await publisher.publish("other", "ignored")
+            await publisher.publish("cache:invalidate", "after")
+            publisher.publish_sync("cache:invalidate", "sync")
+            received = [await asyncio.wait_for(first, 1), await asyncio.wait_for(messages.__anext__(), 1)]
+            await messages.aclose()
+            return received
+        finally:
+            await publisher.close()
+
+    assert _run(subscriber, scenario) == ["after", "sync"]
+
+
+def test_l1_entries_are_invalidated_across_processes(make_cache):
+    first = make_cache(l1_max_bytes=1 << 20)
+    second = make_cache(l1_max_bytes=1 << 20)
+
+    async def scenario():
+        try:
+            await first.set("explain:1", {"n": 1}, ttl=600)
+            await second.get("explain:1")
+            await first.delete("explain:1")
+            # The deletion reaches the other process's L1 through the
+            # polled messages table
+            for _ in range(100):
+                if await second.get("explain:1") is None:
+                    return True
+                await asyncio.sleep(0.01)
+            return False
+        finally:
+            await first.disconnect()
+            await second.disconnect()
+
+    assert asyncio.run(scenario())
+
+
+def test_least_recently_read_entries_are_evicted(cache_path):
+    value = b"x" * 1000
+
+    async def scenario(backend):
+        for i in range(8):
+            await backend.set_many([(f"key:{i}", value, 600, None)])
+        # Reads refresh the read time at most once per second
+        time.sleep(1.1)
+        await backend.get_many(["key:0"])
+        await backend.set_many([("key:8", value, 600, None)])
+        return [entry for entry, _ in await backend.get_many([f"key:{i}" for i in range(9)])]
+
+    backend = SQLiteBackend(cache_path, max_bytes=8500)
+    entries = _run(backend, scenario)
+
+    # Past the bound, entries are evicted down to 90% of it, oldest read first
+    kept = [i for i, entry in enumerate(entries) if entry is not None]
+    assert kept == [0, 3, 4, 5, 6, 7, 8]
+    assert backend.evictions == 2
@@ -10,7 +10,7 @@ chrome.contextMenus.onClicked.addListener((info, tab) => {
   if (info.menuItemId === 'analyzeText') {
     const text = info.selectionText;
     // Send to API and show notification
-    fetch('http://localhost:8000/api/v1/analyze', {
+    fetch('http://localhost:8000/api/v1/analyze?fields=verdict,confidence', {
       method: 'POST',
       headers: {'Content-Type': 'application/json'},
       body: JSON.stringify({text})
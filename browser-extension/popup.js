@@ -7,7 +7,7 @@ document.getElementById('analyze').addEventListener('click', async () => {
   }, async (results) => {
     const text = results[0].result;
     
-    const response = await fetch('http://localhost:8000/api/v1/analyze', {
+    const response = await fetch('http://localhost:8000/api/v1/analyze?fields=verdict,confidence', {
       method: 'POST',
       headers: {'Content-Type': 'application/json'},
       body: JSON.stringify({text})
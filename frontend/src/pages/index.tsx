@@ -27,7 +27,9 @@ export default function Home() {
   const handleAnalyze = async () => {
     setLoading(true);
     try {
-      const res = await api.post("/api/v1/analyze", { text: input });
+      const res = await api.post("/api/v1/analyze", { text: input }, {
+        params: { fields: "verdict,confidence,scores,html,sources,language" },
+      });
       setVerdict(res.data.verdict);
       setHtml(res.data.html);
       setProb(res.data.scores || {});